@@ -2,6 +2,7 @@
 API router initialization.
 """
 from fastapi import APIRouter
+from api.admin import router as admin_router
 from api.analyze import router as analyze_router
 from api.jobs import router as jobs_router
 from api.monitoring import router as monitoring_router
@@ -13,3 +14,4 @@ router = APIRouter()
 router.include_router(analyze_router)
 router.include_router(jobs_router)
 router.include_router(monitoring_router)
+router.include_router(admin_router)
@@ -0,0 +1,44 @@
+"""
+Administrative API endpoints.
+"""
+import logging
+from fastapi import APIRouter, HTTPException
+
+from app_logging import get_request_id, log_with_context
+from services.metadata_fetcher import metadata_fetcher
+from .security import require_auth
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+@router.post("/cache/nuke")
+async def nuke_metadata_cache(current_user: dict = require_auth()):
+    """
+    Drop all cached video metadata.
+    
+    Returns:
+        Number of cache entries removed
+    """
+    request_id = get_request_id()
+    
+    try:
+        removed = metadata_fetcher.cache_clear()
+        log_with_context("info", f"Metadata cache cleared: {removed} entries removed")
+        
+        return {
+            "message": "Metadata cache cleared",
+            "entries_removed": removed,
+            "request_id": request_id
+        }
+        
+    except Exception as e:
+        log_with_context("error", f"Failed to clear metadata cache: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Cache clear failed",
+                "message": str(e),
+                "request_id": request_id
+            }
+        )
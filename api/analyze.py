@@ -3,29 +3,24 @@ Analysis API endpoints.
 """
 import logging
 import time
-from typing import List
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from typing import AsyncIterator
+import orjson
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
-from models import AnalysisRequest, AnalysisResponse, JobStatus, VideoResult, VideoMetadata, AggregationInfo, ConfigInfo
+from models import AnalysisRequest, AnalysisResponse, AggregationInfo, config_info
 from app_logging import get_request_id, log_with_context
-from config import config
-from services.metadata_fetcher import metadata_fetcher
-from services.transcript_fetcher import transcript_fetcher
-from services.transcript_chunker import default_chunker
-from services.summarization_service import default_summarizer, SummarizationService, SummarizationConfig
-from services.orchestrator import video_orchestrator
-from services.response_formatter import response_formatter
 from services.batch_processor import default_batch_processor
 from services.observability import observability_service
+from services.cache import get_cache_status
 from services.utils import validate_provider_config
 from .security import require_auth
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api", tags=["analysis"])
+router = APIRouter(prefix="/api", tags=["analysis"], default_response_class=ORJSONResponse)
 
 
-@router.post("/analyze", response_model=AnalysisResponse)
+@router.post("/analyze", response_model=AnalysisResponse, response_class=ORJSONResponse)
 async def analyze_videos(request: AnalysisRequest, current_user: dict = require_auth()):
     """
     Analyze one or more YouTube videos.
@@ -62,7 +57,7 @@ async def analyze_videos(request: AnalysisRequest, current_user: dict = require_
             
             log_with_context("info", f"Created async job {job_id}")
             
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=202,
                 content={
                     "job_id": job_id,
@@ -86,18 +81,14 @@ async def analyze_videos(request: AnalysisRequest, current_user: dict = require_
     try:
         # Use batch processor for efficient processing
         response = await default_batch_processor.process_batch(
-            [str(url) for url in request.urls],
+            request.urls,
             request.options,
-            request_id
+            request_id,
+            request.video_ids
         )
         
-        # Format results with optional Markdown
-        if request.options.include_markdown:
-            formatted_results = []
-            for result in response.results:
-                formatted_result = response_formatter.format_video_result(result, True)
-                formatted_results.append(formatted_result)
-            response.results = formatted_results
+        cache_status = get_cache_status()
+        headers = {"X-Cache": cache_status} if cache_status else None
         
         # Record metrics
         processing_time = time.time() - start_time
@@ -108,11 +99,14 @@ async def analyze_videos(request: AnalysisRequest, current_user: dict = require_
             processing_time=processing_time,
             error_code=None if success else "BATCH_FAILURE",
             provider=request.options.provider,
-            languages=request.options.languages
+            languages=request.options.languages,
+            duplicate_urls_collapsed=response.aggregation.duplicate_urls_collapsed
         )
         
         log_with_context("info", f"Analysis completed: {response.aggregation.succeeded} succeeded, {response.aggregation.failed} failed")
-        return response
+        # The batch processor builds a valid response; serialize it once
+        # instead of letting FastAPI re-validate it against response_model
+        return ORJSONResponse(content=response.model_dump(mode="json"), headers=headers)
         
     except Exception as e:
         # Record error metrics
@@ -137,3 +131,82 @@ async def analyze_videos(request: AnalysisRequest, current_user: dict = require_
         )
 
 
+@router.post("/analyze/stream")
+async def analyze_videos_stream(request: AnalysisRequest, current_user: dict = require_auth()):
+    """
+    Analyze one or more YouTube videos, streaming results as NDJSON.
+    
+    Each line is a JSON object. One ``{"type": "result", "index": ..., "result": ...}``
+    line is sent per URL as soon as its analysis completes (in completion
+    order, with ``index`` giving the URL's position in the request), followed
+    by a final ``{"type": "summary", ...}`` line with the aggregation.
+    """
+    request_id = get_request_id()
+    
+    log_with_context("info", f"Streaming analysis request received: {len(request.urls)} URLs")
+    
+    # Validate provider configuration before committing to a 200 stream
+    if not validate_provider_config(request.options.provider):
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Provider configuration error",
+                "message": f"Provider '{request.options.provider}' is not properly configured. "
+                          f"Please check your API keys and provider settings.",
+                "request_id": request_id
+            }
+        )
+    
+    async def generate() -> AsyncIterator[bytes]:
+        start_time = time.time()
+        aggregation = AggregationInfo(total=len(request.urls), succeeded=0, failed=0)
+        
+        try:
+            async for index, result, _ in default_batch_processor.stream_batch(
+                request.urls,
+                request.options,
+                aggregation,
+                request.video_ids
+            ):
+                yield orjson.dumps({
+                    "type": "result",
+                    "index": index,
+                    "result": result.model_dump(mode="json")
+                }) + b"\n"
+            
+            yield orjson.dumps({
+                "type": "summary",
+                "request_id": request_id,
+                "aggregation": aggregation.model_dump(),
+                "config": config_info(
+                    request.options.provider,
+                    request.options.temperature,
+                    request.options.max_tokens
+                ).model_dump()
+            }) + b"\n"
+            
+            success = aggregation.failed == 0
+            error_code = None if success else "BATCH_FAILURE"
+        except Exception as e:
+            log_with_context("error", f"Streaming analysis failed: {str(e)}")
+            yield orjson.dumps({
+                "type": "error",
+                "error": "Analysis failed",
+                "message": str(e),
+                "request_id": request_id
+            }) + b"\n"
+            success = False
+            error_code = "ANALYSIS_ERROR"
+        
+        observability_service.record_request(
+            request_type="analysis_stream",
+            success=success,
+            processing_time=time.time() - start_time,
+            error_code=error_code,
+            provider=request.options.provider,
+            languages=request.options.languages,
+            duplicate_urls_collapsed=aggregation.duplicate_urls_collapsed
+        )
+        log_with_context("info", f"Streaming analysis completed: {aggregation.succeeded} succeeded, {aggregation.failed} failed")
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
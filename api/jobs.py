@@ -3,7 +3,7 @@ Async jobs API endpoints.
 """
 import logging
 from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from models import AnalysisRequest, JobStatus
 from app_logging import get_request_id, log_with_context
@@ -43,7 +43,7 @@ async def create_async_analysis(request: AnalysisRequest):
         
         log_with_context("info", f"Created async job {job_id}")
         
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=202,
             content={
                 "job_id": job_id,
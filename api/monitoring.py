@@ -2,16 +2,32 @@
 Monitoring and observability API endpoints.
 """
 import logging
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 
 from app_logging import get_request_id, log_with_context
 from services.observability import observability_service
 from services.job_manager import job_manager
+from services.utils import ttl_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api", tags=["monitoring"])
 
+# Probes can hit these endpoints every second; reuse aggregates briefly
+SNAPSHOT_TTL_SECONDS = 2
+
+
+@ttl_cache(SNAPSHOT_TTL_SECONDS)
+def _health_snapshot() -> tuple:
+    """Get the health status and job statistics, cached briefly."""
+    return observability_service.get_health_status(), job_manager.get_job_count()
+
+
+@ttl_cache(SNAPSHOT_TTL_SECONDS)
+def _metrics_snapshot() -> tuple:
+    """Get the service metrics and job statistics, cached briefly."""
+    return observability_service.get_metrics(), job_manager.get_job_count()
+
 
 @router.get("/health")
 async def health_check():
@@ -24,11 +40,8 @@ async def health_check():
     request_id = get_request_id()
     
     try:
-        # Get health status
-        health_status = observability_service.get_health_status()
-        
-        # Get job statistics
-        job_stats = job_manager.get_job_count()
+        # Get health status and job statistics
+        health_status, job_stats = _health_snapshot()
         
         # Combine health information
         health_info = {
@@ -50,14 +63,14 @@ async def health_check():
         # Return appropriate status code
         status_code = 200 if health_status["status"] == "healthy" else 503
         
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status_code,
             content=health_info
         )
         
     except Exception as e:
         log_with_context("error", f"Health check failed: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=503,
             content={
                 "service": "youtube-analyzer",
@@ -79,8 +92,7 @@ async def get_metrics():
     request_id = get_request_id()
     
     try:
-        metrics = observability_service.get_metrics()
-        job_stats = job_manager.get_job_count()
+        metrics, job_stats = _metrics_snapshot()
         
         return {
             "metrics": metrics,
@@ -100,6 +112,33 @@ async def get_metrics():
         )
 
 
+@router.get("/metrics/prometheus")
+async def get_prometheus_metrics():
+    """
+    Get service metrics in Prometheus format.
+    
+    Returns:
+        Metrics in the Prometheus text exposition format, aggregated across
+        workers when PROMETHEUS_MULTIPROC_DIR is set
+    """
+    request_id = get_request_id()
+    
+    try:
+        payload, content_type = observability_service.get_prometheus_metrics()
+        return Response(content=payload, media_type=content_type)
+        
+    except Exception as e:
+        log_with_context("error", f"Failed to render Prometheus metrics: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Metrics retrieval failed",
+                "message": str(e),
+                "request_id": request_id
+            }
+        )
+
+
 @router.get("/metrics/recent")
 async def get_recent_requests(limit: int = 10):
     """
@@ -146,6 +185,8 @@ async def reset_metrics():
     
     try:
         observability_service.reset_metrics()
+        _health_snapshot.cache_clear()
+        _metrics_snapshot.cache_clear()
         
         log_with_context("info", "Metrics reset requested")
         
@@ -1,6 +1,9 @@
 """
 Security utilities for API authentication.
 """
+import functools
+import hashlib
+import hmac
 import logging
 from typing import Optional
 from fastapi import HTTPException, status, Depends
@@ -18,6 +21,12 @@ security_scheme = HTTPBearer(
 )
 
 
+@functools.lru_cache(maxsize=4)
+def _token_digest(token: str) -> bytes:
+    """Hash the configured token once so comparisons run on fixed-length digests."""
+    return hashlib.sha256(token.encode()).digest()
+
+
 def verify_api_token(token: str) -> bool:
     """
     Verify the provided API token against the configured static token.
@@ -35,7 +44,11 @@ def verify_api_token(token: str) -> bool:
     if not token:
         return False
         
-    return token == config.api_token
+    # Constant-time compare of equal-length digests leaks neither content nor length
+    return hmac.compare_digest(
+        _token_digest(config.api_token),
+        hashlib.sha256(token.encode()).digest()
+    )
 
 
 async def get_current_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(security_scheme)):
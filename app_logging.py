@@ -2,6 +2,7 @@
 Logging configuration with request correlation.
 """
 import logging
+import re
 import sys
 from typing import Any, Dict
 from contextvars import ContextVar
@@ -55,21 +56,51 @@ def get_request_id() -> str:
     return request_id_var.get('')
 
 
-def log_with_context(level: str, message: str, **kwargs: Any) -> None:
-    """Log message with request context."""
-    logger = logging.getLogger(__name__)
-    getattr(logger, level.lower())(message, extra=kwargs)
+_LOGGER = logging.getLogger(__name__)
+_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
+
+def log_with_context(level: str, message: str, *args: Any, **kwargs: Any) -> None:
+    """
+    Log message with request context.
+    
+    Positional args are %-formatted into message only if the level is
+    enabled, so hot paths can pass them instead of pre-formatting.
+    """
+    lvl = _LEVELS[level.lower()]
+    if _LOGGER.isEnabledFor(lvl):
+        _LOGGER.log(lvl, message, *args, extra=kwargs)
+
+
+_SECRET_KEY_RE = re.compile(r'api_key|password|secret|token', re.IGNORECASE)
+_REDACTED = '***REDACTED***'
 
 
 def redact_secrets(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Redact sensitive information from logs."""
-    redacted = data.copy()
-    secret_keys = ['api_key', 'password', 'secret', 'token']
+    """
+    Redact sensitive information from logs.
     
-    for key, value in redacted.items():
-        if any(secret in key.lower() for secret in secret_keys):
-            redacted[key] = '***REDACTED***'
+    Only dicts that actually contain secrets are copied; anything without
+    secrets (including ``data`` itself) is returned as is.
+    """
+    redacted = None
+    for key, value in data.items():
+        if _SECRET_KEY_RE.search(key):
+            new_value = _REDACTED
         elif isinstance(value, dict):
-            redacted[key] = redact_secrets(value)
+            new_value = redact_secrets(value)
+            if new_value is value:
+                continue
+        else:
+            continue
+        if redacted is None:
+            redacted = data.copy()
+        redacted[key] = new_value
     
-    return redacted
+    return data if redacted is None else redacted
@@ -1,11 +1,14 @@
 """
 Configuration management for the YouTube Analyzer service.
 """
+import json
 import os
 from typing import Dict, Any, Optional
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
+from app_logging import log_with_context
+
 # Load environment variables
 load_dotenv()
 
@@ -18,6 +21,15 @@ class ServiceConfig(BaseModel):
     default_max_tokens: int = Field(default=1200, description="Default max tokens for LLM")
     request_timeout: int = Field(default=300, description="Request timeout in seconds")
     max_concurrent_requests: int = Field(default=3, description="Max concurrent requests")
+    chunk_workers: int = Field(default=2, description="Worker processes for transcript chunking (0 chunks in threads)")
+    llm_max_parallel: int = Field(default=8, description="Max concurrent LLM requests per summarizer configuration")
+    
+    # Result cache configuration
+    redis_url: Optional[str] = Field(default=None, description="Redis URL for the shared result cache")
+    result_cache_ttl: int = Field(default=3600, description="Time to live for cached analysis results (seconds)")
+    transcript_cache_dir: Optional[str] = Field(default=None, description="Directory for the on-disk transcript cache")
+    transcript_cache_ttl: int = Field(default=7 * 24 * 3600, description="Time to live for transcripts cached on disk (seconds)")
+    summary_cache_size: int = Field(default=1024, description="Max chunk summaries kept in the in-process summary cache")
     
     # Security configuration
     api_token: Optional[str] = Field(default=None, description="Static API token for authentication")
@@ -25,6 +37,7 @@ class ServiceConfig(BaseModel):
     # Provider API keys
     openai_api_key: Optional[str] = Field(default=None, description="OpenAI API key")
     anthropic_api_key: Optional[str] = Field(default=None, description="Anthropic API key")
+    youtube_api_key: Optional[str] = Field(default=None, description="YouTube Data API key for bulk metadata lookups")
     
     # Whisper settings
     use_whisper_fallback: bool = Field(default=True, description="Enable Whisper fallback for transcript fetching")
@@ -35,7 +48,21 @@ class ServiceConfig(BaseModel):
     whisper_compute_type: str = Field(default="int8", description="Compute type for Whisper")
     
     # Custom model configurations
-    custom_model_config: Dict[str, Any] = Field(default_factory=dict, description="Custom model configurations")
+    custom_model_config: Dict[str, Any] = Field(default_factory=dict, description="Custom model configurations (JSON object)")
+
+
+def _load_json_env(name: str) -> Dict[str, Any]:
+    """Parse a JSON object from an environment variable ({} if unset or invalid)."""
+    raw = os.getenv(name, "{}")
+    try:
+        value = json.loads(raw)
+    except json.JSONDecodeError as e:
+        log_with_context("warning", f"Ignoring {name}: not valid JSON ({e})")
+        return {}
+    if not isinstance(value, dict):
+        log_with_context("warning", f"Ignoring {name}: expected a JSON object")
+        return {}
+    return value
 
 
 def load_config() -> ServiceConfig:
@@ -47,16 +74,24 @@ def load_config() -> ServiceConfig:
         default_max_tokens=int(os.getenv("DEFAULT_MAX_TOKENS", "1200")),
         request_timeout=int(os.getenv("REQUEST_TIMEOUT", "300")),
         max_concurrent_requests=int(os.getenv("MAX_CONCURRENT_REQUESTS", "3")),
+        chunk_workers=int(os.getenv("CHUNK_WORKERS", "2")),
+        llm_max_parallel=int(os.getenv("LLM_MAX_PARALLEL", "8")),
+        redis_url=os.getenv("REDIS_URL"),
+        result_cache_ttl=int(os.getenv("RESULT_CACHE_TTL", "3600")),
+        transcript_cache_dir=os.getenv("TRANSCRIPT_CACHE_DIR"),
+        transcript_cache_ttl=int(os.getenv("TRANSCRIPT_CACHE_TTL", str(7 * 24 * 3600))),
+        summary_cache_size=int(os.getenv("SUMMARY_CACHE_SIZE", "1024")),
         api_token=os.getenv("API_TOKEN"),
         openai_api_key=os.getenv("OPENAI_API_KEY"),
         anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
+        youtube_api_key=os.getenv("YOUTUBE_API_KEY"),
         use_whisper_fallback=os.getenv("USE_WHISPER_FALLBACK", "true").lower() == "true",
         whisper_max_audio_duration=int(os.getenv("WHISPER_MAX_AUDIO_DURATION", "3600")),
         whisper_chunk_duration=int(os.getenv("WHISPER_CHUNK_DURATION", "600")),
         whisper_model=os.getenv("WHISPER_MODEL", "base"),
         whisper_device=os.getenv("WHISPER_DEVICE", "cpu"),
         whisper_compute_type=os.getenv("WHISPER_COMPUTE_TYPE", "int8"),
-        custom_model_config=eval(os.getenv("CUSTOM_MODEL_CONFIG", "{}"))
+        custom_model_config=_load_json_env("CUSTOM_MODEL_CONFIG")
     )
 
 
@@ -6,7 +6,7 @@ Example script demonstrating the enhanced summarization service with comprehensi
 import asyncio
 from services.summarization_service import SummarizationService, SummarizationConfig
 from services.transcript_chunker import TranscriptChunker, ChunkingConfig
-from models import TranscriptChunk, TranscriptSegment
+from models import TranscriptData, TranscriptSegment
 
 async def main():
     """Example usage of the enhanced summarization service."""
@@ -39,21 +39,18 @@ async def main():
     understanding your energy levels, eliminating distractions, and creating systems that support your goals.
     """
     
-    # Create transcript segments
+    # Create one transcript segment per paragraph (about 60 seconds each)
+    paragraphs = [" ".join(p.split()) for p in sample_transcript.strip().split("\n\n")]
     segments = [
-        TranscriptSegment(text=sample_transcript.strip(), start=0.0, duration=300.0)
+        TranscriptSegment(text=paragraph, start=i * 60.0, duration=60.0)
+        for i, paragraph in enumerate(paragraphs)
     ]
     
-    # Create a transcript chunk
-    chunk = TranscriptChunk(
-        text=sample_transcript.strip(),
-        segments=segments,
-        start_time=0.0,
-        end_time=300.0,
-        token_count=500,
-        char_count=2000,
-        chunk_index=0,
-        language="en"
+    # Split the transcript into several small chunks; each chunk is
+    # summarized by its own LLM request, and the requests run concurrently
+    chunker = TranscriptChunker(ChunkingConfig(max_tokens=150, max_chars=600))
+    chunks = chunker.chunk_transcript(
+        TranscriptData(source="manual", segments=segments, language="en"), "en"
     )
     
     # Configure the summarization service for comprehensive analysis
@@ -70,7 +67,8 @@ async def main():
     print("=" * 60)
     
     # Generate summary
-    summary_data, error = await summarizer.summarize_transcript([chunk], "en")
+    print(f"Summarizing {len(chunks)} chunks in parallel...")
+    summary_data, error = await summarizer.summarize_transcript(chunks, "en")
     
     if error:
         print(f"❌ Error: {error.message}")
@@ -0,0 +1,30 @@
+"""
+Gunicorn configuration for running the service with multiple Uvicorn workers.
+
+Usage:
+    gunicorn main:app -c gunicorn.conf.py
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8001')}"
+
+# One event loop per process; CPU-bound sections in one worker no longer
+# stall requests handled by the others.
+workers = int(os.getenv("WEB_CONCURRENCY", max(2, os.cpu_count() or 1)))
+
+# UvicornWorker runs with loop="auto" and http="auto", which select uvloop
+# and httptools when they are installed (uvicorn[standard] provides both).
+worker_class = "uvicorn.workers.UvicornWorker"
+
+timeout = int(os.getenv("REQUEST_TIMEOUT", "300")) + 30
+graceful_timeout = 30
+keepalive = 5
+
+loglevel = os.getenv("LOG_LEVEL", "INFO").lower()
+
+
+def child_exit(server, worker):
+    """Drop a dead worker's files from the Prometheus multiprocess directory."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
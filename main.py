@@ -4,13 +4,18 @@ FastAPI main application.
 import logging
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
 from config import config
 from app_logging import setup_logging, set_request_id, log_with_context, get_request_id
 from models import AnalysisRequest, AnalysisResponse, JobStatus
 from api.analyze import router
+from api.admin import router as admin_router
+from api.monitoring import router as monitoring_router
+from services.http import close_http_client
+from services.observability import observability_service
+from services.orchestrator import video_orchestrator
 
 # Set up logging
 setup_logging(config.log_level)
@@ -25,11 +30,16 @@ async def lifespan(app: FastAPI):
     logger.info(f"Configuration loaded: provider={config.default_provider}, "
                 f"temperature={config.default_temperature}, "
                 f"max_tokens={config.default_max_tokens}")
+    observability_service.start()
+    video_orchestrator.start_chunk_pool(config.chunk_workers)
     
     yield
     
     # Shutdown
     logger.info("Shutting down YouTube Analyzer Service")
+    video_orchestrator.shutdown_chunk_pool()
+    await observability_service.stop()
+    await close_http_client()
 
 
 # Create FastAPI app
@@ -37,7 +47,8 @@ app = FastAPI(
     title="YouTube Analyzer Service",
     description="Service to analyze YouTube videos and generate bilingual summaries",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -49,8 +60,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include API router
+# Include API routers
 app.include_router(router)
+app.include_router(admin_router)
+app.include_router(monitoring_router)
 
 
 @app.middleware("http")
@@ -138,7 +151,7 @@ async def global_exception_handler(request: Request, exc: Exception):
     request_id = get_request_id()
     logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
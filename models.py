@@ -1,14 +1,25 @@
 """
 Pydantic models for request/response schemas.
 """
-from typing import List, Optional, Dict, Any, Union
-from pydantic import BaseModel, Field, HttpUrl
+import functools
+import re
+from types import MappingProxyType
+from typing import Final, List, Mapping, Optional, Dict, Any, Union
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
 from datetime import datetime
 from dataclasses import dataclass
 
 
-# Language mapping for human-readable names
-LANGUAGE_NAMES = {
+# http(s) URL on a YouTube host (watch, short-link, shorts, embed or /v/), capturing the video ID
+YOUTUBE_URL_RE = re.compile(
+    r"^https?://(?:(?:www|m|music)\.)?"
+    r"(?:youtube\.com/(?:watch\?(?:[^&#]*&)*v=|embed/|v/|shorts/)|youtu\.be/)"
+    r"(?P<id>[A-Za-z0-9_-]{11})"
+)
+
+
+# Language mapping for human-readable names (read-only)
+LANGUAGE_NAMES: Final[Mapping[str, str]] = MappingProxyType({
     'en': 'English',
     'es': 'Español',
     'fr': 'Français',
@@ -46,14 +57,21 @@ LANGUAGE_NAMES = {
     'eu': 'Euskera',
     'ca': 'Català',
     'gl': 'Galego'
-}
+})
 
 
-class TranscriptLine(BaseModel):
-    """Individual transcript line with timing information."""
-    start: float = Field(..., description="Start time in seconds")
-    duration: float = Field(..., description="Duration in seconds")
-    text: str = Field(..., description="Transcript text")
+@functools.lru_cache(maxsize=64)
+def language_name(code: str) -> str:
+    """Human-readable name for a language code (the upper-cased code if unknown)."""
+    return LANGUAGE_NAMES.get(code, code.upper())
+
+
+@dataclass(slots=True)
+class TranscriptLine:
+    """Individual transcript line with timing information (internal only, never serialized by the API)."""
+    start: float  # Start time in seconds
+    duration: float  # Duration in seconds
+    text: str  # Transcript text
 
 
 class TranscriptUnavailableError(Exception):
@@ -69,12 +87,32 @@ class AnalysisOptions(BaseModel):
     temperature: float = Field(default=0.2, ge=0.0, le=2.0, description="Temperature for LLM generation")
     max_tokens: int = Field(default=1200, gt=0, description="Maximum tokens for LLM generation")
     async_processing: bool = Field(default=False, description="Process asynchronously")
+    cache_enabled: bool = Field(default=True, description="Reuse cached analysis results and chunk summaries")
 
 
 class AnalysisRequest(BaseModel):
     """Request model for video analysis."""
-    urls: List[HttpUrl] = Field(..., min_items=1, description="YouTube URLs to analyze")
+    urls: List[str] = Field(..., min_items=1, description="YouTube URLs to analyze")
     options: Optional[AnalysisOptions] = Field(default_factory=AnalysisOptions, description="Analysis options")
+    
+    _video_ids: List[str] = PrivateAttr(default_factory=list)
+    
+    @model_validator(mode="after")
+    def extract_video_ids(self) -> "AnalysisRequest":
+        """Reject anything but YouTube video URLs and remember the extracted IDs (one regex pass per URL)."""
+        video_ids = []
+        for i, url in enumerate(self.urls):
+            match = YOUTUBE_URL_RE.match(url)
+            if not match:
+                raise ValueError(f"urls[{i}] is not a YouTube video URL: {url}")
+            video_ids.append(match.group('id'))
+        self._video_ids = video_ids
+        return self
+    
+    @property
+    def video_ids(self) -> List[str]:
+        """Video IDs extracted from urls, in the same order."""
+        return self._video_ids
 
 
 class VideoMetadata(BaseModel):
@@ -197,15 +235,24 @@ class AggregationInfo(BaseModel):
     total: int = Field(..., description="Total number of videos")
     succeeded: int = Field(..., description="Number of successful videos")
     failed: int = Field(..., description="Number of failed videos")
+    duplicate_urls_collapsed: int = Field(default=0, description="Number of duplicate URLs served from another URL's result")
 
 
 class ConfigInfo(BaseModel):
-    """Configuration information."""
+    """Configuration information (immutable: instances are shared between responses)."""
+    model_config = ConfigDict(frozen=True)
+    
     provider: str = Field(..., description="LLM provider used")
     temperature: float = Field(..., description="Temperature used")
     max_tokens: int = Field(..., description="Max tokens used")
 
 
+@functools.lru_cache(maxsize=128)
+def config_info(provider: str, temperature: float, max_tokens: int) -> ConfigInfo:
+    """Shared, frozen ConfigInfo for a set of model settings."""
+    return ConfigInfo.model_construct(provider=provider, temperature=temperature, max_tokens=max_tokens)
+
+
 class AnalysisResponse(BaseModel):
     """Response model for video analysis."""
     request_id: str = Field(..., description="Unique request identifier")
@@ -1,25 +1,36 @@
 """
 Audio downloader service using yt-dlp to download audio from YouTube videos.
 """
+import copy
+import glob
 import os
+import shutil
 import tempfile
+import time
 import logging
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 from pathlib import Path
 import yt_dlp
 from models import ErrorInfo
 from app_logging import log_with_context
 from config import config
+from .utils import extract_video_id
 
 logger = logging.getLogger(__name__)
 
-
 class AudioDownloader:
     """Downloads audio from YouTube videos using yt-dlp."""
     
+    # Extracted info is reused for retries and repeated URLs; kept well below
+    # the lifetime of the signed stream URLs it contains
+    INFO_CACHE_TTL = 1800
+    INFO_CACHE_SIZE = 256
+    
     def __init__(self):
         """Initialize the audio downloader."""
         self.temp_dir = None
+        # video_id -> (sanitized yt-dlp info dict, time cached)
+        self._info_cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
         self._setup_temp_dir()
     
     def _setup_temp_dir(self):
@@ -33,37 +44,7 @@ class AudioDownloader:
     
     def extract_video_id(self, url: str) -> Optional[str]:
         """Extract video ID from YouTube URL."""
-        import re
-        from urllib.parse import urlparse, parse_qs
-        
-        try:
-            # Handle various YouTube URL formats
-            patterns = [
-                r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
-                r'youtube\.com\/watch\?.*v=([a-zA-Z0-9_-]{11})',
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, url)
-                if match:
-                    return match.group(1)
-            
-            # Try parsing as URL
-            parsed = urlparse(url)
-            if 'youtube.com' in parsed.netloc or 'youtu.be' in parsed.netloc:
-                if parsed.path.startswith('/watch'):
-                    query_params = parse_qs(parsed.query)
-                    if 'v' in query_params:
-                        return query_params['v'][0]
-                elif parsed.path.startswith('/') and len(parsed.path) > 1:
-                    # Handle youtu.be/VIDEO_ID format
-                    return parsed.path[1:]
-            
-            return None
-            
-        except Exception as e:
-            log_with_context("error", f"Failed to extract video ID from URL {url}: {str(e)}")
-            return None
+        return extract_video_id(url)
     
     def download_audio(self, url: str, max_duration: int = None) -> Tuple[Optional[str], Optional[ErrorInfo]]:
         """
@@ -86,6 +67,8 @@ class AudioDownloader:
                 message="Failed to create temporary directory for audio download"
             )
         
+        job_dir = None
+        downloaded_file = None
         try:
             video_id = self.extract_video_id(url)
             if not video_id:
@@ -96,8 +79,12 @@ class AudioDownloader:
             
             log_with_context("info", f"Downloading audio for video {video_id}")
             
+            # Each download gets its own directory, so concurrent downloads never
+            # collide on file names or scan each other's files
+            job_dir = tempfile.mkdtemp(dir=self.temp_dir, prefix=f"{video_id}_")
+            
             # Configure yt-dlp options
-            output_path = os.path.join(self.temp_dir, f"{video_id}.%(ext)s")
+            output_path = os.path.join(job_dir, f"{video_id}.%(ext)s")
             
             ydl_opts = {
                 'format': 'bestaudio/best',
@@ -106,27 +93,24 @@ class AudioDownloader:
                 'audioformat': 'wav',
                 'audioquality': '192K',
                 'noplaylist': True,
-                'max_duration': max_duration,
+                # Lets yt-dlp skip too-long videos after extraction, before any audio is fetched
+                'match_filter': yt_dlp.utils.match_filter_func(f'duration <=? {max_duration}'),
                 'quiet': True,
                 'no_warnings': False,
             }
             
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Extract info first to check video duration
-                info = ydl.extract_info(url, download=False)
-                duration = info.get('duration', 0)
-                
-                if duration > max_duration:
-                    return None, ErrorInfo(
-                        code="VIDEO_TOO_LONG",
-                        message=f"Video duration ({duration}s) exceeds maximum allowed duration ({max_duration}s)"
-                    )
-                
-                # Download the audio
-                ydl.download([url])
+                info = self._extract_and_download(ydl, url, video_id)
+            
+            duration = info.get('duration') or 0
+            if duration > max_duration:
+                return None, ErrorInfo(
+                    code="VIDEO_TOO_LONG",
+                    message=f"Video duration ({duration}s) exceeds maximum allowed duration ({max_duration}s)"
+                )
             
             # Find the downloaded file
-            downloaded_file = self._find_downloaded_file(video_id)
+            downloaded_file = self._find_downloaded_file(video_id, job_dir)
             if not downloaded_file:
                 return None, ErrorInfo(
                     code="DOWNLOAD_FAILED",
@@ -160,17 +144,54 @@ class AudioDownloader:
                 code="DOWNLOAD_ERROR",
                 message=f"Unexpected error: {str(e)}"
             )
+        
+        finally:
+            # On failure nothing is handed to the caller, so drop the directory here
+            if job_dir and not downloaded_file:
+                shutil.rmtree(job_dir, ignore_errors=True)
     
-    def _find_downloaded_file(self, video_id: str) -> Optional[str]:
-        """Find the downloaded audio file."""
+    def _extract_and_download(self, ydl: yt_dlp.YoutubeDL, url: str, video_id: str) -> Dict[str, Any]:
+        """
+        Download a video's audio, reusing cached info instead of re-extracting when possible.
+        
+        Args:
+            ydl: Configured YoutubeDL instance
+            url: YouTube video URL
+            video_id: YouTube video ID
+            
+        Returns:
+            yt-dlp info dict for the video
+        """
+        cached = self._info_cache.get(video_id)
+        if cached is not None:
+            info, cached_at = cached
+            if time.time() - cached_at <= self.INFO_CACHE_TTL:
+                try:
+                    return ydl.process_ie_result(copy.deepcopy(info), download=True)
+                except yt_dlp.DownloadError as e:
+                    # Stream URLs may have expired early; extract afresh
+                    log_with_context("warning", f"Cached info for {video_id} failed to download, re-extracting: {str(e)}")
+            self._info_cache.pop(video_id, None)
+        
+        # Extract and download in one pass; a separate probe would extract twice
+        info = ydl.extract_info(url, download=True)
+        
+        if len(self._info_cache) >= self.INFO_CACHE_SIZE:
+            self._info_cache.pop(next(iter(self._info_cache)), None)
+        self._info_cache[video_id] = (ydl.sanitize_info(info, remove_private_keys=True), time.time())
+        return info
+    
+    def _find_downloaded_file(self, video_id: str, directory: Optional[str] = None) -> Optional[str]:
+        """Find the downloaded audio file in directory (default: the temp directory)."""
         try:
-            if not self.temp_dir:
+            directory = directory or self.temp_dir
+            if not directory:
                 return None
             
-            # Look for files with the video ID in the name
-            temp_path = Path(self.temp_dir)
-            for file_path in temp_path.iterdir():
-                if file_path.is_file() and video_id in file_path.name:
+            # Downloads are written as "<video_id>.<ext>", so match that name directly
+            # instead of scanning every file in the directory
+            for file_path in Path(directory).glob(f"{glob.escape(video_id)}.*"):
+                if file_path.is_file():
                     return str(file_path)
             
             return None
@@ -183,6 +204,9 @@ class AudioDownloader:
         """
         Clean up downloaded audio file.
         
+        Files downloaded by download_audio live in their own directory, which
+        is removed along with the file.
+        
         Args:
             file_path: Path to the audio file to delete
             
@@ -190,10 +214,16 @@ class AudioDownloader:
             True if cleanup successful, False otherwise
         """
         try:
-            if file_path and os.path.exists(file_path):
+            if not file_path:
+                return True
+            
+            directory = os.path.dirname(file_path)
+            if self.temp_dir and os.path.dirname(directory) == self.temp_dir:
+                shutil.rmtree(directory)
+                log_with_context("info", f"Cleaned up audio file: {file_path}")
+            elif os.path.exists(file_path):
                 os.remove(file_path)
                 log_with_context("info", f"Cleaned up audio file: {file_path}")
-                return True
             return True
             
         except Exception as e:
@@ -204,7 +234,6 @@ class AudioDownloader:
         """Clean up the entire temporary directory."""
         try:
             if self.temp_dir and os.path.exists(self.temp_dir):
-                import shutil
                 shutil.rmtree(self.temp_dir)
                 log_with_context("info", f"Cleaned up temporary directory: {self.temp_dir}")
                 self.temp_dir = None
@@ -3,13 +3,18 @@ Batch processing service with limited concurrency for video analysis.
 """
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+from dataclasses import dataclass, field
 from datetime import datetime
 
-from models import AnalysisOptions, VideoResult, AnalysisResponse, AggregationInfo, ConfigInfo
+from models import AnalysisOptions, VideoResult, VideoMetadata, AnalysisResponse, AggregationInfo, ErrorInfo, config_info
 from app_logging import log_with_context
-from services.orchestrator import video_orchestrator
+from config import config
+from services.orchestrator import video_orchestrator, error_result
+from services.metadata_fetcher import metadata_fetcher
+from services.response_formatter import response_formatter
+from services.cache import result_cache, cache_status_var
+from services.utils import extract_video_id
 
 logger = logging.getLogger(__name__)
 
@@ -17,12 +22,25 @@ logger = logging.getLogger(__name__)
 @dataclass
 class BatchConfig:
     """Configuration for batch processing."""
-    max_concurrent: int = 3
+    max_concurrent: int = config.max_concurrent_requests
     timeout_per_video: int = 300
     retry_failed: bool = False
     max_retries: int = 1
 
 
+@dataclass
+class _BatchPlan:
+    """Work remaining for a batch after deduplication and cache lookups."""
+    urls: List[str]
+    video_ids: List[Optional[str]]
+    keys: List[Optional[str]]
+    positions: Dict[int, List[int]]  # first index of each video -> all its indices
+    outcomes: List[Optional[Tuple[VideoResult, bool]]]
+    duplicates: int = 0
+    pending: List[int] = field(default_factory=list)
+    prefetched: Dict[str, VideoMetadata] = field(default_factory=dict)
+
+
 class BatchProcessor:
     """Processes multiple videos with limited concurrency."""
     
@@ -30,8 +48,13 @@ class BatchProcessor:
         """Initialize the batch processor."""
         self.config = config or BatchConfig()
         self.semaphore = asyncio.Semaphore(self.config.max_concurrent)
+        self._timeout_error = ErrorInfo.model_construct(
+            code="TIMEOUT",
+            message=f"Video processing timed out after {self.config.timeout_per_video} seconds"
+        )
     
-    async def process_batch(self, urls: List[str], options: AnalysisOptions, request_id: str) -> AnalysisResponse:
+    async def process_batch(self, urls: List[str], options: AnalysisOptions, request_id: str,
+                            video_ids: Optional[List[Optional[str]]] = None) -> AnalysisResponse:
         """
         Process a batch of URLs with limited concurrency.
         
@@ -39,82 +62,183 @@ class BatchProcessor:
             urls: List of YouTube URLs to process
             options: Analysis options
             request_id: Request identifier for correlation
+            video_ids: Video IDs already extracted from urls (extracted here if not given)
             
         Returns:
             Analysis response with results
         """
-        log_with_context("info", f"Starting batch processing: {len(urls)} URLs, max_concurrent={self.config.max_concurrent}")
-        
         start_time = datetime.now()
-        results = []
-        succeeded = 0
-        failed = 0
-        
-        # Create tasks for concurrent processing
-        tasks = []
-        for i, url in enumerate(urls):
-            task = self._process_single_video(url, options, i)
-            tasks.append(task)
-        
-        # Process with limited concurrency
-        if self.config.max_concurrent == 1:
-            # Sequential processing
-            for task in tasks:
-                result, success = await task
-                results.append(result)
-                if success:
-                    succeeded += 1
-                else:
-                    failed += 1
-        else:
-            # Concurrent processing with semaphore
-            completed_tasks = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for task_result in completed_tasks:
-                if isinstance(task_result, Exception):
-                    # Handle task exceptions
-                    log_with_context("error", f"Task failed with exception: {str(task_result)}")
-                    failed += 1
-                    # Create error result
-                    error_result = VideoResult(
-                        url="unknown",
-                        video_id="unknown",
-                        status="error",
-                        error={
-                            "code": "TASK_EXCEPTION",
-                            "message": str(task_result)
-                        }
-                    )
-                    results.append(error_result)
-                else:
-                    result, success = task_result
-                    results.append(result)
-                    if success:
-                        succeeded += 1
-                    else:
-                        failed += 1
+        results: List[Optional[VideoResult]] = [None] * len(urls)
+        aggregation = AggregationInfo.model_construct(total=len(urls), succeeded=0, failed=0,
+                                                      duplicate_urls_collapsed=0)
+        
+        # Counters are updated and results slotted into place as each video
+        # finishes; indexing by position preserves the original URL ordering.
+        async for index, result, _ in self.stream_batch(urls, options, aggregation, video_ids):
+            results[index] = result
+        succeeded, failed = aggregation.succeeded, aggregation.failed
         
         end_time = datetime.now()
         total_time = (end_time - start_time).total_seconds()
         
         log_with_context("info", f"Batch processing completed: {succeeded} succeeded, {failed} failed, took {total_time:.2f}s")
         
-        return AnalysisResponse(
+        # Values come from already-validated inputs, so skip revalidation
+        return AnalysisResponse.model_construct(
             request_id=request_id,
             results=results,
-            aggregation=AggregationInfo(
-                total=len(urls),
-                succeeded=succeeded,
-                failed=failed
-            ),
-            config=ConfigInfo(
-                provider=options.provider,
-                temperature=options.temperature,
-                max_tokens=options.max_tokens
-            )
+            aggregation=aggregation,
+            config=config_info(options.provider, options.temperature, options.max_tokens)
+        )
+    
+    async def stream_batch(self, urls: List[str], options: AnalysisOptions,
+                           aggregation: Optional[AggregationInfo] = None,
+                           video_ids: Optional[List[Optional[str]]] = None) -> AsyncIterator[Tuple[int, VideoResult, bool]]:
+        """
+        Process a batch of URLs, yielding each result as soon as it is ready.
+        
+        Cached results are yielded first, then pipeline results in completion
+        order. Stopping iteration early cancels the videos still in flight.
+        
+        Args:
+            urls: List of YouTube URLs to process
+            options: Analysis options
+            aggregation: Optional aggregation whose counters are updated as results are yielded
+            video_ids: Video IDs already extracted from urls (extracted here if not given)
+            
+        Yields:
+            Tuples of (index in urls, result, success)
+        """
+        log_with_context("info", f"Starting streamed batch processing: {len(urls)} URLs, max_concurrent={self.config.max_concurrent}")
+        
+        plan = await self._plan_batch(urls, options, video_ids)
+        if aggregation is not None:
+            aggregation.total = len(urls)
+            aggregation.duplicate_urls_collapsed = plan.duplicates
+        
+        def tally(items: List[Tuple[int, VideoResult, bool]]) -> List[Tuple[int, VideoResult, bool]]:
+            if aggregation is not None:
+                for _, _, success in items:
+                    if success:
+                        aggregation.succeeded += 1
+                    else:
+                        aggregation.failed += 1
+            return items
+        
+        for source in plan.positions:
+            if plan.outcomes[source] is not None:
+                for item in tally(self._resolve(plan, source)):
+                    yield item
+        
+        tasks = [asyncio.create_task(self._run_planned(plan, i, options)) for i in plan.pending]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                source = await next_done
+                for item in tally(self._resolve(plan, source)):
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _plan_batch(self, urls: List[str], options: AnalysisOptions,
+                          video_ids: Optional[List[Optional[str]]] = None) -> "_BatchPlan":
+        """
+        Collapse duplicate videos, serve cached results and prefetch metadata.
+        
+        Args:
+            urls: List of YouTube URLs to process
+            options: Analysis options
+            video_ids: Video IDs already extracted from urls (extracted here if not given)
+            
+        Returns:
+            Plan listing the videos that still need to run
+        """
+        # Collapse URLs pointing at the same video so each video runs once
+        if video_ids is None:
+            video_ids = [extract_video_id(url) for url in urls]
+        positions: Dict[int, List[int]] = {}
+        first_index: Dict[str, int] = {}
+        for i, (url, video_id) in enumerate(zip(urls, video_ids)):
+            source = first_index.setdefault(video_id or url, i)
+            positions.setdefault(source, []).append(i)
+        duplicates = len(urls) - len(positions)
+        if duplicates:
+            log_with_context("info", f"Collapsed {duplicates} duplicate URLs in batch")
+        
+        plan = _BatchPlan(
+            urls=urls,
+            video_ids=video_ids,
+            # No keys when caching is disabled: nothing is read from or written to the result cache
+            keys=[
+                result_cache.make_key(video_id, options) if video_id and options.cache_enabled else None
+                for video_id in video_ids
+            ],
+            positions=positions,
+            outcomes=[None] * len(urls),
+            duplicates=duplicates
+        )
+        
+        # Serve previously analyzed videos from the result cache
+        cached = {}
+        if options.cache_enabled:
+            cached = await result_cache.get_many(plan.keys[i] for i in positions if plan.keys[i])
+        for i in positions:
+            if plan.keys[i] in cached:
+                plan.outcomes[i] = (cached[plan.keys[i]], True)
+        
+        plan.pending = [i for i in positions if plan.outcomes[i] is None]
+        if not options.cache_enabled:
+            cache_status_var.set("BYPASS")
+        else:
+            cache_status_var.set("MISS" if plan.pending else "HIT")
+        if cached:
+            log_with_context("info", f"Result cache: {len(positions) - len(plan.pending)} of {len(positions)} videos served from cache")
+        
+        # Look up metadata for all remaining videos in bulk; videos missing
+        # from the bulk response fetch their own metadata in the pipeline.
+        plan.prefetched = await metadata_fetcher.fetch_many(
+            [video_ids[i] for i in plan.pending if video_ids[i]]
         )
+        return plan
+    
+    async def _run_planned(self, plan: "_BatchPlan", index: int, options: AnalysisOptions) -> int:
+        """
+        Run the pipeline for one planned video and record its outcome.
+        
+        Misses go through the cache's single-flight fill so that concurrent
+        requests for the same video share one pipeline run.
+        
+        Returns:
+            The index that was processed
+        """
+        url = plan.urls[index]
+        metadata = plan.prefetched.get(plan.video_ids[index])
+        if plan.keys[index] is None:
+            plan.outcomes[index] = await self._process_single_video(url, options, index, metadata)
+            return index
+        
+        async def load() -> VideoResult:
+            result, _ = await self._process_single_video(url, options, index, metadata)
+            return result
+        
+        result = await result_cache.fill(plan.keys[index], load, cacheable=lambda r: r.status == "ok")
+        plan.outcomes[index] = (result, result.status == "ok")
+        return index
     
-    async def _process_single_video(self, url: str, options: AnalysisOptions, index: int) -> Tuple[VideoResult, bool]:
+    def _resolve(self, plan: "_BatchPlan", source: int) -> List[Tuple[int, VideoResult, bool]]:
+        """Fan a video's outcome out to every position that requested it, under its own URL."""
+        result, success = plan.outcomes[source]
+        resolved = []
+        for i in plan.positions[source]:
+            item = result
+            if item.url != plan.urls[i]:
+                item = item.model_copy(update={"url": plan.urls[i]})
+            plan.outcomes[i] = (item, success)
+            resolved.append((i, item, success))
+        return resolved
+    
+    async def _process_single_video(self, url: str, options: AnalysisOptions, index: int,
+                                    metadata: Optional[VideoMetadata] = None) -> Tuple[VideoResult, bool]:
         """
         Process a single video with concurrency control.
         
@@ -122,6 +246,7 @@ class BatchProcessor:
             url: Video URL
             options: Analysis options
             index: Video index in batch
+            metadata: Prefetched video metadata, if available
             
         Returns:
             Tuple of (result, success)
@@ -132,12 +257,15 @@ class BatchProcessor:
                 
                 # Process with timeout
                 result, stats = await asyncio.wait_for(
-                    video_orchestrator.process_video(url, options),
+                    video_orchestrator.process_video(url, options, metadata),
                     timeout=self.config.timeout_per_video
                 )
                 
                 if result.status == "ok":
                     log_with_context("info", f"Video {index + 1} completed successfully (took {stats.total_time:.2f}s)")
+                    if options.include_markdown:
+                        # Rendering is CPU-bound, so keep it off the event loop
+                        result = await asyncio.to_thread(response_formatter.format_video_result, result, True)
                     return result, True
                 else:
                     log_with_context("warning", f"Video {index + 1} failed: {result.error.message}")
@@ -145,29 +273,12 @@ class BatchProcessor:
                     
             except asyncio.TimeoutError:
                 log_with_context("error", f"Video {index + 1} timed out after {self.config.timeout_per_video}s")
-                error_result = VideoResult(
-                    url=url,
-                    video_id="unknown",
-                    status="error",
-                    error={
-                        "code": "TIMEOUT",
-                        "message": f"Video processing timed out after {self.config.timeout_per_video} seconds"
-                    }
-                )
-                return error_result, False
+                return error_result(url, "unknown", self._timeout_error), False
                 
             except Exception as e:
                 log_with_context("error", f"Video {index + 1} failed with exception: {str(e)}")
-                error_result = VideoResult(
-                    url=url,
-                    video_id="unknown",
-                    status="error",
-                    error={
-                        "code": "PROCESSING_ERROR",
-                        "message": str(e)
-                    }
-                )
-                return error_result, False
+                error = ErrorInfo.model_construct(code="PROCESSING_ERROR", message=str(e))
+                return error_result(url, "unknown", error), False
     
     async def process_with_retry(self, urls: List[str], options: AnalysisOptions, request_id: str) -> AnalysisResponse:
         """
@@ -1,24 +1,79 @@
 """
-Simple in-memory cache for transcripts.
+Caching services for transcripts and analysis results.
 """
-from typing import Optional, Dict, List
-from models import TranscriptLine
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import tempfile
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Optional, Dict, List, Iterable, Callable, Awaitable
+from models import TranscriptLine, Transcripts, VideoResult, AnalysisOptions, SummaryData
+from app_logging import log_with_context
+from config import config
 import threading
 import time
 
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Redis is optional; the in-process tier works without it
+    aioredis = None
+
+try:
+    import zstandard
+except ImportError:  # The on-disk transcript tier is skipped without it
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Cache outcome for the current request ("HIT", "MISS" or "BYPASS"), exposed as X-Cache
+cache_status_var: ContextVar[str] = ContextVar('cache_status', default='')
+
+
+# Release / extend a compute lock only while it still holds this worker's token,
+# so a worker whose lock expired cannot drop or extend another worker's lock
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+_EXTEND_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class _FillAbandoned(Exception):
+    """Set on an in-flight fill whose owner was cancelled, so waiters retry the load."""
+
 
 class TranscriptCache:
-    """Simple in-memory cache for transcripts with TTL."""
+    """Simple in-memory LRU cache for transcripts with TTL."""
+    
+    # Expired entries are also swept from the whole cache every this many inserts
+    SWEEP_INTERVAL = 256
     
-    def __init__(self, ttl_seconds: int = 3600):
+    def __init__(self, ttl_seconds: int = 3600, max_size: int = 1024):
         """
         Initialize cache with TTL.
         
         Args:
             ttl_seconds: Time to live for cached items in seconds
+            max_size: Maximum number of transcripts kept; least recently used are evicted first
         """
-        self._cache: Dict[str, tuple] = {}  # video_id -> (transcript_lines, timestamp)
+        self._cache: OrderedDict[str, tuple] = OrderedDict()  # video_id -> (transcript_lines, timestamp)
         self._ttl = ttl_seconds
+        self._max_size = max_size
+        self._inserts = 0
         self._lock = threading.Lock()
     
     def get_transcript(self, video_id: str) -> Optional[List[TranscriptLine]]:
@@ -42,6 +97,7 @@ class TranscriptCache:
                 del self._cache[video_id]
                 return None
             
+            self._cache.move_to_end(video_id)
             return transcript_lines
     
     def set_transcript(self, video_id: str, transcript_lines: List[TranscriptLine]) -> None:
@@ -54,6 +110,21 @@ class TranscriptCache:
         """
         with self._lock:
             self._cache[video_id] = (transcript_lines, time.time())
+            self._cache.move_to_end(video_id)
+            
+            self._inserts += 1
+            if self._inserts % self.SWEEP_INTERVAL == 0:
+                self._sweep_expired()
+            
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+    
+    def _sweep_expired(self) -> None:
+        """Drop every expired entry (caller holds the lock)."""
+        cutoff = time.time() - self._ttl
+        expired = [video_id for video_id, (_, timestamp) in self._cache.items() if timestamp < cutoff]
+        for video_id in expired:
+            del self._cache[video_id]
     
     def clear(self) -> None:
         """Clear all cached transcripts."""
@@ -66,5 +137,543 @@ class TranscriptCache:
             return len(self._cache)
 
 
-# Global cache instance
+class DiskTranscriptCache:
+    """
+    On-disk cache for transcripts, shared by every worker on the host.
+    
+    Each transcript is stored as zstd-compressed JSON in
+    ``<video_id>-<lang>.json.zst`` and is written atomically, so readers
+    never see a partial file. Entries older than the TTL are ignored.
+    
+    Complete fetch_transcripts results are stored alongside in
+    ``<video_id>.<languages>.transcripts.json.zst`` so a repeat analysis
+    needs no YouTube round-trips at all.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, ttl_seconds: int = 7 * 24 * 3600,
+                 compression_level: int = 3):
+        """
+        Initialize the disk cache.
+        
+        Args:
+            cache_dir: Directory holding cached transcripts (disabled if not set)
+            ttl_seconds: Maximum age of a cached transcript in seconds
+            compression_level: zstd compression level
+        """
+        self._dir = Path(cache_dir) if cache_dir else None
+        self._ttl = ttl_seconds
+        self._level = compression_level
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether the disk tier is configured and zstandard is available."""
+        return self._dir is not None and zstandard is not None
+    
+    def _path(self, video_id: str, language: str) -> Path:
+        """Build the file path for a video and language."""
+        return self._dir / f"{video_id}-{language}.json.zst"
+    
+    def _bundle_path(self, video_id: str, languages: Iterable[str]) -> Path:
+        """Build the file path for a complete transcripts result."""
+        # Hash the preference list: joined raw codes can collide ("zh-Hans" vs
+        # "zh", "Hans") and are user input that must not shape the path
+        digest = hashlib.blake2b(json.dumps(list(languages)).encode(), digest_size=8).hexdigest()
+        return self._dir / f"{video_id}.{digest}.transcripts.json.zst"
+    
+    def _read(self, path: Path) -> Optional[Any]:
+        """Read and decode a cached file, counting the hit or miss."""
+        try:
+            if time.time() - path.stat().st_mtime > self._ttl:
+                self.misses += 1
+                return None
+            data = json.loads(zstandard.decompress(path.read_bytes()))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            log_with_context("warning", f"Ignoring unreadable cached transcript {path.name}: {str(e)}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+    
+    def _write(self, path: Path, data: Any) -> None:
+        """Encode and atomically write a cached file."""
+        payload = json.dumps(data).encode()
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(zstandard.ZstdCompressor(level=self._level).compress(payload))
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            log_with_context("warning", f"Failed to write cached transcript {path.name}: {str(e)}")
+    
+    def get_transcript(self, video_id: str, language: str) -> Optional[List[TranscriptLine]]:
+        """
+        Get a cached transcript from disk.
+        
+        Args:
+            video_id: YouTube video ID
+            language: Transcript language code or per-track cache key
+            
+        Returns:
+            Cached transcript lines or None if not found/expired
+        """
+        if not self.enabled:
+            return None
+        
+        lines = self._read(self._path(video_id, language))
+        return [TranscriptLine(**line) for line in lines] if lines else None
+    
+    def set_transcript(self, video_id: str, language: str, transcript_lines: List[TranscriptLine]) -> None:
+        """
+        Write a transcript to disk.
+        
+        Args:
+            video_id: YouTube video ID
+            language: Transcript language code or per-track cache key
+            transcript_lines: Transcript lines to cache
+        """
+        if not self.enabled or not transcript_lines:
+            return
+        
+        self._write(self._path(video_id, language), [asdict(line) for line in transcript_lines])
+    
+    def get_transcripts(self, video_id: str, languages: Iterable[str]) -> Optional[Transcripts]:
+        """
+        Get a cached fetch_transcripts result from disk.
+        
+        Args:
+            video_id: YouTube video ID
+            languages: Preferred language codes the result was fetched with
+            
+        Returns:
+            Cached transcripts or None if not found/expired
+        """
+        if not self.enabled:
+            return None
+        
+        data = self._read(self._bundle_path(video_id, languages))
+        return Transcripts.model_validate(data) if data else None
+    
+    def set_transcripts(self, video_id: str, languages: Iterable[str], transcripts: Transcripts) -> None:
+        """
+        Write a fetch_transcripts result to disk.
+        
+        Args:
+            video_id: YouTube video ID
+            languages: Preferred language codes the result was fetched with
+            transcripts: Transcripts to cache
+        """
+        if not self.enabled:
+            return
+        
+        self._write(self._bundle_path(video_id, languages), transcripts.model_dump(mode="json"))
+    
+    def clear(self) -> None:
+        """Remove all cached transcripts."""
+        if self._dir is None or not self._dir.exists():
+            return
+        for path in self._dir.glob("*.json.zst"):
+            path.unlink(missing_ok=True)
+
+
+class ResultCache:
+    """
+    Two-tier cache for analysis results.
+    
+    An in-process TTL dictionary (L1) sits in front of an optional Redis
+    instance (L2) shared across workers. Results are stored as JSON in Redis
+    and as VideoResult objects locally.
+    
+    Misses are computed by a single caller per key: concurrent callers in
+    this process await the same future, and across workers a short-lived
+    Redis lock elects one worker while the others poll for its result.
+    """
+    
+    def __init__(self, ttl_seconds: int = 3600, local_ttl_seconds: int = 60,
+                 local_max_size: int = 1024, redis_url: Optional[str] = None,
+                 lock_timeout: int = 30, early_refresh_window: float = 0.2):
+        """
+        Initialize the result cache.
+        
+        Args:
+            ttl_seconds: Time to live for results in Redis
+            local_ttl_seconds: Time to live for results in the in-process tier
+            local_max_size: Maximum number of results kept in-process
+            redis_url: Redis connection URL (in-process only if not set)
+            lock_timeout: Seconds a compute lock lives without being extended;
+                the holder extends it while its loader runs
+            early_refresh_window: Fraction of the TTL before expiry in which
+                entries may be refreshed ahead of time
+        """
+        self._local: Dict[str, tuple] = {}  # key -> (VideoResult, timestamp)
+        self._ttl = ttl_seconds
+        self._local_ttl = local_ttl_seconds
+        self._local_max_size = local_max_size
+        self._lock = threading.Lock()
+        self._redis_url = redis_url
+        self._redis = None
+        self._lock_timeout = lock_timeout
+        self._early_refresh_window = early_refresh_window
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    @staticmethod
+    def make_key(video_id: str, options: AnalysisOptions) -> str:
+        """Build the cache key for a video and the options that shape its result."""
+        raw = "|".join([
+            video_id,
+            options.provider,
+            str(options.temperature),
+            str(options.max_tokens),
+            ",".join(options.languages),
+            str(options.include_markdown),
+        ])
+        return "result:" + hashlib.sha256(raw.encode()).hexdigest()
+    
+    def _get_redis(self):
+        """Lazily create the Redis client if Redis is configured and available."""
+        if self._redis is None and self._redis_url and aioredis is not None:
+            self._redis = aioredis.from_url(self._redis_url)
+        return self._redis
+    
+    def _jittered_ttl(self, ttl: Optional[int]) -> int:
+        """Spread expiry by +/-10% so entries written together do not expire together."""
+        return max(1, int((ttl or self._ttl) * random.uniform(0.9, 1.1)))
+    
+    def _should_refresh_early(self, remaining: int) -> bool:
+        """
+        Decide whether a Redis hit close to expiry should be treated as a miss.
+        
+        The probability ramps from 0 at the start of the refresh window to 1
+        at expiry, so normally a single caller refreshes the entry while the
+        others keep serving it.
+        """
+        window = self._ttl * self._early_refresh_window
+        if remaining < 0 or window <= 0 or remaining >= window:
+            return False
+        return random.random() > remaining / window
+    
+    def _get_local(self, key: str) -> Optional[VideoResult]:
+        """Get a result from the in-process tier."""
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            result, timestamp = entry
+            if time.time() - timestamp > self._local_ttl:
+                del self._local[key]
+                return None
+            return result
+    
+    def _set_local(self, key: str, result: VideoResult) -> None:
+        """Store a result in the in-process tier."""
+        with self._lock:
+            if key not in self._local and len(self._local) >= self._local_max_size:
+                # Evict the oldest insertion to stay bounded
+                self._local.pop(next(iter(self._local)))
+            self._local[key] = (result, time.time())
+    
+    async def get_many(self, keys: Iterable[str], early_refresh: bool = True) -> Dict[str, VideoResult]:
+        """
+        Look up several results at once.
+        
+        Args:
+            keys: Cache keys to look up
+            early_refresh: Whether Redis entries close to expiry may be
+                reported as misses so that they get recomputed ahead of time
+            
+        Returns:
+            Mapping of key to cached result for every key that was found
+        """
+        found: Dict[str, VideoResult] = {}
+        missing: List[str] = []
+        
+        for key in keys:
+            result = self._get_local(key)
+            if result is not None:
+                found[key] = result
+            elif key not in missing:
+                missing.append(key)
+        
+        redis = self._get_redis()
+        if missing and redis is not None:
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    for key in missing:
+                        pipe.get(key)
+                        pipe.ttl(key)
+                    replies = await pipe.execute()
+                for key, value, remaining in zip(missing, replies[::2], replies[1::2]):
+                    if value is None:
+                        continue
+                    if early_refresh and self._should_refresh_early(remaining):
+                        log_with_context("info", f"Refreshing cached result ahead of expiry ({remaining}s left)")
+                        continue
+                    result = VideoResult(**json.loads(value))
+                    self._set_local(key, result)
+                    found[key] = result
+            except Exception as e:
+                log_with_context("warning", f"Result cache lookup failed: {str(e)}")
+        
+        return found
+    
+    async def set_many(self, items: Dict[str, VideoResult], ttl: Optional[int] = None) -> None:
+        """
+        Store several results at once.
+        
+        Args:
+            items: Mapping of cache key to result
+            ttl: Time to live in seconds (default: cache TTL), jittered by +/-10%
+        """
+        if not items:
+            return
+        
+        for key, result in items.items():
+            self._set_local(key, result)
+        
+        redis = self._get_redis()
+        if redis is not None:
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    for key, result in items.items():
+                        pipe.set(key, result.model_dump_json(), ex=self._jittered_ttl(ttl))
+                    await pipe.execute()
+            except Exception as e:
+                log_with_context("warning", f"Result cache store failed: {str(e)}")
+    
+    async def fill(self, key: str, loader: Callable[[], Awaitable[VideoResult]],
+                   ttl: Optional[int] = None,
+                   cacheable: Optional[Callable[[VideoResult], bool]] = None) -> VideoResult:
+        """
+        Compute and store a missing result, letting only one caller compute it.
+        
+        Args:
+            key: Cache key
+            loader: Async callable producing the result
+            ttl: Time to live in seconds (default: cache TTL)
+            cacheable: Predicate deciding whether a result is stored (default: always)
+            
+        Returns:
+            Result computed by this caller or by the caller holding the lock
+        """
+        future = self._inflight.get(key)
+        while future is not None:
+            try:
+                return await asyncio.shield(future)
+            except _FillAbandoned:
+                # The loading caller was cancelled; take over (or join whoever did)
+                future = self._inflight.get(key)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._fill_locked(key, loader, ttl, cacheable)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            # Don't cancel the waiters along with this caller: hand them an
+            # exception they retry on instead
+            future.set_exception(_FillAbandoned())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+    
+    async def _fill_locked(self, key: str, loader: Callable[[], Awaitable[VideoResult]],
+                           ttl: Optional[int],
+                           cacheable: Optional[Callable[[VideoResult], bool]]) -> VideoResult:
+        """
+        Compute a result under the cross-worker Redis lock, if Redis is available.
+        
+        Workers that find the lock taken wait for as long as it is held and
+        return the result its holder stores. If the lock goes away without a
+        stored result (an uncacheable result, or a holder that died), they
+        race for the lock again.
+        """
+        redis = self._get_redis()
+        if redis is None:
+            return await self._load(key, loader, ttl, cacheable)
+        
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        lock_ms = int(self._lock_timeout * 1000)
+        while True:
+            try:
+                got_lock = bool(await redis.set(lock_key, token, nx=True, px=lock_ms))
+            except Exception as e:
+                log_with_context("warning", f"Result cache lock failed: {str(e)}")
+                return await self._load(key, loader, ttl, cacheable)
+            
+            if got_lock:
+                break
+            
+            try:
+                cached = await self._wait_for_fill(redis, key, lock_key)
+            except Exception as e:
+                log_with_context("warning", f"Result cache lock check failed: {str(e)}")
+                return await self._load(key, loader, ttl, cacheable)
+            if cached is not None:
+                return cached
+        
+        keepalive = asyncio.create_task(self._extend_lock(redis, lock_key, token, lock_ms))
+        try:
+            return await self._load(key, loader, ttl, cacheable)
+        finally:
+            keepalive.cancel()
+            try:
+                await redis.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+            except Exception as e:
+                log_with_context("warning", f"Result cache unlock failed: {str(e)}")
+    
+    async def _load(self, key: str, loader: Callable[[], Awaitable[VideoResult]],
+                    ttl: Optional[int],
+                    cacheable: Optional[Callable[[VideoResult], bool]]) -> VideoResult:
+        """Run the loader and store its result if it is cacheable."""
+        result = await loader()
+        if cacheable is None or cacheable(result):
+            await self.set_many({key: result}, ttl)
+        return result
+    
+    async def _wait_for_fill(self, redis, key: str, lock_key: str) -> Optional[VideoResult]:
+        """Wait while another worker holds the lock; return its result, or None once the lock is gone."""
+        delay = 0.1
+        while True:
+            cached = await self.get_many([key], early_refresh=False)
+            if key in cached:
+                return cached[key]
+            if not await redis.exists(lock_key):
+                return None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+    
+    async def _extend_lock(self, redis, lock_key: str, token: str, lock_ms: int) -> None:
+        """Keep extending the lock while its holder's loader runs."""
+        while True:
+            await asyncio.sleep(lock_ms / 3000)
+            try:
+                if not await redis.eval(_EXTEND_LOCK_SCRIPT, 1, lock_key, token, lock_ms):
+                    log_with_context("warning", "Result cache lock was lost while computing")
+                    return
+            except Exception as e:
+                log_with_context("warning", f"Result cache lock extension failed: {str(e)}")
+    
+    async def get_or_set(self, key: str, loader: Callable[[], Awaitable[VideoResult]],
+                         ttl: Optional[int] = None,
+                         cacheable: Optional[Callable[[VideoResult], bool]] = None) -> VideoResult:
+        """
+        Return the cached result for a key, computing and storing it on a miss.
+        
+        Args:
+            key: Cache key
+            loader: Async callable producing the result on a miss
+            ttl: Time to live in seconds (default: cache TTL)
+            cacheable: Predicate deciding whether a result is stored (default: always)
+            
+        Returns:
+            Cached or freshly computed result
+        """
+        cached = await self.get_many([key])
+        if key in cached:
+            return cached[key]
+        
+        return await self.fill(key, loader, ttl, cacheable)
+    
+    def clear(self) -> None:
+        """Clear the in-process tier."""
+        with self._lock:
+            self._local.clear()
+    
+    def size(self) -> int:
+        """Get number of results held in-process."""
+        with self._lock:
+            return len(self._local)
+
+
+class SummaryCache:
+    """
+    In-process LRU cache of chunk summaries.
+    
+    A chunk summary depends only on the chunk text, its prompt context and
+    the model settings, so re-analysing a video (or overlapping content)
+    can reuse it instead of making another LLM request.
+    """
+    
+    def __init__(self, max_size: int = 1024):
+        """
+        Initialize the summary cache.
+        
+        Args:
+            max_size: Maximum number of summaries kept; least recently used are evicted first
+        """
+        self._entries: OrderedDict[str, SummaryData] = OrderedDict()
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(text: str, language: str, chunk_info: Optional[dict], *model_settings: Any) -> str:
+        """Build the cache key for a chunk, its context and the model settings that shape its summary."""
+        digest = hashlib.blake2b(text.encode(), digest_size=16)
+        digest.update(repr((language, sorted(chunk_info.items()) if chunk_info else None, model_settings)).encode())
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[SummaryData]:
+        """Get a cached summary, marking it as recently used."""
+        with self._lock:
+            summary = self._entries.get(key)
+            if summary is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return summary
+    
+    def set(self, key: str, summary: SummaryData) -> None:
+        """Store a summary, evicting the least recently used one if full."""
+        with self._lock:
+            self._entries[key] = summary
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Clear all cached summaries."""
+        with self._lock:
+            self._entries.clear()
+    
+    def size(self) -> int:
+        """Get number of cached summaries."""
+        with self._lock:
+            return len(self._entries)
+
+
+def get_cache_status() -> str:
+    """Get the result cache outcome for the current request."""
+    return cache_status_var.get('')
+
+
+# Global cache instances
 cache = TranscriptCache()
+disk_cache = DiskTranscriptCache(
+    cache_dir=config.transcript_cache_dir,
+    ttl_seconds=config.transcript_cache_ttl
+)
+result_cache = ResultCache(
+    ttl_seconds=config.result_cache_ttl,
+    redis_url=config.redis_url
+)
+summary_cache = SummaryCache(max_size=config.summary_cache_size)
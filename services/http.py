@@ -0,0 +1,54 @@
+"""
+Shared HTTP client for outbound requests.
+"""
+import logging
+from typing import Optional
+
+import httpx
+
+from app_logging import log_with_context
+from config import config
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    """Check whether the optional HTTP/2 dependency (h2) is installed."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared async HTTP client, creating it on first use.
+    
+    Reusing one pooled client keeps connections (and their TLS sessions)
+    alive across requests and, with HTTP/2, multiplexes concurrent calls to
+    the same host over a single socket.
+    
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        http2 = _http2_available()
+        _client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=config.request_timeout
+        )
+        log_with_context("info", f"Created shared HTTP client (http2={http2})")
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client, if it was created."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
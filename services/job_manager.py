@@ -3,8 +3,12 @@ Job manager for async processing of video analysis tasks.
 """
 import logging
 import asyncio
+import heapq
+import time
 import uuid
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
@@ -23,13 +27,67 @@ class JobState(Enum):
     FAILED = "failed"
 
 
+def _from_ns(timestamp_ns: Optional[int]) -> Optional[datetime]:
+    """Convert a time.time_ns() timestamp to a local datetime."""
+    return datetime.fromtimestamp(timestamp_ns / 1e9) if timestamp_ns is not None else None
+
+
+@dataclass(slots=True)
+class _Job:
+    """
+    In-memory job record; converted to JobStatus only when returned to callers.
+    
+    Timestamps are kept as time.time_ns() integers and only turned into
+    datetimes when a status is requested.
+    """
+    job_id: str
+    status: str
+    created_ns: int
+    completed_ns: Optional[int] = None
+    result: Optional[AnalysisResponse] = None
+    error: Optional[ErrorInfo] = None
+    
+    def to_status(self) -> JobStatus:
+        """Build the API model for this job."""
+        return JobStatus.model_construct(
+            job_id=self.job_id,
+            status=self.status,
+            created_at=_from_ns(self.created_ns),
+            completed_at=_from_ns(self.completed_ns),
+            result=self.result,
+            error=self.error
+        )
+
+
 class JobManager:
     """Manages async job processing."""
     
-    def __init__(self):
-        """Initialize the job manager."""
-        self.jobs: Dict[str, JobStatus] = {}
+    TERMINAL = frozenset({JobState.COMPLETED.value, JobState.FAILED.value})
+    
+    def __init__(self, max_jobs: int = 10_000):
+        """
+        Initialize the job manager.
+        
+        Args:
+            max_jobs: Maximum number of jobs kept; the oldest finished jobs are evicted first
+        """
+        self.jobs: OrderedDict[str, _Job] = OrderedDict()
+        self.max_jobs = max_jobs
         self.running_tasks: Dict[str, asyncio.Task] = {}
+        # Running count of jobs per state, kept in step by _transition
+        self._counts: Counter = Counter()
+        # (completion timestamp, job_id), oldest first, for cleanup
+        self._completion_heap: List[Tuple[float, str]] = []
+    
+    def _transition(self, job: _Job, new_state: JobState) -> None:
+        """Move a job to a new state, keeping the per-state counters in step."""
+        if job.status == new_state.value:
+            return
+        self._counts[job.status] -= 1
+        self._counts[new_state.value] += 1
+        job.status = new_state.value
+        if job.status in self.TERMINAL:
+            heapq.heappush(self._completion_heap, (time.time(), job.job_id))
     
     async def create_job(self, request: AnalysisRequest) -> str:
         """
@@ -44,16 +102,15 @@ class JobManager:
         job_id = str(uuid.uuid4())
         
         # Create job status
-        job_status = JobStatus(
+        job_status = _Job(
             job_id=job_id,
             status=JobState.PENDING.value,
-            created_at=datetime.now(),
-            completed_at=None,
-            result=None,
-            error=None
+            created_ns=time.time_ns()
         )
         
         self.jobs[job_id] = job_status
+        self._counts[job_status.status] += 1
+        self._evict()
         
         # Start processing task
         task = asyncio.create_task(self._process_job(job_id, request))
@@ -62,6 +119,18 @@ class JobManager:
         log_with_context("info", f"Created async job {job_id} for {len(request.urls)} URLs")
         return job_id
     
+    def _evict(self) -> None:
+        """Drop the oldest finished jobs while more than max_jobs are held."""
+        kept = 0
+        while len(self.jobs) > self.max_jobs and kept < len(self.jobs):
+            job_id, job = self.jobs.popitem(last=False)
+            if job.status in self.TERMINAL:
+                self._counts[job.status] -= 1
+            else:
+                # Still pending or running: keep it, now as the newest entry
+                self.jobs[job_id] = job
+                kept += 1
+    
     async def get_job_status(self, job_id: str) -> Optional[JobStatus]:
         """
         Get job status by ID.
@@ -72,7 +141,8 @@ class JobManager:
         Returns:
             Job status or None if not found
         """
-        return self.jobs.get(job_id)
+        job = self.jobs.get(job_id)
+        return job.to_status() if job else None
     
     async def cancel_job(self, job_id: str) -> bool:
         """
@@ -88,7 +158,7 @@ class JobManager:
             return False
         
         job = self.jobs[job_id]
-        if job.status in [JobState.COMPLETED.value, JobState.FAILED.value]:
+        if job.status in self.TERMINAL:
             return False
         
         # Cancel the task
@@ -98,8 +168,8 @@ class JobManager:
             del self.running_tasks[job_id]
         
         # Update job status
-        job.status = JobState.FAILED.value
-        job.completed_at = datetime.now()
+        self._transition(job, JobState.FAILED)
+        job.completed_ns = time.time_ns()
         job.error = ErrorInfo(
             code="JOB_CANCELLED",
             message="Job was cancelled by user"
@@ -119,20 +189,21 @@ class JobManager:
         try:
             # Update job status to running
             job = self.jobs[job_id]
-            job.status = JobState.RUNNING.value
+            self._transition(job, JobState.RUNNING)
             
             log_with_context("info", f"Started processing job {job_id}")
             
             # Process the batch
             response = await default_batch_processor.process_batch(
-                [str(url) for url in request.urls],
+                request.urls,
                 request.options,
-                job_id
+                job_id,
+                request.video_ids
             )
             
             # Update job with result
-            job.status = JobState.COMPLETED.value
-            job.completed_at = datetime.now()
+            self._transition(job, JobState.COMPLETED)
+            job.completed_ns = time.time_ns()
             job.result = response
             
             log_with_context("info", f"Completed job {job_id}: {response.aggregation.succeeded} succeeded, {response.aggregation.failed} failed")
@@ -140,8 +211,8 @@ class JobManager:
         except asyncio.CancelledError:
             # Job was cancelled
             job = self.jobs[job_id]
-            job.status = JobState.FAILED.value
-            job.completed_at = datetime.now()
+            self._transition(job, JobState.FAILED)
+            job.completed_ns = time.time_ns()
             job.error = ErrorInfo(
                 code="JOB_CANCELLED",
                 message="Job was cancelled"
@@ -151,8 +222,8 @@ class JobManager:
         except Exception as e:
             # Job failed with error
             job = self.jobs[job_id]
-            job.status = JobState.FAILED.value
-            job.completed_at = datetime.now()
+            self._transition(job, JobState.FAILED)
+            job.completed_ns = time.time_ns()
             job.error = ErrorInfo(
                 code="JOB_ERROR",
                 message=str(e)
@@ -166,36 +237,30 @@ class JobManager:
     
     def get_job_count(self) -> Dict[str, int]:
         """Get job statistics."""
-        total = len(self.jobs)
-        pending = sum(1 for job in self.jobs.values() if job.status == JobState.PENDING.value)
-        running = sum(1 for job in self.jobs.values() if job.status == JobState.RUNNING.value)
-        completed = sum(1 for job in self.jobs.values() if job.status == JobState.COMPLETED.value)
-        failed = sum(1 for job in self.jobs.values() if job.status == JobState.FAILED.value)
-        
         return {
-            "total": total,
-            "pending": pending,
-            "running": running,
-            "completed": completed,
-            "failed": failed
+            "total": len(self.jobs),
+            "pending": self._counts[JobState.PENDING.value],
+            "running": self._counts[JobState.RUNNING.value],
+            "completed": self._counts[JobState.COMPLETED.value],
+            "failed": self._counts[JobState.FAILED.value]
         }
     
     def cleanup_old_jobs(self, max_age_hours: int = 24):
         """Clean up old completed jobs."""
-        cutoff_time = datetime.now().timestamp() - (max_age_hours * 3600)
-        
-        jobs_to_remove = []
-        for job_id, job in self.jobs.items():
-            if (job.status in [JobState.COMPLETED.value, JobState.FAILED.value] and 
-                job.completed_at and 
-                job.completed_at.timestamp() < cutoff_time):
-                jobs_to_remove.append(job_id)
+        cutoff_time = time.time() - (max_age_hours * 3600)
         
-        for job_id in jobs_to_remove:
-            del self.jobs[job_id]
+        removed = 0
+        heap = self._completion_heap
+        while heap and heap[0][0] < cutoff_time:
+            _, job_id = heapq.heappop(heap)
+            job = self.jobs.get(job_id)
+            if job is not None and job.status in self.TERMINAL:
+                del self.jobs[job_id]
+                self._counts[job.status] -= 1
+                removed += 1
         
-        if jobs_to_remove:
-            log_with_context("info", f"Cleaned up {len(jobs_to_remove)} old jobs")
+        if removed:
+            log_with_context("info", f"Cleaned up {removed} old jobs")
 
 
 # Global instance
@@ -1,23 +1,68 @@
 """
-Metadata fetcher using yt-dlp to extract video information.
+Metadata fetcher using YouTube's InnerTube player endpoint with a yt-dlp
+fallback, plus bulk lookups through the YouTube Data API.
 """
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List
+import httpx
 import yt_dlp
-from datetime import datetime
+from datetime import datetime, timezone
 
 from models import VideoMetadata, ErrorInfo
 from app_logging import log_with_context
+from config import config
 from .utils import extract_video_id
+from .http import get_http_client
 
 logger = logging.getLogger(__name__)
 
+YOUTUBE_VIDEOS_API_URL = "https://www.googleapis.com/youtube/v3/videos"
+YOUTUBE_VIDEOS_MAX_IDS = 50  # videos.list accepts at most 50 ids per call
+
+INNERTUBE_PLAYER_URL = "https://www.youtube.com/youtubei/v1/player"
+INNERTUBE_CONTEXT = {"client": {"clientName": "WEB", "clientVersion": "2.20240101.00.00"}}
+
+# yt-dlp info fields read by _normalize_metadata, in unpacking order
+_INFO_FIELDS = ('title', 'uploader', 'channel', 'uploader_id', 'duration', 'webpage_url')
+_DATE_FIELDS = ('upload_date', 'release_date', 'timestamp')
+
+_ISO_DURATION_RE = re.compile(r'^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
+
+
+def _iso_z(dt: datetime) -> str:
+    """Format a datetime as YYYY-MM-DDTHH:MM:SSZ (aware datetimes are converted to UTC)."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.isoformat(timespec='seconds') + 'Z'
+
 
 class MetadataFetcher:
     """Fetches video metadata using yt-dlp."""
     
-    def __init__(self):
-        """Initialize the metadata fetcher."""
+    def __init__(self, cache_max_size: int = 2000, cache_ttl: int = 3600, ydl_pool_size: int = 4):
+        """
+        Initialize the metadata fetcher.
+        
+        Args:
+            cache_max_size: Maximum number of videos kept in the metadata cache
+            cache_ttl: Time to live for cached metadata in seconds
+            ydl_pool_size: Maximum number of idle YoutubeDL instances kept for reuse
+        """
+        # video_id -> (timestamp, metadata), least recently used first
+        self._cache: OrderedDict[str, tuple] = OrderedDict()
+        self._cache_max_size = cache_max_size
+        self._cache_ttl = cache_ttl
+        self._cache_lock = threading.Lock()
+        # Idle YoutubeDL instances; each is used by one thread at a time
+        self._ydl_pool: queue.SimpleQueue = queue.SimpleQueue()
+        self._ydl_pool_size = ydl_pool_size
         self.ydl_opts = {
             'quiet': True,
             'no_warnings': True,
@@ -32,12 +77,61 @@ class MetadataFetcher:
         """Extract video ID from YouTube URL."""
         return extract_video_id(url)
     
-    def fetch_metadata(self, url: str) -> tuple[Optional[VideoMetadata], Optional[ErrorInfo]]:
+    @contextmanager
+    def _borrow_ydl(self):
+        """Borrow a YoutubeDL instance, creating one if none is idle, and return it afterwards."""
+        try:
+            ydl = self._ydl_pool.get_nowait()
+        except queue.Empty:
+            ydl = yt_dlp.YoutubeDL(self.ydl_opts)
+        try:
+            yield ydl
+        finally:
+            if self._ydl_pool.qsize() < self._ydl_pool_size:
+                self._ydl_pool.put(ydl)
+            else:
+                ydl.close()
+    
+    def _cache_get(self, video_id: str) -> Optional[VideoMetadata]:
+        """Get cached metadata for a video, or None if missing/expired."""
+        with self._cache_lock:
+            entry = self._cache.get(video_id)
+            if entry is None:
+                return None
+            timestamp, metadata = entry
+            if time.monotonic() - timestamp >= self._cache_ttl:
+                del self._cache[video_id]
+                return None
+            self._cache.move_to_end(video_id)
+            return metadata
+    
+    def _cache_set(self, video_id: str, metadata: VideoMetadata) -> None:
+        """Cache metadata for a video, evicting the least recently used entry if full."""
+        with self._cache_lock:
+            self._cache[video_id] = (time.monotonic(), metadata)
+            self._cache.move_to_end(video_id)
+            if len(self._cache) > self._cache_max_size:
+                self._cache.popitem(last=False)
+    
+    def cache_clear(self) -> int:
+        """
+        Drop all cached metadata.
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._cache_lock:
+            removed = len(self._cache)
+            self._cache.clear()
+            return removed
+    
+    def fetch_metadata(self, url: str, video_id: Optional[str] = None) -> tuple[Optional[VideoMetadata], Optional[ErrorInfo]]:
         """
         Fetch video metadata using yt-dlp.
         
         Args:
             url: YouTube video URL
+            video_id: Video ID already extracted from url (extracted here if not given)
             
         Returns:
             Tuple of (metadata, error). If successful, metadata is populated and error is None.
@@ -47,15 +141,19 @@ class MetadataFetcher:
             log_with_context("info", f"Fetching metadata for URL: {url}")
             
             # Extract video ID first
-            video_id = self.extract_video_id(url)
+            video_id = video_id or self.extract_video_id(url)
             if not video_id:
                 return None, ErrorInfo(
                     code="INVALID_URL",
                     message="Could not extract video ID from URL. Please provide a valid YouTube URL."
                 )
             
-            # Use yt-dlp to fetch metadata
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
+            cached = self._cache_get(video_id)
+            if cached:
+                return cached, None
+            
+            # Use a pooled yt-dlp instance; construction loads every extractor
+            with self._borrow_ydl() as ydl:
                 try:
                     info = ydl.extract_info(url, download=False)
                 except Exception as e:
@@ -84,6 +182,7 @@ class MetadataFetcher:
                 
                 # Extract and normalize metadata
                 metadata = self._normalize_metadata(info, url, video_id)
+                self._cache_set(video_id, metadata)
                 log_with_context("info", f"Successfully fetched metadata for video: {metadata.title}")
                 
                 return metadata, None
@@ -95,27 +194,182 @@ class MetadataFetcher:
                 message=f"Unexpected error: {str(e)}"
             )
     
+    async def fetch_metadata_async(self, url: str, video_id: Optional[str] = None) -> tuple[Optional[VideoMetadata], Optional[ErrorInfo]]:
+        """
+        Fetch video metadata without blocking the event loop.
+        
+        A single InnerTube player call on the shared HTTP client returns every
+        field we use. If it fails or the video is not playable, this falls
+        back to fetch_metadata (yt-dlp) in a worker thread, which also
+        produces the detailed error codes.
+        
+        Args:
+            url: YouTube video URL
+            video_id: Video ID already extracted from url (extracted here if not given)
+            
+        Returns:
+            Tuple of (metadata, error), as for fetch_metadata
+        """
+        video_id = video_id or self.extract_video_id(url)
+        if video_id:
+            cached = self._cache_get(video_id)
+            if cached:
+                return cached, None
+            
+            metadata = await self._fetch_innertube(video_id)
+            if metadata:
+                self._cache_set(video_id, metadata)
+                log_with_context("info", f"Successfully fetched metadata for video: {metadata.title}")
+                return metadata, None
+        
+        return await asyncio.to_thread(self.fetch_metadata, url, video_id)
+    
+    async def _fetch_innertube(self, video_id: str) -> Optional[VideoMetadata]:
+        """Fetch metadata from the InnerTube player endpoint (None on failure)."""
+        try:
+            response = await get_http_client().post(
+                INNERTUBE_PLAYER_URL,
+                params={"prettyPrint": "false"},
+                json={"videoId": video_id, "context": INNERTUBE_CONTEXT}
+            )
+            response.raise_for_status()
+            return self._normalize_player_response(response.json(), video_id)
+        except Exception as e:
+            log_with_context("warning", f"InnerTube metadata fetch failed for {video_id}: {str(e)}")
+            return None
+    
+    def _normalize_player_response(self, data: Dict[str, Any], video_id: str) -> Optional[VideoMetadata]:
+        """Normalize an InnerTube player response into our VideoMetadata model."""
+        if data.get("playabilityStatus", {}).get("status") != "OK":
+            return None
+        details = data.get("videoDetails")
+        if not details:
+            return None
+        
+        microformat = data.get("microformat", {}).get("playerMicroformatRenderer", {})
+        return VideoMetadata(
+            title=details.get("title") or f"Video {video_id}",
+            channel=details.get("author") or microformat.get("ownerChannelName") or "Unknown Channel",
+            published_at=self._format_api_date(microformat.get("publishDate")),
+            duration_sec=int(details.get("lengthSeconds") or 0),
+            url=f"https://www.youtube.com/watch?v={video_id}"
+        )
+    
+    async def fetch_many(self, video_ids: List[str]) -> Dict[str, VideoMetadata]:
+        """
+        Fetch metadata for several videos with the YouTube Data API.
+        
+        Ids are sent in groups of up to 50 per videos.list call, so a whole
+        batch usually needs a single request. Lookups are best effort: ids
+        that are not returned (or every id, if no API key is configured or
+        the API fails) are simply missing from the result, and callers fall
+        back to fetch_metadata for them.
+        
+        Args:
+            video_ids: YouTube video IDs
+            
+        Returns:
+            Mapping of video ID to metadata for every video that was found
+        """
+        if not config.youtube_api_key or not video_ids:
+            return {}
+        
+        results: Dict[str, VideoMetadata] = {}
+        unique_ids = []
+        for video_id in dict.fromkeys(video_ids):
+            cached = self._cache_get(video_id)
+            if cached:
+                results[video_id] = cached
+            else:
+                unique_ids.append(video_id)
+        if not unique_ids:
+            return results
+        
+        groups = [
+            unique_ids[i:i + YOUTUBE_VIDEOS_MAX_IDS]
+            for i in range(0, len(unique_ids), YOUTUBE_VIDEOS_MAX_IDS)
+        ]
+        
+        log_with_context("info", f"Fetching metadata for {len(unique_ids)} videos in {len(groups)} API call(s)")
+        
+        client = get_http_client()
+        responses = await asyncio.gather(
+            *(self._fetch_videos_page(client, group) for group in groups)
+        )
+        for items in responses:
+            for item in items:
+                metadata = self._normalize_api_item(item)
+                if metadata:
+                    results[item["id"]] = metadata
+                    self._cache_set(item["id"], metadata)
+        
+        return results
+    
+    async def _fetch_videos_page(self, client: httpx.AsyncClient, video_ids: List[str]) -> List[Dict[str, Any]]:
+        """Issue a single videos.list call, returning its items (empty on failure)."""
+        try:
+            response = await client.get(
+                YOUTUBE_VIDEOS_API_URL,
+                params={
+                    "part": "snippet,contentDetails",
+                    "id": ",".join(video_ids),
+                    "key": config.youtube_api_key,
+                }
+            )
+            response.raise_for_status()
+            return response.json().get("items", [])
+        except Exception as e:
+            log_with_context("warning", f"Bulk metadata fetch failed for {len(video_ids)} videos: {str(e)}")
+            return []
+    
+    def _normalize_api_item(self, item: Dict[str, Any]) -> Optional[VideoMetadata]:
+        """Normalize a videos.list item into our VideoMetadata model."""
+        try:
+            video_id = item["id"]
+            snippet = item.get("snippet", {})
+            content_details = item.get("contentDetails", {})
+            
+            return VideoMetadata(
+                title=snippet.get("title") or f"Video {video_id}",
+                channel=snippet.get("channelTitle") or "Unknown Channel",
+                published_at=self._format_api_date(snippet.get("publishedAt")),
+                duration_sec=self._parse_iso_duration(content_details.get("duration", "")),
+                url=f"https://www.youtube.com/watch?v={video_id}"
+            )
+        except Exception as e:
+            log_with_context("error", f"Error normalizing API metadata: {str(e)}")
+            return None
+    
+    def _format_api_date(self, published_at: Optional[str]) -> str:
+        """Format an ISO 8601 publish date from the Data API or InnerTube."""
+        if not published_at:
+            return _iso_z(datetime.now())
+        try:
+            return _iso_z(datetime.fromisoformat(published_at.replace('Z', '+00:00')))
+        except ValueError:
+            return published_at
+    
+    def _parse_iso_duration(self, duration: str) -> int:
+        """Parse an ISO 8601 duration such as PT1H2M3S into seconds."""
+        match = _ISO_DURATION_RE.match(duration or "")
+        if not match:
+            return 0
+        days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+        return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+    
     def _normalize_metadata(self, info: Dict[str, Any], url: str, video_id: str) -> VideoMetadata:
         """Normalize yt-dlp metadata into our VideoMetadata model."""
         try:
-            # Extract title
-            title = info.get('title', 'Unknown Title')
+            title, uploader, channel, uploader_id, duration, webpage_url = map(info.get, _INFO_FIELDS)
+            
             if not title or title == 'Unknown Title':
                 title = f"Video {video_id}"
-            
-            # Extract channel name
-            channel = info.get('uploader', info.get('channel', 'Unknown Channel'))
-            if not channel or channel == 'Unknown Channel':
-                channel = info.get('uploader_id', 'Unknown Channel')
-            
-            # Extract publish date
+            channel = uploader or channel or uploader_id or 'Unknown Channel'
             published_at = self._extract_publish_date(info)
-            
-            # Extract duration
-            duration_sec = int(info.get('duration', 0)) if info.get('duration') else 0
+            duration_sec = int(duration) if duration else 0
             
             # Use canonical URL if available, otherwise use original
-            canonical_url = info.get('webpage_url', url)
+            canonical_url = webpage_url or url
             
             return VideoMetadata(
                 title=title,
@@ -139,32 +393,27 @@ class MetadataFetcher:
     def _extract_publish_date(self, info: Dict[str, Any]) -> str:
         """Extract and format publish date."""
         try:
-            # Try different date fields
-            date_fields = ['upload_date', 'release_date', 'timestamp']
-            
-            for field in date_fields:
-                if field in info and info[field]:
-                    date_value = info[field]
-                    
-                    # Handle timestamp (seconds since epoch)
-                    if isinstance(date_value, (int, float)):
-                        dt = datetime.fromtimestamp(date_value)
-                        return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-                    
-                    # Handle string dates (YYYYMMDD format)
-                    if isinstance(date_value, str) and len(date_value) == 8:
-                        try:
-                            dt = datetime.strptime(date_value, '%Y%m%d')
-                            return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-                        except ValueError:
-                            continue
+            for date_value in map(info.get, _DATE_FIELDS):
+                if not date_value:
+                    continue
+                
+                # Handle timestamp (seconds since epoch)
+                if isinstance(date_value, (int, float)):
+                    return _iso_z(datetime.fromtimestamp(date_value))
+                
+                # Handle string dates (YYYYMMDD format); slicing avoids strptime's tokenizer
+                if isinstance(date_value, str) and len(date_value) == 8 and date_value.isdigit():
+                    try:
+                        return _iso_z(datetime(int(date_value[:4]), int(date_value[4:6]), int(date_value[6:])))
+                    except ValueError:
+                        continue
             
             # Fallback to current time if no date found
-            return datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ')
+            return _iso_z(datetime.now())
             
         except Exception as e:
             log_with_context("error", f"Error extracting publish date: {str(e)}")
-            return datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ')
+            return _iso_z(datetime.now())
 
 
 # Global instance
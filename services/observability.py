@@ -1,19 +1,55 @@
 """
 Observability service for monitoring and metrics.
 """
+import asyncio
 import logging
+import os
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from collections import defaultdict, deque
 
 from app_logging import log_with_context
 
+try:
+    from prometheus_client import (
+        CollectorRegistry, Counter, Histogram, REGISTRY, CONTENT_TYPE_LATEST,
+        generate_latest, multiprocess
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Field names for the (timestamp, ...) tuples kept in request_history
+HISTORY_FIELDS = ("timestamp", "type", "success", "processing_time", "error_code", "provider", "languages")
+
+# Recorded requests are folded into the aggregates in the background
+DRAIN_INTERVAL_SECONDS = 0.05
+MAX_PENDING_EVENTS = 10000
+
+if PROMETHEUS_AVAILABLE:
+    # With PROMETHEUS_MULTIPROC_DIR set these are backed by files shared by all workers
+    REQUESTS = Counter(
+        "youtube_analyzer_requests_total",
+        "Analysis requests handled",
+        ["type", "status"]
+    )
+    REQUEST_LATENCY = Histogram(
+        "youtube_analyzer_request_duration_seconds",
+        "Analysis request processing time",
+        ["type"],
+        buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+    )
+    DUPLICATE_URLS = Counter(
+        "youtube_analyzer_duplicate_urls_collapsed_total",
+        "Duplicate URLs served from another URL's result"
+    )
+
 
-@dataclass
+@dataclass(slots=True)
 class Metrics:
     """Service metrics."""
     total_requests: int = 0
@@ -22,10 +58,11 @@ class Metrics:
     total_processing_time: float = 0.0
     average_processing_time: float = 0.0
     requests_per_minute: float = 0.0
+    duplicate_urls_collapsed: int = 0
     error_counts: Dict[str, int] = field(default_factory=dict)
     provider_usage: Dict[str, int] = field(default_factory=dict)
     language_usage: Dict[str, int] = field(default_factory=dict)
-    last_updated: datetime = field(default_factory=datetime.now)
+    last_updated_ts: float = field(default_factory=time.time)
 
 
 class ObservabilityService:
@@ -35,14 +72,63 @@ class ObservabilityService:
         """Initialize the observability service."""
         self.metrics = Metrics()
         self.request_history = deque(maxlen=1000)  # Keep last 1000 requests
+        self._minute_ts: deque = deque()  # Timestamps of requests in the last minute
+        self._events: deque = deque()  # Recorded requests not yet aggregated
+        self._drain_task: Optional[asyncio.Task] = None
         self.start_time = datetime.now()
+        self._start_monotonic = time.monotonic()
     
     def record_request(self, request_type: str, success: bool, processing_time: float, 
                       error_code: Optional[str] = None, provider: Optional[str] = None,
-                      languages: Optional[list] = None):
-        """Record a request for metrics."""
-        now = datetime.now()
+                      languages: Optional[list] = None, duplicate_urls_collapsed: int = 0):
+        """
+        Record a request for metrics.
+        
+        The request is only queued here; aggregates are updated by the drain
+        task, or on the next read of the metrics, whichever comes first.
+        """
+        self._events.append((
+            time.time(), request_type, success, processing_time,
+            error_code, provider, languages, duplicate_urls_collapsed
+        ))
+        if len(self._events) >= MAX_PENDING_EVENTS:
+            self.flush()
         
+        log_with_context("info", f"Recorded {request_type} request: success={success}, time={processing_time:.2f}s")
+    
+    def flush(self):
+        """Fold all queued requests into the metrics."""
+        events = self._events
+        while events:
+            try:
+                event = events.popleft()
+            except IndexError:
+                break
+            self._apply(*event)
+    
+    def start(self):
+        """Start the background task that drains recorded requests."""
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.get_running_loop().create_task(self._drain_events())
+    
+    async def stop(self):
+        """Stop the drain task and aggregate anything still queued."""
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            await asyncio.gather(self._drain_task, return_exceptions=True)
+            self._drain_task = None
+        self.flush()
+    
+    async def _drain_events(self):
+        """Periodically fold queued requests into the metrics."""
+        while True:
+            await asyncio.sleep(DRAIN_INTERVAL_SECONDS)
+            self.flush()
+    
+    def _apply(self, now: float, request_type: str, success: bool, processing_time: float,
+               error_code: Optional[str], provider: Optional[str],
+               languages: Optional[list], duplicate_urls_collapsed: int):
+        """Update the aggregates for one recorded request."""
         # Update basic metrics
         self.metrics.total_requests += 1
         if success:
@@ -58,6 +144,16 @@ class ObservabilityService:
             self.metrics.total_processing_time / self.metrics.total_requests
         )
         
+        # Update batch deduplication metrics
+        self.metrics.duplicate_urls_collapsed += duplicate_urls_collapsed
+        
+        # Update Prometheus metrics
+        if PROMETHEUS_AVAILABLE:
+            REQUESTS.labels(type=request_type, status="success" if success else "error").inc()
+            REQUEST_LATENCY.labels(type=request_type).observe(processing_time)
+            if duplicate_urls_collapsed:
+                DUPLICATE_URLS.inc(duplicate_urls_collapsed)
+        
         # Update provider usage
         if provider:
             self.metrics.provider_usage[provider] = self.metrics.provider_usage.get(provider, 0) + 1
@@ -68,38 +164,30 @@ class ObservabilityService:
                 self.metrics.language_usage[lang] = self.metrics.language_usage.get(lang, 0) + 1
         
         # Update requests per minute
-        self._update_requests_per_minute()
+        self._minute_ts.append(now)
+        self._update_requests_per_minute(now)
         
-        # Record in history
-        self.request_history.append({
-            "timestamp": now,
-            "type": request_type,
-            "success": success,
-            "processing_time": processing_time,
-            "error_code": error_code,
-            "provider": provider,
-            "languages": languages
-        })
-        
-        self.metrics.last_updated = now
+        # Record in history (as a tuple; expanded to a dict only when read)
+        self.request_history.append(
+            (now, request_type, success, processing_time, error_code, provider, languages)
+        )
         
-        log_with_context("info", f"Recorded {request_type} request: success={success}, time={processing_time:.2f}s")
+        self.metrics.last_updated_ts = now
     
-    def _update_requests_per_minute(self):
+    def _update_requests_per_minute(self, now: float):
         """Update requests per minute metric."""
-        now = datetime.now()
-        one_minute_ago = now - timedelta(minutes=1)
+        # Timestamps arrive in order, so expired ones are always at the left
+        cutoff = now - 60.0
+        minute_ts = self._minute_ts
+        while minute_ts and minute_ts[0] < cutoff:
+            minute_ts.popleft()
         
-        recent_requests = [
-            req for req in self.request_history
-            if req["timestamp"] >= one_minute_ago
-        ]
-        
-        self.metrics.requests_per_minute = len(recent_requests)
+        self.metrics.requests_per_minute = len(minute_ts)
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get current metrics."""
-        uptime = (datetime.now() - self.start_time).total_seconds()
+        self.flush()
+        uptime = time.monotonic() - self._start_monotonic
         
         return {
             "uptime_seconds": uptime,
@@ -113,16 +201,40 @@ class ObservabilityService:
             ),
             "average_processing_time": self.metrics.average_processing_time,
             "requests_per_minute": self.metrics.requests_per_minute,
+            "duplicate_urls_collapsed": self.metrics.duplicate_urls_collapsed,
             "error_counts": dict(self.metrics.error_counts),
             "provider_usage": dict(self.metrics.provider_usage),
             "language_usage": dict(self.metrics.language_usage),
-            "last_updated": self.metrics.last_updated.isoformat()
+            "last_updated": datetime.fromtimestamp(self.metrics.last_updated_ts).isoformat()
         }
     
+    def get_prometheus_metrics(self) -> Tuple[bytes, str]:
+        """
+        Render metrics in the Prometheus text exposition format.
+        
+        When PROMETHEUS_MULTIPROC_DIR is set, samples from every worker
+        process are aggregated; otherwise this process's registry is used.
+        
+        Returns:
+            Tuple of (payload, content type)
+        """
+        if not PROMETHEUS_AVAILABLE:
+            raise RuntimeError("prometheus_client is not installed")
+        
+        self.flush()
+        if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    
     def get_health_status(self) -> Dict[str, Any]:
         """Get health status."""
+        self.flush()
         now = datetime.now()
-        uptime = (now - self.start_time).total_seconds()
+        uptime = time.monotonic() - self._start_monotonic
         
         # Check if service is healthy
         is_healthy = True
@@ -162,13 +274,21 @@ class ObservabilityService:
     
     def get_recent_requests(self, limit: int = 10) -> list:
         """Get recent requests."""
-        return list(self.request_history)[-limit:]
+        self.flush()
+        history = list(self.request_history)[-limit:]
+        return [
+            {**dict(zip(HISTORY_FIELDS, entry)), "timestamp": datetime.fromtimestamp(entry[0])}
+            for entry in history
+        ]
     
     def reset_metrics(self):
         """Reset all metrics."""
+        self._events.clear()
         self.metrics = Metrics()
         self.request_history.clear()
+        self._minute_ts.clear()
         self.start_time = datetime.now()
+        self._start_monotonic = time.monotonic()
         log_with_context("info", "Metrics reset")
 
 
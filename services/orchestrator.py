@@ -3,8 +3,12 @@ Orchestrator service to coordinate the complete video analysis workflow.
 """
 import logging
 import asyncio
+import multiprocessing
+import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
 from models import (
@@ -16,12 +20,40 @@ from services.metadata_fetcher import metadata_fetcher
 from services.transcript_fetcher import transcript_fetcher
 from services.transcript_chunker import default_chunker
 from services.summarization_service import SummarizationService, SummarizationConfig
-from services.utils import TimingContext
 
 logger = logging.getLogger(__name__)
 
+# Errors with fixed messages are built once and shared between results
+INVALID_URL_ERROR = ErrorInfo.model_construct(code="INVALID_URL", message="Could not extract video ID")
 
-@dataclass
+
+def error_result(url: str, video_id: str, error: ErrorInfo) -> VideoResult:
+    """
+    Build an error result from trusted internal values.
+    
+    Uses model_construct, so nothing is validated again.
+    
+    Args:
+        url: Original video URL
+        video_id: YouTube video ID ("unknown" if not extracted)
+        error: Error to report
+        
+    Returns:
+        VideoResult with status "error"
+    """
+    return VideoResult.model_construct(
+        url=url,
+        video_id=video_id,
+        status="error",
+        metadata=None,
+        transcripts=None,
+        summaries=None,
+        markdown=None,
+        error=error
+    )
+
+
+@dataclass(slots=True)
 class ProcessingStats:
     """Statistics for processing a single video."""
     start_time: datetime
@@ -31,12 +63,34 @@ class ProcessingStats:
     chunking_time: Optional[float] = None
     summarization_time: Optional[float] = None
     total_time: Optional[float] = None
+    # Monotonic start used for durations; start_time/end_time are for display
+    _t0: float = field(default_factory=time.perf_counter, init=False, repr=False)
     
     def complete(self):
         """Mark processing as complete and calculate total time."""
         self.end_time = datetime.now()
-        if self.start_time:
-            self.total_time = (self.end_time - self.start_time).total_seconds()
+        self.total_time = time.perf_counter() - self._t0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Stage timings as a dict, for logging."""
+        return {
+            "metadata_fetch_time": self.metadata_fetch_time,
+            "transcript_fetch_time": self.transcript_fetch_time,
+            "chunking_time": self.chunking_time,
+            "summarization_time": self.summarization_time,
+            "total_time": self.total_time
+        }
+
+
+@contextmanager
+def _stage_timer(stats: ProcessingStats, name: str):
+    """Time a pipeline stage and store the duration on the named stats field."""
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(stats, name, time.perf_counter() - t)
+        log_with_context("info", f"{name} took {getattr(stats, name):.2f}s")
 
 
 class VideoOrchestrator:
@@ -47,14 +101,58 @@ class VideoOrchestrator:
         self.metadata_fetcher = metadata_fetcher
         self.transcript_fetcher = transcript_fetcher
         self.chunker = default_chunker
+        self._chunk_pool: Optional[ProcessPoolExecutor] = None
     
-    async def process_video(self, url: str, options: AnalysisOptions) -> Tuple[VideoResult, ProcessingStats]:
+    def start_chunk_pool(self, max_workers: int) -> None:
+        """
+        Start the process pool used to chunk transcripts.
+        
+        Chunking is CPU-bound, so running it in separate processes keeps it
+        off the GIL shared with request handling. Without a pool, chunking
+        runs in worker threads.
+        
+        Args:
+            max_workers: Number of worker processes (0 leaves the pool disabled)
+        """
+        if self._chunk_pool is None and max_workers > 0:
+            # Spawn rather than fork: the server process already runs threads
+            self._chunk_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            log_with_context("info", f"Started chunking process pool with {max_workers} workers")
+    
+    def shutdown_chunk_pool(self) -> None:
+        """Shut down the chunking process pool, if running."""
+        if self._chunk_pool is not None:
+            self._chunk_pool.shutdown(cancel_futures=True)
+            self._chunk_pool = None
+    
+    async def _run_chunker(self, transcript, language: str) -> List[TranscriptChunk]:
+        """Chunk one transcript in the process pool (or a thread if there is none)."""
+        if self._chunk_pool is None:
+            return await asyncio.to_thread(self.chunker.chunk_transcript, transcript, language)
+        # Only plain lists cross the process boundary; segments are reattached here
+        segments = transcript.segments
+        loop = asyncio.get_running_loop()
+        spans = await loop.run_in_executor(
+            self._chunk_pool, self.chunker.chunk_spans,
+            [segment.text for segment in segments],
+            [segment.start for segment in segments],
+            [segment.duration for segment in segments],
+            language
+        )
+        return self.chunker.build_chunks(segments, spans, language)
+    
+    async def process_video(self, url: str, options: AnalysisOptions,
+                            metadata: Optional[VideoMetadata] = None) -> Tuple[VideoResult, ProcessingStats]:
         """
         Process a single video through the complete workflow.
         
         Args:
             url: YouTube video URL
             options: Analysis options
+            metadata: Metadata already fetched for this video (fetched here if not given)
             
         Returns:
             Tuple of (result, processing_stats)
@@ -63,20 +161,26 @@ class VideoOrchestrator:
         video_id = "unknown"
         
         try:
-            log_with_context("info", f"Starting video processing: {url}")
+            log_with_context("info", "Starting video processing: %s", url)
             
             # Step 1: Extract video ID
             video_id = self.metadata_fetcher.extract_video_id(url)
             if not video_id:
-                return self._create_error_result(url, "unknown", "INVALID_URL", "Could not extract video ID"), stats
+                return error_result(url, "unknown", INVALID_URL_ERROR), stats
             
-            # Step 2: Fetch metadata
-            metadata, metadata_error = await self._fetch_metadata(url, video_id, stats)
+            # Steps 2-3: Fetch metadata and transcripts concurrently
+            metadata_error = None
+            async with asyncio.TaskGroup() as tg:
+                transcripts_task = tg.create_task(self._fetch_transcripts(url, video_id, options, stats))
+                if metadata is None:
+                    metadata, metadata_error = await self._fetch_metadata(url, video_id, stats)
+                    if metadata_error:
+                        # The video fails either way; stop waiting on its transcripts
+                        transcripts_task.cancel()
             if metadata_error:
-                return self._create_error_result(url, video_id, metadata_error.code, metadata_error.message), stats
+                return error_result(url, video_id, metadata_error), stats
+            transcripts, transcript_error = transcripts_task.result()
             
-            # Step 3: Fetch transcripts
-            transcripts, transcript_error = await self._fetch_transcripts(url, video_id, options, stats)
             if transcript_error:
                 log_with_context("warning", f"Transcript fetch failed: {transcript_error.message}")
                 # Continue with metadata only
@@ -88,19 +192,20 @@ class VideoOrchestrator:
             # Step 5: Generate summaries
             summaries = await self._generate_summaries(es_chunks, en_chunks, options, stats)
             
-            # Step 6: Create result
-            result = VideoResult(
+            # Step 6: Create result (every part was validated when it was built)
+            result = VideoResult.model_construct(
                 url=url,
                 video_id=video_id,
                 status="ok",
                 metadata=metadata,
                 transcripts=transcripts,
                 summaries=summaries,
-                markdown=None  # TODO: Implement in response formatter
+                markdown=None,  # TODO: Implement in response formatter
+                error=None
             )
             
             stats.complete()
-            log_with_context("info", f"Successfully processed video: {url}")
+            log_with_context("info", "Successfully processed video: %s, timings: %s", url, stats.to_dict())
             return result, stats
             
         except Exception as e:
@@ -110,82 +215,80 @@ class VideoOrchestrator:
     
     async def _fetch_metadata(self, url: str, video_id: str, stats: ProcessingStats) -> Tuple[Optional[VideoMetadata], Optional[ErrorInfo]]:
         """Fetch video metadata."""
-        with TimingContext("metadata_fetch") as timing:
+        with _stage_timer(stats, "metadata_fetch_time"):
             try:
-                metadata, error = self.metadata_fetcher.fetch_metadata(url)
-                stats.metadata_fetch_time = timing.elapsed_seconds
+                metadata, error = await self.metadata_fetcher.fetch_metadata_async(url, video_id)
                 
                 if error:
                     log_with_context("error", f"Metadata fetch failed: {error.message}")
                     return None, error
                 
-                log_with_context("info", f"Metadata fetched: {metadata.title}")
+                log_with_context("info", "Metadata fetched: %s", metadata.title)
                 return metadata, None
                 
             except Exception as e:
-                stats.metadata_fetch_time = timing.elapsed_seconds
                 log_with_context("error", f"Metadata fetch error: {str(e)}")
                 return None, ErrorInfo(code="METADATA_ERROR", message=str(e))
     
     async def _fetch_transcripts(self, url: str, video_id: str, options: AnalysisOptions, stats: ProcessingStats) -> Tuple[Optional[Transcripts], Optional[ErrorInfo]]:
         """Fetch video transcripts."""
-        with TimingContext("transcript_fetch") as timing:
+        with _stage_timer(stats, "transcript_fetch_time"):
             try:
-                transcripts, error = self.transcript_fetcher.fetch_transcripts(url, options.languages)
-                stats.transcript_fetch_time = timing.elapsed_seconds
+                transcripts, error = await self.transcript_fetcher.fetch_transcripts_async(
+                    url, options.languages
+                )
                 
                 if error:
                     log_with_context("warning", f"Transcript fetch failed: {error.message}")
                     return None, error
                 
-                log_with_context("info", f"Transcripts fetched: {list(transcripts.__dict__.keys())}")
+                log_with_context("info", "Transcripts fetched: %s",
+                                 [name for name in ("original", "english") if getattr(transcripts, name) is not None])
                 return transcripts, None
                 
             except Exception as e:
-                stats.transcript_fetch_time = timing.elapsed_seconds
                 log_with_context("error", f"Transcript fetch error: {str(e)}")
                 return None, ErrorInfo(code="TRANSCRIPT_ERROR", message=str(e))
     
     async def _chunk_transcripts(self, transcripts: Optional[Transcripts], options: AnalysisOptions, stats: ProcessingStats) -> Tuple[List[TranscriptChunk], List[TranscriptChunk]]:
         """Chunk transcripts for processing."""
-        with TimingContext("transcript_chunking") as timing:
+        with _stage_timer(stats, "chunking_time"):
             es_chunks = []
             en_chunks = []
             
             try:
                 if transcripts:
-                    # Process original language transcript
+                    original_language = transcripts.language or 'unknown'
+                    
+                    # Chunk both languages concurrently
+                    jobs = []
+                    if transcripts.original:
+                        jobs.append(self._run_chunker(transcripts.original, original_language))
+                    if transcripts.english:
+                        jobs.append(self._run_chunker(transcripts.english, "en"))
+                    chunk_lists = await asyncio.gather(*jobs)
+                    
                     if transcripts.original:
-                        original_language = transcripts.language or 'unknown'
-                        original_chunks = self.chunker.chunk_transcript(transcripts.original, original_language)
-                        es_chunks = original_chunks
-                        log_with_context("info", f"Created {len(original_chunks)} chunks for original language {original_language}")
-                    else:
-                        es_chunks = []
+                        es_chunks = chunk_lists[0]
+                        log_with_context("info", "Created %d chunks for original language %s", len(es_chunks), original_language)
                     
-                    # Process English transcript if available
                     if transcripts.english:
-                        english_chunks = self.chunker.chunk_transcript(transcripts.english, "en")
-                        en_chunks = english_chunks
-                        log_with_context("info", f"Created {len(english_chunks)} chunks for English")
+                        en_chunks = chunk_lists[-1]
+                        log_with_context("info", "Created %d chunks for English", len(en_chunks))
                     elif transcripts.original:
                         # If no English transcript, use original for both
                         en_chunks = es_chunks
-                        log_with_context("info", f"Using original transcript for English chunks")
-                    else:
-                        en_chunks = []
+                        log_with_context("info", "Using original transcript for English chunks")
                 
-                stats.chunking_time = timing.elapsed_seconds
                 return es_chunks, en_chunks
                 
             except Exception as e:
-                stats.chunking_time = timing.elapsed_seconds
                 log_with_context("error", f"Chunking error: {str(e)}")
                 return [], []
     
     async def _generate_summaries(self, es_chunks: List[TranscriptChunk], en_chunks: List[TranscriptChunk], options: AnalysisOptions, stats: ProcessingStats) -> Optional[Summaries]:
         """Generate summaries from chunks."""
-        with TimingContext("summarization") as timing:
+        with _stage_timer(stats, "summarization_time"):
             try:
                 if not es_chunks and not en_chunks:
                     log_with_context("info", "No chunks available for summarization")
@@ -195,13 +298,13 @@ class VideoOrchestrator:
                 summarizer_config = SummarizationConfig(
                     provider=options.provider,
                     temperature=options.temperature,
-                    max_tokens=options.max_tokens
+                    max_tokens=options.max_tokens,
+                    cache_enabled=options.cache_enabled
                 )
                 summarizer = SummarizationService(summarizer_config)
                 
                 # Generate summaries
                 summaries, error = await summarizer.summarize_bilingual(es_chunks, en_chunks)
-                stats.summarization_time = timing.elapsed_seconds
                 
                 if error:
                     log_with_context("warning", f"Summary generation failed: {error.message}")
@@ -211,21 +314,12 @@ class VideoOrchestrator:
                 return summaries
                 
             except Exception as e:
-                stats.summarization_time = timing.elapsed_seconds
                 log_with_context("error", f"Summary generation error: {str(e)}")
                 return None
     
     def _create_error_result(self, url: str, video_id: str, error_code: str, error_message: str) -> VideoResult:
         """Create an error result."""
-        return VideoResult(
-            url=url,
-            video_id=video_id,
-            status="error",
-            error={
-                "code": error_code,
-                "message": error_message
-            }
-        )
+        return error_result(url, video_id, ErrorInfo.model_construct(code=error_code, message=error_message))
 
 
 # Global instance
@@ -5,11 +5,37 @@ import logging
 from typing import Optional, Dict, Any
 from datetime import datetime
 
-from models import VideoResult, VideoMetadata, Transcripts, Summaries, MarkdownFields
+from models import VideoResult, VideoMetadata, Transcripts, Summaries, MarkdownFields, language_name
 from app_logging import log_with_context
 
 logger = logging.getLogger(__name__)
 
+# Summary Markdown headers per language; any other language uses English
+_SUMMARY_HEADERS: Dict[str, Dict[str, str]] = {
+    "es": {
+        "title": "# Resumen",
+        "topics": "## Temas Principales",
+        "bullets": "## Puntos Clave",
+        "quotes": "## Citas Notables",
+        "actions": "## Acciones Recomendadas",
+    },
+    "en": {
+        "title": "# Summary",
+        "topics": "## Main Topics",
+        "bullets": "## Key Points",
+        "quotes": "## Notable Quotes",
+        "actions": "## Recommended Actions",
+    },
+}
+
+# Summary fields rendered as sections, in order, with their item prefix
+_SUMMARY_SECTIONS = (("topics", "- "), ("bullets", "- "), ("quotes", "> "), ("actions", "- "))
+
+
+def _generated_at() -> str:
+    """Timestamp shown at the top of generated Markdown."""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
 
 class ResponseFormatter:
     """Formats video analysis results into various output formats."""
@@ -18,13 +44,15 @@ class ResponseFormatter:
         """Initialize the response formatter."""
         pass
     
-    def format_video_result(self, result: VideoResult, include_markdown: bool = False) -> VideoResult:
+    def format_video_result(self, result: VideoResult, include_markdown: bool = False,
+                            generated_at: Optional[str] = None) -> VideoResult:
         """
         Format a video result with optional Markdown fields.
         
         Args:
             result: Video result to format
             include_markdown: Whether to include Markdown fields
+            generated_at: Generation timestamp for the Markdown (default: now)
             
         Returns:
             Formatted video result
@@ -33,38 +61,30 @@ class ResponseFormatter:
             return result
         
         try:
-            markdown_fields = self._generate_markdown_fields(result)
+            markdown_fields = self._generate_markdown_fields(result, generated_at)
             
-            # Create updated result with Markdown fields
-            return VideoResult(
-                url=result.url,
-                video_id=result.video_id,
-                status=result.status,
-                metadata=result.metadata,
-                transcripts=result.transcripts,
-                summaries=result.summaries,
-                markdown=markdown_fields,
-                error=result.error
-            )
+            # Copy the result with Markdown fields instead of revalidating it
+            return result.model_copy(update={"markdown": markdown_fields})
             
         except Exception as e:
             log_with_context("error", f"Error formatting result: {str(e)}")
             return result
     
-    def _generate_markdown_fields(self, result: VideoResult) -> Optional[MarkdownFields]:
+    def _generate_markdown_fields(self, result: VideoResult, generated_at: Optional[str] = None) -> Optional[MarkdownFields]:
         """Generate Markdown fields for a video result."""
         if result.status != "ok":
             return None
         
         try:
-            markdown_fields = MarkdownFields()
+            markdown_fields = MarkdownFields.model_construct()
             
             # Generate summary Markdown
             if result.summaries:
+                generated_at = generated_at or _generated_at()
                 if result.summaries.es:
-                    markdown_fields.summary_es = self._format_summary_markdown(result.summaries.es, "es")
+                    markdown_fields.summary_es = self._format_summary_markdown(result.summaries.es, "es", generated_at)
                 if result.summaries.en:
-                    markdown_fields.summary_en = self._format_summary_markdown(result.summaries.en, "en")
+                    markdown_fields.summary_en = self._format_summary_markdown(result.summaries.en, "en", generated_at)
             
             # Generate transcript Markdown for multiple languages
             if result.transcripts:
@@ -92,50 +112,27 @@ class ResponseFormatter:
             log_with_context("error", f"Error generating Markdown fields: {str(e)}")
             return None
     
-    def _format_summary_markdown(self, summary_data, language: str) -> str:
+    def _format_summary_markdown(self, summary_data, language: str, generated_at: Optional[str] = None) -> str:
         """Format summary data as Markdown."""
         if not summary_data:
             return ""
         
-        lang_header = "Resumen" if language == "es" else "Summary"
+        headers = _SUMMARY_HEADERS.get(language, _SUMMARY_HEADERS["en"])
         
-        markdown_parts = [f"# {lang_header}"]
+        markdown_parts = [headers["title"]]
         
         # Add metadata if available
-        markdown_parts.append(f"*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*")
+        markdown_parts.append(f"*Generated on {generated_at or _generated_at()}*")
         markdown_parts.append("")
         
-        # Topics section
-        if summary_data.topics:
-            topics_header = "## Temas Principales" if language == "es" else "## Main Topics"
-            markdown_parts.append(topics_header)
-            for topic in summary_data.topics:
-                markdown_parts.append(f"- {topic}")
-            markdown_parts.append("")
-        
-        # Key points section
-        if summary_data.bullets:
-            bullets_header = "## Puntos Clave" if language == "es" else "## Key Points"
-            markdown_parts.append(bullets_header)
-            for bullet in summary_data.bullets:
-                markdown_parts.append(f"- {bullet}")
-            markdown_parts.append("")
-        
-        # Quotes section
-        if summary_data.quotes:
-            quotes_header = "## Citas Notables" if language == "es" else "## Notable Quotes"
-            markdown_parts.append(quotes_header)
-            for quote in summary_data.quotes:
-                markdown_parts.append(f"> {quote}")
-            markdown_parts.append("")
-        
-        # Actions section
-        if summary_data.actions:
-            actions_header = "## Acciones Recomendadas" if language == "es" else "## Recommended Actions"
-            markdown_parts.append(actions_header)
-            for action in summary_data.actions:
-                markdown_parts.append(f"- {action}")
-            markdown_parts.append("")
+        # Topics, key points, quotes and actions sections
+        for field, prefix in _SUMMARY_SECTIONS:
+            items = getattr(summary_data, field)
+            if items:
+                markdown_parts.append(headers[field])
+                for item in items:
+                    markdown_parts.append(f"{prefix}{item}")
+                markdown_parts.append("")
         
         return "\n".join(markdown_parts)
     
@@ -147,12 +144,8 @@ class ResponseFormatter:
         # Use the detected language from the transcript data if available
         detected_language = getattr(transcript_data, 'language', language)
         
-        # Import language names mapping
-        from models import LANGUAGE_NAMES
-        
         if detected_language:
-            language_name = LANGUAGE_NAMES.get(detected_language, detected_language.upper())
-            lang_header = f"Transcripción ({language_name})"
+            lang_header = f"Transcripción ({language_name(detected_language)})"
         else:
             lang_header = "Transcripción"
         
@@ -197,13 +190,16 @@ class ResponseFormatter:
             return response_data
         
         try:
+            # One timestamp for the whole response
+            generated_at = _generated_at()
+            
             # Format each result
             formatted_results = []
             for result in response_data.get("results", []):
                 if isinstance(result, dict):
                     # Convert dict to VideoResult if needed
                     video_result = VideoResult(**result)
-                    formatted_result = self.format_video_result(video_result, include_markdown)
+                    formatted_result = self.format_video_result(video_result, include_markdown, generated_at)
                     formatted_results.append(formatted_result.dict())
                 else:
                     formatted_results.append(result)
@@ -4,14 +4,15 @@ Summarization service using LiteLLM to generate structured bilingual summaries.
 import logging
 import json
 import asyncio
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import Final, List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
 import litellm
-from litellm import completion
 
 from models import SummaryData, Summaries, TranscriptChunk, ErrorInfo, FrameworkData
 from app_logging import log_with_context
 from config import config
+from .cache import summary_cache
+from .http import get_http_client
 from .utils import RetryManager
 
 logger = logging.getLogger(__name__)
@@ -26,6 +27,10 @@ class SummarizationConfig:
     timeout: int = 60  # Increased timeout for longer processing
     max_retries: int = 3
     retry_delay: float = 1.0
+    batch_size: int = 4  # Max chunks of one transcript coalesced into a single LLM request
+    max_output_tokens: int = 16384  # Output-token limit of one request; batches are sized to fit max_tokens per chunk
+    max_parallel: int = field(default_factory=lambda: config.llm_max_parallel)  # Max in-flight LLM requests
+    cache_enabled: bool = True  # Reuse chunk summaries from the in-process summary cache
 
 
 class SummarizationService:
@@ -39,6 +44,8 @@ class SummarizationService:
             max_retries=self.config.max_retries,
             base_delay=self.config.retry_delay
         )
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
     
     async def summarize_transcript(self, chunks: List[TranscriptChunk], language: str) -> Tuple[Optional[SummaryData], Optional[ErrorInfo]]:
         """
@@ -71,41 +78,41 @@ class SummarizationService:
                     "is_final_chunk": True
                 }
                 
-                summary_text = await self.retry_manager.execute_with_retry(
-                    self._make_llm_request, chunk.text, language, chunk_info
-                )
+                summary_data = (await self.summarize_batch([chunk.text], language, [chunk_info]))[0]
                 
-                if not summary_text:
+                if not summary_data:
                     return None, ErrorInfo(
                         code="SUMMARIZATION_FAILED",
                         message="Failed to generate summary from LLM"
                     )
                 
-                summary_data = self._parse_summary(summary_text, language)
                 log_with_context("info", f"Successfully generated {language} summary for single chunk")
                 return summary_data, None
             
-            # For multiple chunks, process each individually and combine
+            # For multiple chunks, summarize them in batches and combine
             chunk_summaries = []
             all_key_insights = []
             all_frameworks = []
             all_key_moments = []
             
-            for i, chunk in enumerate(chunks):
-                chunk_info = {
+            chunk_infos = [
+                {
                     "chunk_index": i + 1,
                     "total_chunks": len(chunks),
                     "start_time": chunk.start_time,
                     "end_time": chunk.end_time,
                     "is_final_chunk": (i == len(chunks) - 1)
                 }
-                
-                summary_text = await self.retry_manager.execute_with_retry(
-                    self._make_llm_request, chunk.text, language, chunk_info
-                )
-                
-                if summary_text:
-                    chunk_data = self._parse_summary(summary_text, language)
+                for i, chunk in enumerate(chunks)
+            ]
+            
+            # Coalesce chunks into as few LLM round-trips as possible
+            chunk_results = await self.summarize_batch(
+                [chunk.text for chunk in chunks], language, chunk_infos
+            )
+            
+            for chunk_data in chunk_results:
+                if chunk_data:
                     chunk_summaries.append(chunk_data)
                     
                     # Collect insights, frameworks, and moments
@@ -145,33 +152,164 @@ class SummarizationService:
         
         return "".join(combined_parts)
     
-    async def _make_llm_request(self, text: str, language: str, chunk_info: dict = None) -> Optional[str]:
-        """Make LLM request for summary generation."""
-        # Get prompt template for the language with chunk context
-        prompt = self.prompt_templates.get_summary_prompt(text, language, chunk_info)
+    async def summarize_batch(self, texts: List[str], language: str, chunk_infos: List[dict] = None) -> List[Optional[SummaryData]]:
+        """
+        Summarize several documents, sharing LLM requests where possible.
         
-        # Configure LiteLLM
-        litellm.set_verbose = False
+        The documents are the chunks of one transcript. They are grouped (up
+        to ``batch_size`` per request) into multi-document prompts, and the
+        groups run concurrently; documents from other calls are never mixed in.
+        If a batched response cannot be parsed into one summary per document,
+        that group falls back to individual requests. Unless ``cache_enabled``
+        is off, documents already summarized with the same settings are served
+        from the in-process summary cache.
         
-        # Make API call
-        response = await asyncio.wait_for(
-            asyncio.to_thread(
-                completion,
-                model=self.config.provider,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=self.config.temperature,
-                max_tokens=self.config.max_tokens,
-            ),
-            timeout=self.config.timeout
+        Args:
+            texts: Documents (chunks of a single transcript) to summarize
+            language: Target language for the summaries (es/en)
+            chunk_infos: Optional chunk context for each document
+            
+        Returns:
+            List of summaries aligned with ``texts`` (None where the LLM returned no content)
+            
+        Raises:
+            Exception: If an individual LLM request still fails after retries
+        """
+        if chunk_infos is None:
+            chunk_infos = [None] * len(texts)
+        
+        if not self.config.cache_enabled:
+            return await self._summarize_in_batches(texts, language, chunk_infos)
+        
+        # Serve repeated chunks from the summary cache; only misses reach the LLM
+        keys = [
+            summary_cache.make_key(text, language, chunk_info, self.config.provider,
+                                   self.config.temperature, self.config.max_tokens)
+            for text, chunk_info in zip(texts, chunk_infos)
+        ]
+        results: List[Optional[SummaryData]] = [summary_cache.get(key) for key in keys]
+        missing = [i for i, summary in enumerate(results) if summary is None]
+        if missing:
+            fresh = await self._summarize_in_batches(
+                [texts[i] for i in missing], language, [chunk_infos[i] for i in missing]
+            )
+            for i, summary in zip(missing, fresh):
+                results[i] = summary
+                if summary is not None:
+                    summary_cache.set(keys[i], summary)
+        return results
+    
+    async def _summarize_in_batches(self, texts: List[str], language: str, chunk_infos: List[Optional[dict]]) -> List[Optional[SummaryData]]:
+        """Summarize documents in concurrent groups of up to batch_size, one request per group where possible."""
+        # Each document may use up to max_tokens of output, so keep a group's total within one request's limit
+        size = max(1, min(self.config.batch_size, self.config.max_output_tokens // max(1, self.config.max_tokens)))
+        groups = await asyncio.gather(*(
+            self._summarize_documents(list(zip(texts[i:i + size], chunk_infos[i:i + size])), language)
+            for i in range(0, len(texts), size)
+        ))
+        return [summary for group in groups for summary in group]
+    
+    async def _summarize_documents(self, documents: List[Tuple[str, Optional[dict]]], language: str) -> List[Optional[SummaryData]]:
+        """Summarize one batch of (text, chunk_info) documents, one request if possible."""
+        texts = [text for text, _ in documents]
+        chunk_infos = [chunk_info for _, chunk_info in documents]
+        
+        results: List[Optional[SummaryData]] = [None] * len(documents)
+        if len(documents) > 1:
+            results = await self._summarize_batch_request(texts, language, chunk_infos)
+        
+        # Summarize the documents the batch did not cover individually, concurrently
+        # (bounded by max_parallel in _complete); LLM failures propagate to the caller
+        missing = [i for i, summary in enumerate(results) if summary is None]
+        if missing:
+            fallback = await asyncio.gather(
+                *(self._summarize_document(texts[i], language, chunk_infos[i]) for i in missing)
+            )
+            for i, summary in zip(missing, fallback):
+                results[i] = summary
+        return results
+    
+    async def _summarize_document(self, text: str, language: str, chunk_info: Optional[dict]) -> Optional[SummaryData]:
+        """Summarize a single document in its own request (None if the LLM returned no content)."""
+        summary_text = await self.retry_manager.execute_with_retry(
+            self._make_llm_request, text, language, chunk_info
         )
+        return self._parse_summary(summary_text, language) if summary_text else None
+    
+    async def _summarize_batch_request(self, texts: List[str], language: str, chunk_infos: List[dict]) -> List[Optional[SummaryData]]:
+        """
+        Summarize a batch of documents in one request.
+        
+        Returns:
+            Summaries aligned with ``texts``; None for every document the response
+            did not yield a valid summary for (all of them if the request failed)
+        """
+        results: List[Optional[SummaryData]] = [None] * len(texts)
+        messages = self.prompt_templates.get_batch_summary_messages(texts, language, chunk_infos)
+        
+        try:
+            response_text = await self.retry_manager.execute_with_retry(
+                self._complete, messages, min(self.config.max_tokens * len(texts), self.config.max_output_tokens)
+            )
+            data = json.loads(response_text) if response_text else None
+        except Exception as e:
+            log_with_context("warning", f"Batched summarization failed, falling back to per-chunk requests: {str(e)}")
+            return results
+        
+        if not isinstance(data, list) or len(data) != len(texts):
+            log_with_context("warning", "Batched summarization returned an unexpected shape, falling back to per-chunk requests")
+            return results
+        
+        # Validate each item on its own so one malformed object only costs its own document a retry
+        for i, item in enumerate(data):
+            try:
+                if isinstance(item, dict):
+                    results[i] = self._summary_from_dict(item)
+            except Exception as e:
+                log_with_context("warning", f"Batched summary {i + 1} of {len(texts)} is invalid, retrying it alone: {str(e)}")
+        
+        parsed = sum(summary is not None for summary in results)
+        log_with_context("info", f"Summarized {parsed} of {len(texts)} chunks in a single {language} request")
+        return results
+    
+    async def _make_llm_request(self, text: str, language: str, chunk_info: dict = None) -> Optional[str]:
+        """Make LLM request for summary generation."""
+        # Static system prompt for the language; chunk context and text go in the user message
+        messages = self.prompt_templates.get_summary_messages(text, language, chunk_info)
+        return await self._complete(messages, self.config.max_tokens)
+    
+    async def _complete(self, messages: List[Dict[str, str]], max_tokens: int) -> Optional[str]:
+        """Send a chat completion request to the configured provider."""
+        # Configure LiteLLM; provider calls reuse the shared pooled HTTP client
+        # instead of opening fresh connections (and TLS handshakes) per call
+        litellm.set_verbose = False
+        litellm.aclient_session = get_http_client()
+        
+        # Make API call, holding one of the max_parallel request slots
+        async with self._request_slots():
+            response = await asyncio.wait_for(
+                litellm.acompletion(
+                    model=self.config.provider,
+                    messages=messages,
+                    temperature=self.config.temperature,
+                    max_tokens=max_tokens,
+                ),
+                timeout=self.config.timeout
+            )
         
         if response and response.choices:
             return response.choices[0].message.content
         
         return None
     
+    def _request_slots(self) -> asyncio.Semaphore:
+        """Get the semaphore bounding in-flight LLM requests (recreated if the event loop changed)."""
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(max(1, self.config.max_parallel))
+            self._slots_loop = loop
+        return self._slots
+    
     def _combine_chunk_summaries(self, chunk_summaries: List[SummaryData], all_insights: List[str], 
                                 all_frameworks: List, all_moments: List[str]) -> SummaryData:
         """Combine multiple chunk summaries into a comprehensive summary."""
@@ -196,7 +334,8 @@ class SummarizationService:
         # Combine and deduplicate key moments
         unique_moments = list(dict.fromkeys(all_moments))
         
-        return SummaryData(
+        # Built from already-validated chunk summaries
+        return SummaryData.model_construct(
             summary="\n\n".join(executive_summary_parts) if executive_summary_parts else "Resumen no disponible",
             key_insights=limited_insights,
             frameworks=frameworks_list,
@@ -236,30 +375,7 @@ class SummarizationService:
         """Parse JSON-formatted summary."""
         try:
             data = json.loads(summary_text)
-            
-            # Parse frameworks if present
-            frameworks = []
-            if "frameworks" in data:
-                for framework_data in data["frameworks"]:
-                    if isinstance(framework_data, dict):
-                        from models import FrameworkData
-                        frameworks.append(FrameworkData(
-                            name=framework_data.get("name", ""),
-                            description=framework_data.get("description", ""),
-                            steps=framework_data.get("steps", [])
-                        ))
-            
-            return SummaryData(
-                summary=data.get("summary", ""),
-                key_insights=data.get("key_insights", []),
-                frameworks=frameworks,
-                key_moments=data.get("key_moments", []),
-                # Legacy fields for backward compatibility
-                topics=data.get("topics", []),
-                bullets=data.get("bullets", []),
-                quotes=data.get("quotes", []),
-                actions=data.get("actions", [])
-            )
+            return self._summary_from_dict(data)
         except json.JSONDecodeError:
             # If JSON parsing fails, fall back to text parsing
             return self._parse_text_summary(summary_text, "en")
@@ -267,11 +383,36 @@ class SummarizationService:
             log_with_context("warning", f"Error parsing JSON summary: {str(e)}")
             return self._parse_text_summary(summary_text, "en")
     
+    def _summary_from_dict(self, data: Dict[str, Any]) -> SummaryData:
+        """Build summary data from a decoded JSON object."""
+        # Parse frameworks if present
+        frameworks = []
+        if "frameworks" in data:
+            for framework_data in data["frameworks"]:
+                if isinstance(framework_data, dict):
+                    frameworks.append(FrameworkData(
+                        name=framework_data.get("name", ""),
+                        description=framework_data.get("description", ""),
+                        steps=framework_data.get("steps", [])
+                    ))
+        
+        return SummaryData(
+            summary=data.get("summary", ""),
+            key_insights=data.get("key_insights", []),
+            frameworks=frameworks,
+            key_moments=data.get("key_moments", []),
+            # Legacy fields for backward compatibility
+            topics=data.get("topics", []),
+            bullets=data.get("bullets", []),
+            quotes=data.get("quotes", []),
+            actions=data.get("actions", [])
+        )
+    
     def _parse_text_summary(self, summary_text: str, language: str) -> SummaryData:
         """Parse text-formatted summary into structured data."""
         lines = summary_text.strip().split('\n')
         
-        summary = ""
+        summary_lines = []
         key_insights = []
         frameworks = []
         key_moments = []
@@ -308,7 +449,7 @@ class SummarizationService:
             else:
                 # Add content to current section
                 if current_section == 'summary':
-                    summary += line + " "
+                    summary_lines.append(line)
                 elif current_section == 'key_insights':
                     key_insights.append(line)
                 elif current_section == 'frameworks':
@@ -345,6 +486,7 @@ class SummarizationService:
             frameworks.append(current_framework)
         
         # Use the full text as summary if no specific summary section found
+        summary = " ".join(summary_lines)
         if not summary.strip():
             summary = summary_text[:500] + "..." if len(summary_text) > 500 else summary_text
         
@@ -371,23 +513,22 @@ class SummarizationService:
             Tuple of (summaries, error)
         """
         try:
-            summaries = Summaries()
+            summaries = Summaries.model_construct()
             
-            # Generate Spanish summary if chunks available
-            if es_chunks:
-                es_summary, es_error = await self.summarize_transcript(es_chunks, "es")
-                if es_error:
-                    log_with_context("warning", f"Spanish summary failed: {es_error.message}")
-                else:
-                    summaries.es = es_summary
+            # The two languages are independent requests, so run them concurrently
+            jobs = {
+                language: self.summarize_transcript(chunks, language)
+                for language, chunks in (("es", es_chunks), ("en", en_chunks))
+                if chunks
+            }
+            outcomes = await asyncio.gather(*jobs.values())
             
-            # Generate English summary if chunks available
-            if en_chunks:
-                en_summary, en_error = await self.summarize_transcript(en_chunks, "en")
-                if en_error:
-                    log_with_context("warning", f"English summary failed: {en_error.message}")
+            for language, (summary, error) in zip(jobs, outcomes):
+                if error:
+                    language_label = "Spanish" if language == "es" else "English"
+                    log_with_context("warning", f"{language_label} summary failed: {error.message}")
                 else:
-                    summaries.en = en_summary
+                    setattr(summaries, language, summary)
             
             # Check if we got at least one summary
             if not summaries.es and not summaries.en:
@@ -542,28 +683,12 @@ class SummarizationService:
         return " ".join(words[:8]) + "..."
 
 
-class PromptTemplates:
-    """Enhanced prompt templates for comprehensive video analysis."""
-    
-    def get_summary_prompt(self, text: str, language: str, chunk_info: dict = None) -> str:
-        """Get appropriate prompt template for the language with enhanced analysis."""
-        if language == "es":
-            return self._get_spanish_prompt(text, chunk_info)
-        else:
-            return self._get_english_prompt(text, chunk_info)
-    
-    def _get_spanish_prompt(self, text: str, chunk_info: dict = None) -> str:
-        """Get comprehensive Spanish prompt template."""
-        chunk_context = ""
-        if chunk_info:
-            chunk_context = f"\nCONTEXTO DEL FRAGMENTO:\n"
-            chunk_context += f"- Fragmento {chunk_info.get('chunk_index', 1)} de {chunk_info.get('total_chunks', 1)}\n"
-            chunk_context += f"- Tiempo: {self._format_time(chunk_info.get('start_time', 0))} - {self._format_time(chunk_info.get('end_time', 0))}\n"
-            chunk_context += f"- Es fragmento final: {'Sí' if chunk_info.get('is_final_chunk', False) else 'No'}\n\n"
-        
-        return f"""Eres un analista experto de contenido de YouTube especializado en extraer insights valiosos y accionables de videos largos.
+# System prompts are byte-identical across calls, so providers can serve the
+# shared prefix from their prompt cache; everything that varies per call
+# (chunk context, transcript text, document count) goes in the user message.
+SPANISH_SYSTEM_PROMPT: Final[str] = """Eres un analista experto de contenido de YouTube especializado en extraer insights valiosos y accionables de videos largos.
 
-{chunk_context}INSTRUCCIONES CRÍTICAS:
+INSTRUCCIONES CRÍTICAS:
 - Responde ÚNICAMENTE con JSON válido, sin texto adicional, comentarios o formato markdown
 - Tu respuesta completa debe ser JSON válido que se pueda parsear directamente
 - Enfócate en insights prácticos y accionables que proporcionen valor real
@@ -572,28 +697,28 @@ class PromptTemplates:
 - Usa el contexto completo para identificar temas generales y conexiones
 
 FORMATO JSON REQUERIDO:
-{{
+{
   "summary": "Resumen ejecutivo de 2-3 párrafos del mensaje central y valor del contenido",
   "key_insights": [
     "Párrafo detallado explicando el primer insight principal con contexto y ejemplos...",
     "Otro párrafo estructurado sobre el segundo concepto clave..."
   ],
   "frameworks": [
-    {{
+    {
       "name": "Nombre del Framework",
       "description": "Qué hace y por qué es útil",
       "steps": [
         "Paso 1 con detalles específicos",
         "Paso 2 con contexto y aplicación"
       ]
-    }}
+    }
   ],
   "key_moments": [
     "Primer tema principal introducido",
     "Transición o desarrollo clave",
     "Conclusión importante o llamada a la acción"
   ]
-}}
+}
 
 GUÍAS ESPECÍFICAS:
 - Genera 8-12 insights clave como párrafos detallados (no puntos de lista)
@@ -602,22 +727,12 @@ GUÍAS ESPECÍFICAS:
 - Enfócate en contenido práctico y accionable que proporcione valor real
 - Si es un fragmento de un video largo, considera el contexto del fragmento
 
-Transcripción del video:
-
-{text}"""
+VARIOS DOCUMENTOS:
+- Si el mensaje contiene varios documentos numerados, responde con un array JSON con un objeto en el formato anterior por documento, en el mismo orden"""
 
-    def _get_english_prompt(self, text: str, chunk_info: dict = None) -> str:
-        """Get comprehensive English prompt template."""
-        chunk_context = ""
-        if chunk_info:
-            chunk_context = f"\nCHUNK CONTEXT:\n"
-            chunk_context += f"- Chunk {chunk_info.get('chunk_index', 1)} of {chunk_info.get('total_chunks', 1)}\n"
-            chunk_context += f"- Time: {self._format_time(chunk_info.get('start_time', 0))} - {self._format_time(chunk_info.get('end_time', 0))}\n"
-            chunk_context += f"- Is final chunk: {'Yes' if chunk_info.get('is_final_chunk', False) else 'No'}\n\n"
-        
-        return f"""You are analyzing a complete YouTube video transcript to extract the most valuable insights. The user wants structured, actionable content with full context understanding.
+ENGLISH_SYSTEM_PROMPT: Final[str] = """You are analyzing a complete YouTube video transcript to extract the most valuable insights. The user wants structured, actionable content with full context understanding.
 
-{chunk_context}CRITICAL: Return ONLY valid JSON with no additional text, comments, or markdown formatting. Your entire response must be valid JSON that can be parsed directly.
+CRITICAL: Return ONLY valid JSON with no additional text, comments, or markdown formatting. Your entire response must be valid JSON that can be parsed directly.
 
 Return strict JSON with these keys:
 - 'summary': 2-3 paragraph executive summary of the core message and value
@@ -634,33 +749,110 @@ Guidelines:
 - Present key moments in chronological order as they appear in the video
 
 Example format:
-{{
+{
   "summary": "Comprehensive 2-3 paragraph overview of the core message and value proposition...",
   "key_insights": [
     "Detailed paragraph explaining first major insight with context and examples from the video...",
     "Another structured paragraph about second key concept with practical applications..."
   ],
   "frameworks": [
-    {{
+    {
       "name": "Framework Name",
       "description": "What it does and why it's valuable",
       "steps": [
         "Step 1 with specific details and context",
         "Step 2 with implementation guidance"
       ]
-    }}
+    }
   ],
   "key_moments": [
     "First major topic introduced",
     "Key transition or development",
     "Important conclusion or call to action"
   ]
-}}
+}
+
+Multiple documents:
+- If the message contains several numbered documents, return a JSON array with one object in the format above per document, in the same order"""
+
+
+class PromptTemplates:
+    """Enhanced prompt templates for comprehensive video analysis."""
+    
+    def get_system_prompt(self, language: str) -> str:
+        """Get the static system prompt for a language."""
+        return SPANISH_SYSTEM_PROMPT if language == "es" else ENGLISH_SYSTEM_PROMPT
+    
+    def get_summary_messages(self, text: str, language: str, chunk_info: dict = None) -> List[Dict[str, str]]:
+        """Get the chat messages for summarizing one document."""
+        if language == "es":
+            user_prompt = self._get_spanish_user_prompt(text, chunk_info)
+        else:
+            user_prompt = self._get_english_user_prompt(text, chunk_info)
+        return [
+            {"role": "system", "content": self.get_system_prompt(language)},
+            {"role": "user", "content": user_prompt}
+        ]
+    
+    def _get_spanish_user_prompt(self, text: str, chunk_info: dict = None) -> str:
+        """Get the Spanish user message: chunk context followed by the transcript."""
+        chunk_context = ""
+        if chunk_info:
+            chunk_context = f"CONTEXTO DEL FRAGMENTO:\n"
+            chunk_context += f"- Fragmento {chunk_info.get('chunk_index', 1)} de {chunk_info.get('total_chunks', 1)}\n"
+            chunk_context += f"- Tiempo: {self._format_time(chunk_info.get('start_time', 0))} - {self._format_time(chunk_info.get('end_time', 0))}\n"
+            chunk_context += f"- Es fragmento final: {'Sí' if chunk_info.get('is_final_chunk', False) else 'No'}\n\n"
+        
+        return f"""{chunk_context}Transcripción del video:
 
-Full transcript:
+{text}"""
+    
+    def _get_english_user_prompt(self, text: str, chunk_info: dict = None) -> str:
+        """Get the English user message: chunk context followed by the transcript."""
+        chunk_context = ""
+        if chunk_info:
+            chunk_context = f"CHUNK CONTEXT:\n"
+            chunk_context += f"- Chunk {chunk_info.get('chunk_index', 1)} of {chunk_info.get('total_chunks', 1)}\n"
+            chunk_context += f"- Time: {self._format_time(chunk_info.get('start_time', 0))} - {self._format_time(chunk_info.get('end_time', 0))}\n"
+            chunk_context += f"- Is final chunk: {'Yes' if chunk_info.get('is_final_chunk', False) else 'No'}\n\n"
+        
+        return f"""{chunk_context}Full transcript:
 
 {text}"""
     
+    def get_batch_summary_messages(self, texts: List[str], language: str, chunk_infos: List[dict] = None) -> List[Dict[str, str]]:
+        """Get the chat messages for summarizing several documents into a JSON array."""
+        if chunk_infos is None:
+            chunk_infos = [None] * len(texts)
+        
+        documents = []
+        for i, (text, chunk_info) in enumerate(zip(texts, chunk_infos), 1):
+            header = f"### DOCUMENT {i}"
+            if chunk_info:
+                time_range = (f"{self._format_time(chunk_info.get('start_time', 0))} - "
+                              f"{self._format_time(chunk_info.get('end_time', 0))}")
+                if language == "es":
+                    header += (f" (fragmento {chunk_info.get('chunk_index', 1)} de {chunk_info.get('total_chunks', 1)}, "
+                               f"{time_range}{', fragmento final' if chunk_info.get('is_final_chunk', False) else ''})")
+                else:
+                    header += (f" (chunk {chunk_info.get('chunk_index', 1)} of {chunk_info.get('total_chunks', 1)}, "
+                               f"{time_range}{', final chunk' if chunk_info.get('is_final_chunk', False) else ''})")
+            documents.append(f"{header}\n{text}")
+        
+        if language == "es":
+            instructions = f"""A continuación hay {len(texts)} fragmentos de la transcripción de un mismo video de YouTube. Resume cada documento por separado y responde con un array JSON de exactamente {len(texts)} objetos, uno por documento y en el mismo orden.
+
+Documentos:"""
+        else:
+            instructions = f"""Below are {len(texts)} chunks of the same YouTube video transcript. Summarize each document separately and return a JSON array of exactly {len(texts)} objects, one per document and in the same order.
+
+Documents:"""
+        
+        return [
+            {"role": "system", "content": self.get_system_prompt(language)},
+            {"role": "user", "content": instructions + "\n\n" + "\n\n".join(documents)}
+        ]
+    
     def _format_time(self, seconds: float) -> str:
         """Format seconds into MM:SS or HH:MM:SS format."""
         if seconds < 3600:
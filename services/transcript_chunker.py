@@ -3,14 +3,67 @@ Transcript chunker to split transcripts into manageable chunks for LLM processin
 """
 import logging
 import re
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
 from dataclasses import dataclass
 
-from models import TranscriptData, TranscriptSegment
+from models import TranscriptData, TranscriptSegment, TranscriptChunk
 from app_logging import log_with_context
 
 logger = logging.getLogger(__name__)
 
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # numba is optional; the pure Python loop is used instead
+    np = None
+    njit = None
+
+
+def _chunk_starts(token_counts, char_counts, max_tokens, max_chars):
+    """
+    Find where each chunk starts, given per-segment token and character counts.
+    
+    A new chunk is started whenever adding the next segment would push the
+    current chunk over either limit. Written in the numba-compatible subset
+    of Python so the same loop can be JIT-compiled.
+    
+    Args:
+        token_counts: Estimated tokens for each non-empty segment
+        char_counts: Characters each segment adds to the chunk text
+        max_tokens: Maximum tokens per chunk
+        max_chars: Maximum characters per chunk
+        
+    Returns:
+        Index of the first segment of every chunk
+    """
+    starts = [0]
+    current_tokens = 0
+    current_chars = 0
+    for i in range(len(token_counts)):
+        if i > 0 and (current_tokens + token_counts[i] > max_tokens or
+                      current_chars + char_counts[i] > max_chars):
+            starts.append(i)
+            current_tokens = 0
+            current_chars = 0
+        current_tokens += token_counts[i]
+        current_chars += char_counts[i]
+    return starts
+
+
+if njit is not None:
+    _chunk_starts_jit = njit(cache=True, nogil=True)(_chunk_starts)
+    
+    def chunk_starts(token_counts: List[int], char_counts: List[int], max_tokens: int, max_chars: int) -> List[int]:
+        """Compiled chunk boundary scan (see _chunk_starts)."""
+        return list(_chunk_starts_jit(
+            np.asarray(token_counts, dtype=np.int64),
+            np.asarray(char_counts, dtype=np.int64),
+            max_tokens,
+            max_chars
+        ))
+else:
+    chunk_starts = _chunk_starts
+
 
 @dataclass
 class ChunkingConfig:
@@ -22,17 +75,14 @@ class ChunkingConfig:
     min_chunk_size: int = 100
 
 
-@dataclass
-class TranscriptChunk:
-    """A chunk of transcript with metadata."""
+class ChunkSpan(NamedTuple):
+    """A chunk described by the indices of its segments, without the segments themselves."""
+    indices: List[int]
     text: str
-    segments: List[TranscriptSegment]
     start_time: float
     end_time: float
     token_count: int
     char_count: int
-    chunk_index: int
-    language: str
 
 
 class TranscriptChunker:
@@ -58,112 +108,112 @@ class TranscriptChunker:
             log_with_context("warning", "Empty transcript data provided for chunking")
             return []
         
-        log_with_context("info", f"Chunking transcript with {len(transcript_data.segments)} segments")
+        segments = transcript_data.segments
+        spans = self.chunk_spans(
+            [segment.text for segment in segments],
+            [segment.start for segment in segments],
+            [segment.duration for segment in segments],
+            language
+        )
+        return self.build_chunks(segments, spans, language)
+    
+    def chunk_spans(self, texts: List[str], starts: List[float], durations: List[float],
+                    language: str = "en") -> List["ChunkSpan"]:
+        """
+        Chunk a transcript given as parallel lists of segment fields.
+        
+        This is the CPU-bound part of chunking. Working on plain lists keeps
+        pydantic segments out of it, so it is cheap to run in a worker
+        process; build_chunks attaches the segments afterwards.
+        
+        Args:
+            texts: Text of each segment
+            starts: Start time of each segment in seconds
+            durations: Duration of each segment in seconds
+            language: Language of the transcript (for token estimation)
+            
+        Returns:
+            One span per chunk, in order
+        """
+        if not texts:
+            return []
         
-        # Convert segments to text
-        full_text = self._segments_to_text(transcript_data.segments)
+        log_with_context("info", f"Chunking transcript with {len(texts)} segments")
+        
+        estimator = self.token_estimator
+        stripped = [text.strip() for text in texts]
+        # Only non-empty segments take part in multi-chunk splits
+        indices = [i for i, text in enumerate(stripped) if text]
+        
+        # Count words once per segment: segments are joined with single spaces,
+        # so the word count (and token estimate) of any chunk is a sum of these
+        word_counts = [len(stripped[i].split()) for i in indices]
         
         # Estimate total tokens
-        total_tokens = self.token_estimator.estimate_tokens(full_text, language)
+        total_tokens = estimator.tokens_for_words(sum(word_counts), language) if indices else 0
         log_with_context("info", f"Estimated total tokens: {total_tokens}")
         
         # If transcript is small enough, return as single chunk
         if total_tokens <= self.config.max_tokens:
-            return [self._create_single_chunk(transcript_data, language, 0)]
+            full_text = ' '.join(stripped[i] for i in indices)
+            return [self._make_span(list(range(len(texts))), full_text, total_tokens, starts, durations)]
         
-        # Chunk the transcript
-        chunks = self._create_chunks(transcript_data, language)
+        token_counts = [estimator.tokens_for_words(words, language) for words in word_counts]
+        # Every segment after the first is joined with a single space
+        char_counts = [len(stripped[i]) + 1 for i in indices]
+        if char_counts:
+            char_counts[0] -= 1
         
-        log_with_context("info", f"Created {len(chunks)} chunks from transcript")
-        return chunks
-    
-    def _create_single_chunk(self, transcript_data: TranscriptData, language: str, chunk_index: int) -> TranscriptChunk:
-        """Create a single chunk from the entire transcript."""
-        segments = transcript_data.segments
-        text = self._segments_to_text(segments)
+        bounds = chunk_starts(token_counts, char_counts, self.config.max_tokens, self.config.max_chars)
+        spans = []
+        for start, end in zip(bounds, bounds[1:] + [len(indices)]):
+            chunk_indices = indices[start:end]
+            text = ' '.join(stripped[i] for i in chunk_indices)
+            chunk_tokens = estimator.tokens_for_words(sum(word_counts[start:end]), language)
+            spans.append(self._make_span(chunk_indices, text, chunk_tokens, starts, durations))
         
-        return TranscriptChunk(
+        log_with_context("info", f"Created {len(spans)} chunks from transcript")
+        return spans
+    
+    def _make_span(self, indices: List[int], text: str, token_count: int,
+                   starts: List[float], durations: List[float]) -> "ChunkSpan":
+        """Describe one chunk covering the segments at the given indices."""
+        first, last = indices[0], indices[-1]
+        return ChunkSpan(
+            indices=indices,
             text=text,
-            segments=segments,
-            start_time=segments[0].start if segments else 0.0,
-            end_time=segments[-1].start + segments[-1].duration if segments else 0.0,
-            token_count=self.token_estimator.estimate_tokens(text, language),
-            char_count=len(text),
-            chunk_index=chunk_index,
-            language=language
+            start_time=starts[first],
+            end_time=starts[last] + durations[last],
+            token_count=token_count,
+            char_count=len(text)
         )
     
-    def _create_chunks(self, transcript_data: TranscriptData, language: str) -> List[TranscriptChunk]:
-        """Create multiple chunks from transcript data."""
-        segments = transcript_data.segments
-        chunks = []
-        chunk_index = 0
-        
-        current_chunk_segments = []
-        current_text = ""
-        current_tokens = 0
+    def build_chunks(self, segments: List[TranscriptSegment], spans: List["ChunkSpan"],
+                     language: str) -> List[TranscriptChunk]:
+        """
+        Turn spans from chunk_spans into chunks holding their segments.
         
-        for segment in segments:
-            segment_text = segment.text.strip()
-            if not segment_text:
-                continue
-            
-            # Add space if needed
-            if current_text and not current_text.endswith(' '):
-                segment_text = ' ' + segment_text
-            
-            # Estimate tokens for this segment
-            segment_tokens = self.token_estimator.estimate_tokens(segment_text, language)
+        Args:
+            segments: Segments the spans were computed from
+            spans: Spans returned by chunk_spans
+            language: Language of the transcript
             
-            # Check if adding this segment would exceed limits
-            if (current_tokens + segment_tokens > self.config.max_tokens or 
-                len(current_text + segment_text) > self.config.max_chars):
-                
-                # Create chunk from current segments
-                if current_chunk_segments:
-                    chunk = self._create_chunk_from_segments(
-                        current_chunk_segments, chunk_index, language
-                    )
-                    chunks.append(chunk)
-                    chunk_index += 1
-                
-                # Start new chunk
-                current_chunk_segments = [segment]
-                current_text = segment_text
-                current_tokens = segment_tokens
-            else:
-                # Add to current chunk
-                current_chunk_segments.append(segment)
-                current_text += segment_text
-                current_tokens += segment_tokens
-        
-        # Add final chunk if there are remaining segments
-        if current_chunk_segments:
-            chunk = self._create_chunk_from_segments(
-                current_chunk_segments, chunk_index, language
+        Returns:
+            List of transcript chunks
+        """
+        return [
+            TranscriptChunk(
+                text=span.text,
+                segments=[segments[i] for i in span.indices],
+                start_time=span.start_time,
+                end_time=span.end_time,
+                token_count=span.token_count,
+                char_count=span.char_count,
+                chunk_index=chunk_index,
+                language=language
             )
-            chunks.append(chunk)
-        
-        return chunks
-    
-    def _create_chunk_from_segments(self, segments: List[TranscriptSegment], chunk_index: int, language: str) -> TranscriptChunk:
-        """Create a chunk from a list of segments."""
-        text = self._segments_to_text(segments)
-        
-        return TranscriptChunk(
-            text=text,
-            segments=segments,
-            start_time=segments[0].start if segments else 0.0,
-            end_time=segments[-1].start + segments[-1].duration if segments else 0.0,
-            token_count=self.token_estimator.estimate_tokens(text, language),
-            char_count=len(text),
-            chunk_index=chunk_index,
-            language=language
-        )
-    
-    def _segments_to_text(self, segments: List[TranscriptSegment]) -> str:
-        """Convert segments to plain text."""
-        return ' '.join(segment.text.strip() for segment in segments if segment.text.strip())
+            for chunk_index, span in enumerate(spans)
+        ]
     
     def get_chunk_summary(self, chunks: List[TranscriptChunk]) -> Dict[str, Any]:
         """Get summary information about chunks."""
@@ -225,8 +275,19 @@ class TokenEstimator:
             return 0
         
         # Count words (split by whitespace)
-        words = len(text.split())
+        return self.tokens_for_words(len(text.split()), language)
+    
+    def tokens_for_words(self, words: int, language: str = "en") -> int:
+        """
+        Estimate token count for non-empty text with a known word count.
         
+        Args:
+            words: Number of whitespace-separated words
+            language: Language code
+            
+        Returns:
+            Estimated token count
+        """
         # Apply language-specific multiplier
         multiplier = self.language_multipliers.get(language, 1.3)
         
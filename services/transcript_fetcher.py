@@ -1,10 +1,19 @@
 """
 Transcript fetcher using youtube-transcript-api to extract video transcripts.
 """
+import asyncio
+import hashlib
+import html
+import json
 import logging
-from typing import Optional, Dict, List, Tuple
-from youtube_transcript_api import YouTubeTranscriptApi
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional, Dict, List, Tuple
+from xml.etree import ElementTree
+import requests
+from requests.adapters import HTTPAdapter
 from youtube_transcript_api.formatters import TextFormatter
+from youtube_transcript_api._transcripts import Transcript, TranscriptList, TranscriptListFetcher
 from youtube_transcript_api._errors import (
     TranscriptsDisabled, 
     NoTranscriptFound, 
@@ -12,12 +21,13 @@ from youtube_transcript_api._errors import (
     TooManyRequests
 )
 
-from models import TranscriptData, TranscriptSegment, Transcripts, ErrorInfo, TranscriptLine, TranscriptUnavailableError, LANGUAGE_NAMES
+from models import TranscriptData, TranscriptSegment, Transcripts, ErrorInfo, TranscriptLine, TranscriptUnavailableError, language_name
 from app_logging import log_with_context
 from config import config
 from .audio_downloader import audio_downloader
 from .whisper_transcriber import whisper_transcriber
-from .cache import cache
+from .cache import cache, disk_cache
+from .http import get_http_client
 from .utils import extract_video_id
 from rich.console import Console
 
@@ -25,6 +35,91 @@ console = Console()
 
 logger = logging.getLogger(__name__)
 
+# Runs the second language's content fetch while the first is in flight
+_content_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="transcript-fetch")
+
+# Log message for each _select_best_transcript rank
+_SELECTION_REASONS = (
+    "Found manual transcript",
+    "Found auto-generated transcript",
+    "Using first manual transcript",
+    "Using first available transcript",
+)
+
+# Shared HTTP session so transcript requests reuse keep-alive connections;
+# YouTubeTranscriptApi.list_transcripts opens (and closes) a new session per call
+_http_session = requests.Session()
+_http_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
+
+def list_transcripts(video_id: str) -> TranscriptList:
+    """
+    List the transcripts available for a video over the shared HTTP session.
+    
+    Transcripts in the returned list fetch their content over the same session.
+    
+    Args:
+        video_id: YouTube video ID
+        
+    Returns:
+        Transcript list from youtube-transcript-api
+    """
+    return TranscriptListFetcher(_http_session).fetch(video_id)
+
+
+WATCH_URL = "https://www.youtube.com/watch"
+_YOUTUBE_HEADERS = {"Accept-Language": "en-US"}
+_HTML_TAG_RE = re.compile(r'<[^>]*>')
+
+
+class CaptionTrack(NamedTuple):
+    """A caption track listed on a video's watch page."""
+    language_code: str
+    is_generated: bool
+    base_url: str
+    name: str = ""
+
+
+def _track_cache_key(language_code: str, is_generated: bool, name: str = "") -> str:
+    """
+    Build the disk cache key for one caption track.
+    
+    A video can have a manual and an auto-generated track (or several named
+    manual tracks) in the same language, so the key includes the track kind
+    and a short hash of the track name.
+    """
+    key = f"{language_code}-{'asr' if is_generated else 'manual'}"
+    if name:
+        key += "-" + hashlib.blake2b(str(name).encode(), digest_size=4).hexdigest()
+    return key
+
+
+def _track_name(track: dict) -> str:
+    """Read a caption track's display name from the watch page JSON."""
+    name = track.get('name', {})
+    if 'simpleText' in name:
+        return name['simpleText']
+    return "".join(run.get('text', '') for run in name.get('runs', []))
+
+
+def _parse_timedtext(xml_text: str) -> List[TranscriptLine]:
+    """Parse a timedtext XML document into transcript lines."""
+    return [
+        TranscriptLine(
+            text=_HTML_TAG_RE.sub('', html.unescape(element.text)),
+            start=float(element.attrib['start']),
+            duration=float(element.attrib.get('dur', '0.0'))
+        )
+        for element in ElementTree.fromstring(xml_text)
+        if element.text is not None
+    ]
+
+
+def _to_segments(lines: List[TranscriptLine]) -> List[TranscriptSegment]:
+    """Convert transcript lines to segments without re-validating them."""
+    construct = TranscriptSegment.model_construct
+    return [construct(text=line.text, start=line.start, duration=line.duration) for line in lines]
+
 
 class TranscriptFetcher:
     """Fetches video transcripts using youtube-transcript-api."""
@@ -39,13 +134,22 @@ class TranscriptFetcher:
         """Extract video ID from YouTube URL."""
         return extract_video_id(url)
     
-    def fetch_transcripts(self, url: str, languages: List[str] = None) -> Tuple[Optional[Transcripts], Optional[ErrorInfo]]:
+    def clear_cache(self) -> None:
+        """Clear the in-memory and on-disk transcript caches."""
+        log_with_context("info", f"Clearing transcript caches (disk hits={disk_cache.hits}, misses={disk_cache.misses})")
+        cache.clear()
+        disk_cache.clear()
+    
+    def fetch_transcripts(self, url: str, languages: List[str] = None,
+                          caption_tracks: Optional[List[CaptionTrack]] = None) -> Tuple[Optional[Transcripts], Optional[ErrorInfo]]:
         """
         Fetch transcripts in multiple languages for a video.
         
         Args:
             url: YouTube video URL
             languages: List of language codes to prefer (default: ['es', 'en'])
+            caption_tracks: Caption tracks already listed from the watch page;
+                when given, the watch page is not downloaded again
             
         Returns:
             Tuple of (transcripts, error). If successful, transcripts contains both original and English transcripts.
@@ -65,12 +169,23 @@ class TranscriptFetcher:
                     message="Could not extract video ID from URL. Please provide a valid YouTube URL."
                 )
             
+            cached = disk_cache.get_transcripts(video_id, languages)
+            if cached:
+                log_with_context("info", f"Using disk-cached transcripts for video {video_id} "
+                                         f"(hits={disk_cache.hits}, misses={disk_cache.misses})")
+                return cached, None
+            
             # Get available transcripts with language information
-            transcript_list, lang_error = self._get_transcript_list(video_id)
+            if caption_tracks:
+                transcript_list, lang_error = self._transcripts_from_tracks(video_id, caption_tracks), None
+            else:
+                transcript_list, lang_error = self._get_transcript_list(video_id)
             if lang_error:
-                return None, lang_error
-            
-            if not transcript_list:
+                if lang_error.code != "TRANSCRIPTS_DISABLED":
+                    return None, lang_error
+                # Nothing to select from; go straight to the Whisper fallback
+                transcript_list = []
+            elif not transcript_list:
                 return None, ErrorInfo(
                     code="NO_TRANSCRIPTS",
                     message="No transcripts available for this video"
@@ -111,10 +226,11 @@ class TranscriptFetcher:
                                 english=None,  # Whisper doesn't provide English translation
                                 transcript=transcript_data,  # Legacy field
                                 language=transcript_data.language,
-                                language_name=LANGUAGE_NAMES.get(transcript_data.language, transcript_data.language.upper()),
+                                language_name=language_name(transcript_data.language),
                                 available_languages=[transcript_data.language],  # Whisper detected language
                                 unavailable_reason=None
                             )
+                            disk_cache.set_transcripts(video_id, languages, transcripts)
                             return transcripts, None
                             
                         finally:
@@ -134,6 +250,11 @@ class TranscriptFetcher:
                     unavailable_reason="No transcripts available and Whisper fallback is disabled or failed"
                 ), None
             
+            # Fetch the English transcript alongside the original one
+            english_future = None
+            if english_transcript and english_transcript != best_transcript:
+                english_future = _content_pool.submit(self._fetch_transcript_content, english_transcript, video_id)
+            
             # Fetch the original transcript content
             original_content = self._fetch_transcript_content(best_transcript, video_id)
             if not original_content:
@@ -147,58 +268,11 @@ class TranscriptFetcher:
                     unavailable_reason="Failed to fetch transcript content"
                 ), None
             
-            # Convert original transcript to segments
-            original_segments = [
-                TranscriptSegment(
-                    text=line.text,
-                    start=line.start,
-                    duration=line.duration
-                )
-                for line in original_content
-            ]
-            
-            # Create original transcript data
-            detected_language = best_transcript.language_code
-            original_transcript_data = TranscriptData(
-                source=best_transcript.is_generated and "auto" or "manual",
-                segments=original_segments,
-                language=detected_language
-            )
-            
-            # Fetch English transcript if available
-            english_transcript_data = None
-            if english_transcript and english_transcript != best_transcript:
-                english_content = self._fetch_transcript_content(english_transcript, video_id)
-                if english_content:
-                    english_segments = [
-                        TranscriptSegment(
-                            text=line.text,
-                            start=line.start,
-                            duration=line.duration
-                        )
-                        for line in english_content
-                    ]
-                    english_transcript_data = TranscriptData(
-                        source=english_transcript.is_generated and "auto" or "manual",
-                        segments=english_segments,
-                        language="en"
-                    )
-                    log_with_context("info", f"Successfully fetched English transcript: {len(english_segments)} segments")
-            
-            log_with_context("info", f"Successfully fetched original transcript in {detected_language}: {len(original_segments)} segments")
-            
-            # Create the new streamlined transcripts structure
-            transcripts = Transcripts(
-                original=original_transcript_data,
-                english=english_transcript_data,
-                transcript=original_transcript_data,  # Legacy field
-                language=detected_language,
-                language_name=LANGUAGE_NAMES.get(detected_language, detected_language.upper()),
-                available_languages=[t.language_code for t in transcript_list] if transcript_list else [detected_language],
-                unavailable_reason=None
-            )
-            
-            return transcripts, None
+            english_content = english_future.result() if english_future is not None else None
+            return self._assemble_transcripts(
+                video_id, languages, transcript_list,
+                best_transcript, original_content, english_transcript, english_content
+            ), None
             
         except Exception as e:
             log_with_context("error", f"Unexpected error fetching transcripts for {url}: {str(e)}")
@@ -208,6 +282,180 @@ class TranscriptFetcher:
             )
     
     
+    def _assemble_transcripts(self, video_id: str, languages: List[str], transcript_list: list,
+                              best_transcript, original_content: List[TranscriptLine],
+                              english_transcript, english_content: Optional[List[TranscriptLine]]) -> Transcripts:
+        """
+        Build the Transcripts result from fetched content and cache it on disk.
+        
+        Args:
+            video_id: YouTube video ID
+            languages: Preferred language codes the result was fetched with
+            transcript_list: All transcripts available for the video
+            best_transcript: Transcript chosen as the original
+            original_content: Lines of the original transcript
+            english_transcript: Transcript chosen as English, if any
+            english_content: Lines of the English transcript, if fetched
+            
+        Returns:
+            Transcripts for the video
+        """
+        # Convert original transcript to segments
+        original_segments = _to_segments(original_content)
+        
+        # Create original transcript data
+        detected_language = best_transcript.language_code
+        original_transcript_data = TranscriptData(
+            source=best_transcript.is_generated and "auto" or "manual",
+            segments=original_segments,
+            language=detected_language
+        )
+        
+        # Attach the English transcript if it was fetched
+        english_transcript_data = None
+        if english_content:
+            english_segments = _to_segments(english_content)
+            english_transcript_data = TranscriptData(
+                source=english_transcript.is_generated and "auto" or "manual",
+                segments=english_segments,
+                language="en"
+            )
+            log_with_context("info", f"Successfully fetched English transcript: {len(english_segments)} segments")
+        
+        log_with_context("info", f"Successfully fetched original transcript in {detected_language}: {len(original_segments)} segments")
+        
+        # Create the new streamlined transcripts structure
+        transcripts = Transcripts(
+            original=original_transcript_data,
+            english=english_transcript_data,
+            transcript=original_transcript_data,  # Legacy field
+            language=detected_language,
+            language_name=language_name(detected_language),
+            available_languages=[t.language_code for t in transcript_list] if transcript_list else [detected_language],
+            unavailable_reason=None
+        )
+        disk_cache.set_transcripts(video_id, languages, transcripts)
+        return transcripts
+    
+    async def fetch_transcripts_async(self, url: str, languages: List[str] = None) -> Tuple[Optional[Transcripts], Optional[ErrorInfo]]:
+        """
+        Fetch transcripts without blocking the event loop.
+        
+        Caption tracks are listed from the watch page and downloaded on the
+        shared HTTP client. If that fails or the video has no caption
+        tracks, this falls back to fetch_transcripts (youtube-transcript-api,
+        with the Whisper fallback) in a worker thread, which also produces
+        the detailed error codes. Tracks that were already listed are handed
+        to the fallback so the watch page is only downloaded once.
+        
+        Args:
+            url: YouTube video URL
+            languages: List of language codes to prefer (default: ['es', 'en'])
+            
+        Returns:
+            Tuple of (transcripts, error), as for fetch_transcripts
+        """
+        if languages is None:
+            languages = self.supported_languages
+        
+        video_id = self.extract_video_id(url)
+        tracks = None
+        if video_id:
+            cached = disk_cache.get_transcripts(video_id, languages)
+            if cached:
+                log_with_context("info", f"Using disk-cached transcripts for video {video_id} "
+                                         f"(hits={disk_cache.hits}, misses={disk_cache.misses})")
+                return cached, None
+            
+            transcripts, tracks = await self._fetch_transcripts_native(video_id, languages)
+            if transcripts:
+                return transcripts, None
+        
+        return await asyncio.to_thread(self.fetch_transcripts, url, languages, tracks or None)
+    
+    async def _fetch_transcripts_native(self, video_id: str,
+                                        languages: List[str]) -> Tuple[Optional[Transcripts], List[CaptionTrack]]:
+        """
+        Fetch transcripts over the shared HTTP client.
+        
+        Returns:
+            Tuple of (transcripts, tracks). transcripts is None if this path
+            cannot serve the video; tracks holds whatever caption tracks were
+            listed, for the fallback to reuse
+        """
+        tracks = []
+        try:
+            tracks = await self._list_caption_tracks(video_id)
+            if not tracks:
+                return None, tracks
+            
+            best_track = self._select_best_transcript(tracks, languages)
+            english_track = None
+            if any(track.language_code == 'en' for track in tracks):
+                english_track = self._select_best_transcript(tracks, ['en'])
+                if english_track == best_track:
+                    english_track = None
+            
+            jobs = [self._fetch_track_content(video_id, best_track)]
+            if english_track:
+                jobs.append(self._fetch_track_content(video_id, english_track))
+            contents = await asyncio.gather(*jobs)
+            if not contents[0]:
+                return None, tracks
+            
+            return self._assemble_transcripts(
+                video_id, languages, tracks,
+                best_track, contents[0], english_track, contents[1] if english_track else None
+            ), tracks
+        except Exception as e:
+            log_with_context("warning", f"Async transcript fetch failed for {video_id}: {str(e)}")
+            return None, tracks
+    
+    async def _list_caption_tracks(self, video_id: str) -> List[CaptionTrack]:
+        """List a video's caption tracks from its watch page."""
+        response = await get_http_client().get(WATCH_URL, params={"v": video_id}, headers=_YOUTUBE_HEADERS)
+        response.raise_for_status()
+        
+        parts = response.text.split('"captions":', 1)
+        if len(parts) < 2:
+            return []
+        captions = json.loads(parts[1].split(',"videoDetails', 1)[0].replace('\n', ''))
+        return [
+            CaptionTrack(
+                language_code=track['languageCode'],
+                is_generated=track.get('kind') == 'asr',
+                base_url=track['baseUrl'],
+                name=_track_name(track)
+            )
+            for track in captions.get('playerCaptionsTracklistRenderer', {}).get('captionTracks', [])
+        ]
+    
+    async def _fetch_track_content(self, video_id: str, track: CaptionTrack) -> Optional[List[TranscriptLine]]:
+        """Download and parse one caption track (None on failure)."""
+        cache_key = _track_cache_key(track.language_code, track.is_generated, track.name)
+        cached_lines = disk_cache.get_transcript(video_id, cache_key)
+        if cached_lines:
+            return cached_lines
+        
+        try:
+            response = await get_http_client().get(track.base_url, headers=_YOUTUBE_HEADERS)
+            response.raise_for_status()
+            transcript_lines = _parse_timedtext(response.text)
+        except Exception as e:
+            log_with_context("warning", f"Failed to fetch {track.language_code} captions for {video_id}: {str(e)}")
+            return None
+        
+        disk_cache.set_transcript(video_id, cache_key, transcript_lines)
+        return transcript_lines or None
+    
+    def _transcripts_from_tracks(self, video_id: str, tracks: List[CaptionTrack]) -> List[Transcript]:
+        """Wrap listed caption tracks as youtube-transcript-api transcripts on the shared session."""
+        return [
+            Transcript(_http_session, video_id, track.base_url, track.name,
+                       track.language_code, track.is_generated, [])
+            for track in tracks
+        ]
+    
     def _get_transcript_list(self, video_id: str) -> Tuple[Optional[list], Optional[ErrorInfo]]:
         """
         Get the list of available transcripts with their metadata.
@@ -219,8 +467,26 @@ class TranscriptFetcher:
             Tuple of (transcript_list, error)
         """
         try:
-            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+            transcript_list = list_transcripts(video_id)
             return list(transcript_list), None
+        except TranscriptsDisabled:
+            log_with_context("info", f"Transcripts are disabled for video {video_id}")
+            return None, ErrorInfo(
+                code="TRANSCRIPTS_DISABLED",
+                message="Transcripts are disabled for this video"
+            )
+        except VideoUnavailable:
+            log_with_context("warning", f"Video {video_id} is unavailable")
+            return None, ErrorInfo(
+                code="VIDEO_UNAVAILABLE",
+                message="Video is unavailable or private"
+            )
+        except TooManyRequests:
+            log_with_context("warning", f"Rate limited by YouTube while listing transcripts for {video_id}")
+            return None, ErrorInfo(
+                code="RATE_LIMIT",
+                message="YouTube rate limit exceeded. Please try again later."
+            )
         except Exception as e:
             log_with_context("error", f"Error getting transcript list: {str(e)}")
             return None, ErrorInfo(
@@ -239,34 +505,20 @@ class TranscriptFetcher:
         Returns:
             Best transcript object or None
         """
-        if not transcript_list:
-            return None
-        
-        # First, try to find a manual transcript in preferred languages
-        for transcript in transcript_list:
-            if not transcript.is_generated and transcript.language_code in preferred_languages:
-                log_with_context("info", f"Found manual transcript in {transcript.language_code}")
-                return transcript
-        
-        # Then try auto-generated transcripts in preferred languages
+        # Rank in one pass: manual preferred (0), auto preferred (1),
+        # any manual (2), anything else (3); the first of the best rank wins
+        best = None
+        best_rank = 4
         for transcript in transcript_list:
-            if transcript.is_generated and transcript.language_code in preferred_languages:
-                log_with_context("info", f"Found auto-generated transcript in {transcript.language_code}")
-                return transcript
-        
-        # If no preferred language found, take the first manual transcript
-        for transcript in transcript_list:
-            if not transcript.is_generated:
-                log_with_context("info", f"Using first manual transcript in {transcript.language_code}")
-                return transcript
-        
-        # Finally, take the first available transcript
-        if transcript_list:
-            transcript = transcript_list[0]
-            log_with_context("info", f"Using first available transcript in {transcript.language_code}")
-            return transcript
+            rank = (0 if transcript.language_code in preferred_languages else 2) + bool(transcript.is_generated)
+            if rank < best_rank:
+                best, best_rank = transcript, rank
+                if rank == 0:
+                    break
         
-        return None
+        if best is not None:
+            log_with_context("info", f"{_SELECTION_REASONS[best_rank]} in {best.language_code}")
+        return best
     
     def _fetch_transcript_content(self, transcript, video_id: str) -> Optional[List[TranscriptLine]]:
         """
@@ -279,6 +531,13 @@ class TranscriptFetcher:
         Returns:
             List of transcript lines or None
         """
+        cache_key = _track_cache_key(transcript.language_code, transcript.is_generated,
+                                     getattr(transcript, 'language', ''))
+        cached_lines = disk_cache.get_transcript(video_id, cache_key)
+        if cached_lines:
+            log_with_context("info", f"Using disk-cached {transcript.language_code} transcript for video {video_id}")
+            return cached_lines
+        
         try:
             # Try YouTube API first
             transcript_data = transcript.fetch()
@@ -290,6 +549,7 @@ class TranscriptFetcher:
                 )
                 for segment in transcript_data
             ]
+            disk_cache.set_transcript(video_id, cache_key, transcript_lines)
             return transcript_lines
         except Exception as e:
             log_with_context("warning", f"Failed to fetch transcript content: {str(e)}")
@@ -322,7 +582,7 @@ class TranscriptFetcher:
                     message="Could not extract video ID from URL"
                 )
             
-            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+            transcript_list = list_transcripts(video_id)
             languages = [t.language_code for t in transcript_list]
             
             log_with_context("info", f"Available languages for video {video_id}: {languages}")
@@ -340,17 +600,11 @@ class TranscriptFetcher:
         if not transcript_data or not transcript_data.segments:
             return ""
         
-        # Convert segments to the format expected by TextFormatter
-        segments = [
-            {
-                'text': segment.text,
-                'start': segment.start,
-                'duration': segment.duration
-            }
-            for segment in transcript_data.segments
-        ]
-        
-        return self.text_formatter.format_transcript(segments)
+        # TextFormatter only reads 'text'; stream the segments instead of
+        # copying the whole transcript into a list of dicts first
+        return self.text_formatter.format_transcript(
+            {'text': segment.text} for segment in transcript_data.segments
+        )
     
     
     def fetch_transcript(
@@ -400,16 +654,14 @@ class TranscriptFetcher:
     def _try_youtube_api(self, video_id: str, lang_priority: List[str]) -> Optional[List[TranscriptLine]]:
         """Try to fetch transcript using YouTube API."""
         try:
-            api = YouTubeTranscriptApi()
-            
             # Try preferred languages
             for lang_code in lang_priority:
-                transcript_lines = self._fetch_for_language(api, video_id, lang_code)
+                transcript_lines = self._fetch_for_language(video_id, lang_code)
                 if transcript_lines:
                     return transcript_lines
             
             # Try auto-detect
-            return self._fetch_for_language(api, video_id, None)
+            return self._fetch_for_language(video_id, None)
             
         except Exception as e:
             console.print(f"[yellow]YouTube transcript API failed: {e}[/yellow]")
@@ -418,9 +670,8 @@ class TranscriptFetcher:
     def _fetch_specific_language(self, video_id: str, lang_code: str) -> Optional[List[TranscriptLine]]:
         """Fetch transcript for a specific language using YouTube API."""
         try:
-            api = YouTubeTranscriptApi()
             console.print(f"[dim]Fetching specific language: {lang_code}[/dim]")
-            transcript_data = api.get_transcript(video_id, languages=[lang_code])
+            transcript_data = list_transcripts(video_id).find_transcript([lang_code]).fetch()
             
             transcript_lines = [
                 TranscriptLine(
@@ -438,15 +689,20 @@ class TranscriptFetcher:
             console.print(f"[red]✗ Failed to fetch {lang_code} transcript: {e}[/red]")
             return None
 
-    def _fetch_for_language(self, api: YouTubeTranscriptApi, video_id: str, lang_code: Optional[str]) -> Optional[List[TranscriptLine]]:
+    def _fetch_for_language(self, video_id: str, lang_code: Optional[str]) -> Optional[List[TranscriptLine]]:
         """Fetch transcript for a specific language."""
+        cached_lines = disk_cache.get_transcript(video_id, lang_code or "auto")
+        if cached_lines:
+            console.print(f"[dim]Using disk-cached transcript for {lang_code or 'auto-detected'}[/dim]")
+            return cached_lines
+        
         try:
             if lang_code:
                 console.print(f"[dim]Trying language: {lang_code}[/dim]")
-                transcript_data = api.get_transcript(video_id, languages=[lang_code])
+                transcript_data = list_transcripts(video_id).find_transcript([lang_code]).fetch()
             else:
                 console.print("[dim]Trying with auto-detected language[/dim]")
-                transcript_data = api.get_transcript(video_id)
+                transcript_data = list_transcripts(video_id).find_transcript(['en']).fetch()
             
             transcript_lines = [
                 TranscriptLine(
@@ -457,6 +713,8 @@ class TranscriptFetcher:
                 for segment in transcript_data
             ]
             
+            disk_cache.set_transcript(video_id, lang_code or "auto", transcript_lines)
+            
             lang_display = lang_code or "auto-detected"
             console.print(f"[green]✅ Found transcript in {lang_display} with {len(transcript_lines)} segments[/green]")
             return transcript_lines
@@ -1,74 +1,72 @@
 """
 Shared utilities for common functionality across services.
 """
+import functools
 import logging
 import re
-from typing import Optional
-from urllib.parse import urlparse, parse_qs
+import time
+from typing import Optional, Callable, Dict, TypeVar
 
 from app_logging import log_with_context
 from config import config
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
 
+# Covers watch (v= anywhere in the query), embed, v/, shorts and youtu.be URLs
+_VID_RE = re.compile(r'(?:youtube\.com/(?:watch\?(?:[^&]*&)*v=|embed/|v/|shorts/)|youtu\.be/)(?P<id>[A-Za-z0-9_-]{11})')
+_VID_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-")
+
+
+@functools.lru_cache(maxsize=4096)
 def extract_video_id(url: str) -> Optional[str]:
     """
     Extract video ID from YouTube URL.
     
+    Memoized: the same URL is typically resolved several times per request
+    (batch planning, orchestration, metadata and transcript fetching).
+    
     Args:
         url: YouTube video URL
         
     Returns:
         Video ID or None if extraction fails
     """
-    try:
-        # Handle various YouTube URL formats
-        patterns = [
-            r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
-            r'youtube\.com\/watch\?.*v=([a-zA-Z0-9_-]{11})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        
-        # Try parsing as URL
-        parsed = urlparse(url)
-        if 'youtube.com' in parsed.netloc or 'youtu.be' in parsed.netloc:
-            if parsed.path.startswith('/watch'):
-                query_params = parse_qs(parsed.query)
-                if 'v' in query_params:
-                    return query_params['v'][0]
-            elif parsed.path.startswith('/') and len(parsed.path) > 1:
-                # Handle youtu.be/VIDEO_ID format
-                return parsed.path[1:]
-        
-        return None
-        
-    except Exception as e:
-        log_with_context("error", f"Failed to extract video ID from URL {url}: {str(e)}")
-        return None
+    # Bare video IDs need no parsing
+    if len(url) == 11 and _VID_CHARS.issuperset(url):
+        return url
+    
+    match = _VID_RE.search(url)
+    return match.group('id') if match else None
+
 
+# Provider prefix -> check that its credentials are configured
+_PROVIDER_VALIDATORS: Dict[str, Callable[[], bool]] = {
+    "openai": lambda: config.openai_api_key is not None,
+    "anthropic": lambda: config.anthropic_api_key is not None,
+}
 
+
+@functools.lru_cache(maxsize=16)
 def validate_provider_config(provider: str) -> bool:
     """
     Validate that the provider is properly configured.
     
+    Results are cached per provider string since configuration is loaded
+    once at startup; call validate_provider_config.cache_clear() after
+    changing credentials at runtime.
+    
     Args:
         provider: Provider string (e.g., "openai/gpt-4o-mini")
         
     Returns:
         True if provider is properly configured, False otherwise
     """
-    if provider.startswith("openai/"):
-        return config.openai_api_key is not None
-    elif provider.startswith("anthropic/"):
-        return config.anthropic_api_key is not None
-    else:
-        # For now, assume other providers are valid
-        return True
+    prefix, separator, _ = provider.partition("/")
+    validator = _PROVIDER_VALIDATORS.get(prefix) if separator else None
+    # For now, assume other providers are valid
+    return validator() if validator else True
 
 
 class RetryManager:
@@ -114,7 +112,7 @@ class RetryManager:
 
 
 class TimingContext:
-    """Context manager for timing operations."""
+    """Context manager for timing operations (monotonic perf_counter clock)."""
     
     def __init__(self, operation_name: str):
         self.operation_name = operation_name
@@ -122,17 +120,45 @@ class TimingContext:
         self.duration = None
     
     def __enter__(self):
-        from datetime import datetime
-        self.start_time = datetime.now()
+        self.start_time = time.perf_counter()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        from datetime import datetime
-        if self.start_time:
-            self.duration = (datetime.now() - self.start_time).total_seconds()
+        if self.start_time is not None:
+            self.duration = time.perf_counter() - self.start_time
             log_with_context("info", f"{self.operation_name} took {self.duration:.2f}s")
     
     @property
     def elapsed_seconds(self) -> Optional[float]:
         """Get elapsed time in seconds."""
         return self.duration
+
+
+def ttl_cache(ttl: float) -> Callable[[Callable[[], T]], Callable[[], T]]:
+    """
+    Cache the result of a zero-argument function for a short time.
+    
+    The wrapped function gains a cache_clear() method to drop the cached
+    value early.
+    
+    Args:
+        ttl: Seconds a computed value is reused
+        
+    Returns:
+        Decorator applying the cache
+    """
+    def decorator(func: Callable[[], T]) -> Callable[[], T]:
+        cached = {}
+        
+        @functools.wraps(func)
+        def wrapper() -> T:
+            now = time.monotonic()
+            if "value" not in cached or now - cached["at"] >= ttl:
+                cached["value"] = func()
+                cached["at"] = now
+            return cached["value"]
+        
+        wrapper.cache_clear = cached.clear
+        return wrapper
+    
+    return decorator
@@ -0,0 +1,200 @@
+"""
+Tests for the batch processor.
+"""
+import asyncio
+import pytest
+from typing import Tuple
+from unittest.mock import patch
+
+from services.batch_processor import BatchProcessor, BatchConfig
+from services.orchestrator import ProcessingStats
+from services.cache import result_cache, get_cache_status
+from models import AnalysisOptions, VideoResult, AggregationInfo
+from datetime import datetime
+
+
+def make_result(url: str, status: str = "ok") -> VideoResult:
+    """Create a minimal video result for a URL."""
+    return VideoResult(
+        url=url,
+        video_id=url[-11:],
+        status=status,
+        error={"code": "TEST_ERROR", "message": "failed"} if status == "error" else None
+    )
+
+
+def make_outcome(url: str, status: str = "ok") -> Tuple[VideoResult, ProcessingStats]:
+    """Create the (result, stats) pair process_video returns for a URL."""
+    stats = ProcessingStats(start_time=datetime.now())
+    stats.complete()
+    return make_result(url, status), stats
+
+
+class TestBatchProcessor:
+    """Test cases for BatchProcessor."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        result_cache.clear()
+        self.options = AnalysisOptions()
+        self.urls = [
+            "https://www.youtube.com/watch?v=aaaaaaaaaaa",
+            "https://www.youtube.com/watch?v=bbbbbbbbbbb",
+            "https://www.youtube.com/watch?v=ccccccccccc",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_process_batch_preserves_order(self):
+        """Results come back in request order even when later URLs finish first."""
+        delays = {url: 0.03 * (len(self.urls) - i) for i, url in enumerate(self.urls)}
+
+        async def fake_process_video(url, options, metadata=None):
+            await asyncio.sleep(delays[url])
+            return make_outcome(url)
+
+        processor = BatchProcessor(BatchConfig(max_concurrent=3))
+        with patch('services.batch_processor.video_orchestrator.process_video', side_effect=fake_process_video):
+            response = await processor.process_batch(self.urls, self.options, "req-1")
+
+        assert [r.url for r in response.results] == self.urls
+        assert response.aggregation.total == 3
+        assert response.aggregation.succeeded == 3
+        assert response.aggregation.failed == 0
+
+    @pytest.mark.asyncio
+    async def test_process_batch_respects_concurrency_limit(self):
+        """No more than max_concurrent videos are processed at once."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_process_video(url, options, metadata=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return make_outcome(url)
+
+        processor = BatchProcessor(BatchConfig(max_concurrent=2))
+        with patch('services.batch_processor.video_orchestrator.process_video', side_effect=fake_process_video):
+            await processor.process_batch(self.urls, self.options, "req-2")
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_process_batch_counts_failures(self):
+        """Failed videos are counted without aborting the rest of the batch."""
+        async def fake_process_video(url, options, metadata=None):
+            return make_outcome(url, "error" if url == self.urls[1] else "ok")
+
+        processor = BatchProcessor()
+        with patch('services.batch_processor.video_orchestrator.process_video', side_effect=fake_process_video):
+            response = await processor.process_batch(self.urls, self.options, "req-3")
+
+        assert response.aggregation.succeeded == 2
+        assert response.aggregation.failed == 1
+        assert response.results[1].status == "error"
+
+    @pytest.mark.asyncio
+    async def test_process_batch_reports_exceptions_and_timeouts(self):
+        """Exceptions and timeouts become error results that still serialize."""
+        async def fake_process_video(url, options, metadata=None):
+            if url == self.urls[0]:
+                raise RuntimeError("boom")
+            await asyncio.sleep(5)
+
+        processor = BatchProcessor(BatchConfig(timeout_per_video=0.05))
+        with patch('services.batch_processor.video_orchestrator.process_video', side_effect=fake_process_video):
+            response = await processor.process_batch(self.urls[:2], self.options, "req-errors")
+
+        first, second = response.results
+        assert (first.error.code, first.error.message) == ("PROCESSING_ERROR", "boom")
+        assert second.error.code == "TIMEOUT"
+        assert response.aggregation.failed == 2
+        assert response.model_dump(mode="json")["results"][0]["error"] == {"code": "PROCESSING_ERROR", "message": "boom"}
+
+    @pytest.mark.asyncio
+    async def test_process_batch_serves_cached_results(self):
+        """Successful results are cached and reused by later batches."""
+        calls = []
+
+        async def fake_process_video(url, options, metadata=None):
+            calls.append(url)
+            return make_outcome(url)
+
+        processor = BatchProcessor()
+        with patch('services.batch_processor.video_orchestrator.process_video', side_effect=fake_process_video):
+            await processor.process_batch(self.urls[:2], self.options, "req-4")
+            response = await processor.process_batch(self.urls, self.options, "req-5")
+
+        assert calls == self.urls[:2] + [self.urls[2]]
+        assert [r.url for r in response.results] == self.urls
+        assert response.aggregation.succeeded == 3
+
+    @pytest.mark.asyncio
+    async def test_process_batch_bypasses_cache_when_disabled(self):
+        """With cache_enabled off, videos are processed again and nothing is stored."""
+        calls = []
+
+        async def fake_process_video(url, options, metadata=None):
+            calls.append(url)
+            return make_outcome(url)
+
+        processor = BatchProcessor()
+        no_cache = AnalysisOptions(cache_enabled=False)
+        statuses = []
+        with patch('services.batch_processor.video_orchestrator.process_video', side_effect=fake_process_video):
+            for urls, options, request_id in [(self.urls[:1], self.options, "req-6"),
+                                              (self.urls[:1], no_cache, "req-7"),
+                                              (self.urls[1:2], no_cache, "req-8"),
+                                              (self.urls[1:2], self.options, "req-9")]:
+                await processor.process_batch(urls, options, request_id)
+                statuses.append(get_cache_status())
+
+        assert calls == [self.urls[0], self.urls[0], self.urls[1], self.urls[1]]
+        assert statuses == ["MISS", "BYPASS", "BYPASS", "MISS"]
+
+    @pytest.mark.asyncio
+    async def test_process_batch_collapses_duplicate_videos(self):
+        """URLs for the same video run once and the result is fanned back out."""
+        calls = []
+
+        async def fake_process_video(url, options, metadata=None):
+            calls.append(url)
+            return make_outcome(url)
+
+        urls = [
+            self.urls[0],
+            "https://youtu.be/aaaaaaaaaaa",
+            self.urls[1],
+            self.urls[0],
+        ]
+        processor = BatchProcessor()
+        with patch('services.batch_processor.video_orchestrator.process_video', side_effect=fake_process_video):
+            response = await processor.process_batch(urls, self.options, "req-6")
+
+        assert calls == [self.urls[0], self.urls[1]]
+        assert [r.url for r in response.results] == urls
+        assert [r.video_id for r in response.results] == ["aaaaaaaaaaa", "aaaaaaaaaaa", "bbbbbbbbbbb", "aaaaaaaaaaa"]
+        assert response.aggregation.total == 4
+        assert response.aggregation.succeeded == 4
+        assert response.aggregation.duplicate_urls_collapsed == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_batch_yields_in_completion_order(self):
+        """Streamed results arrive as they finish, tagged with their request index."""
+        delays = {url: 0.03 * (len(self.urls) - i) for i, url in enumerate(self.urls)}
+
+        async def fake_process_video(url, options, metadata=None):
+            await asyncio.sleep(delays[url])
+            return make_outcome(url)
+
+        processor = BatchProcessor(BatchConfig(max_concurrent=3))
+        aggregation = AggregationInfo(total=0, succeeded=0, failed=0)
+        with patch('services.batch_processor.video_orchestrator.process_video', side_effect=fake_process_video):
+            items = [item async for item in processor.stream_batch(self.urls, self.options, aggregation)]
+
+        assert [index for index, _, _ in items] == [2, 1, 0]
+        assert [result.url for _, result, _ in items] == self.urls[::-1]
+        assert aggregation.total == 3
+        assert aggregation.succeeded == 3
@@ -0,0 +1,385 @@
+"""
+Tests for the caching services.
+"""
+import asyncio
+import os
+import time
+import pytest
+from unittest.mock import patch
+
+from services import cache as cache_module
+from services.cache import ResultCache, TranscriptCache, DiskTranscriptCache, SummaryCache
+from models import AnalysisOptions, VideoResult, TranscriptLine, Transcripts, TranscriptData, TranscriptSegment, SummaryData
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis.asyncio client used by ResultCache."""
+
+    def __init__(self):
+        self.store = {}  # key -> (value, monotonic expiry or None)
+
+    def _live(self, key):
+        entry = self.store.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self.store[key]
+            return None
+        return entry
+
+    async def get(self, key):
+        entry = self._live(key)
+        return entry[0] if entry else None
+
+    async def ttl(self, key):
+        entry = self._live(key)
+        if entry is None:
+            return -2
+        return -1 if entry[1] is None else int(entry[1] - time.monotonic())
+
+    async def set(self, key, value, nx=False, ex=None, px=None):
+        if nx and self._live(key) is not None:
+            return None
+        expires = ex if ex is not None else (px / 1000 if px is not None else None)
+        self.store[key] = (value, None if expires is None else time.monotonic() + expires)
+        return True
+
+    async def exists(self, key):
+        return int(self._live(key) is not None)
+
+    async def eval(self, script, numkeys, key, token, *args):
+        entry = self._live(key)
+        if entry is None or entry[0] != token:
+            return 0
+        if script == cache_module._RELEASE_LOCK_SCRIPT:
+            del self.store[key]
+        else:
+            self.store[key] = (token, time.monotonic() + int(args[0]) / 1000)
+        return 1
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Pipeline for FakeRedis that replays the queued commands on execute."""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self._calls.append((name, args, kwargs))
+
+    async def execute(self):
+        return [await getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in self._calls]
+
+
+class TestResultCache:
+    """Test cases for ResultCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.cache = ResultCache(ttl_seconds=60, local_ttl_seconds=60, local_max_size=2)
+        self.options = AnalysisOptions()
+        self.result = VideoResult(url="https://youtu.be/aaaaaaaaaaa", video_id="aaaaaaaaaaa", status="ok")
+
+    def test_make_key_depends_on_options(self):
+        """Different analysis options produce different keys."""
+        key = ResultCache.make_key("aaaaaaaaaaa", self.options)
+        other = ResultCache.make_key("aaaaaaaaaaa", AnalysisOptions(temperature=0.9))
+
+        assert key == ResultCache.make_key("aaaaaaaaaaa", AnalysisOptions())
+        assert key != other
+
+    @pytest.mark.asyncio
+    async def test_get_many_returns_stored_results(self):
+        """Stored results are returned and missing keys are omitted."""
+        await self.cache.set_many({"a": self.result})
+
+        found = await self.cache.get_many(["a", "b"])
+
+        assert list(found) == ["a"]
+        assert found["a"].video_id == "aaaaaaaaaaa"
+
+    @pytest.mark.asyncio
+    async def test_local_entries_expire(self):
+        """Entries older than the local TTL are treated as misses."""
+        with patch('services.cache.time.time', return_value=1000.0):
+            await self.cache.set_many({"a": self.result})
+        with patch('services.cache.time.time', return_value=1061.0):
+            found = await self.cache.get_many(["a"])
+
+        assert found == {}
+        assert self.cache.size() == 0
+
+    @pytest.mark.asyncio
+    async def test_local_tier_is_bounded(self):
+        """The oldest entry is evicted once the local tier is full."""
+        await self.cache.set_many({"a": self.result, "b": self.result, "c": self.result})
+
+        found = await self.cache.get_many(["a", "b", "c"])
+
+        assert sorted(found) == ["b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_get_or_set_calls_loader_once(self):
+        """The loader only runs on a miss."""
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            return self.result
+
+        await self.cache.get_or_set("a", loader)
+        await self.cache.get_or_set("a", loader)
+
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        """Concurrent callers for the same key wait for a single loader run."""
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return self.result
+
+        results = await asyncio.gather(*[self.cache.get_or_set("a", loader) for _ in range(5)])
+
+        assert calls == 1
+        assert all(r.video_id == "aaaaaaaaaaa" for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_owner_does_not_cancel_waiters(self):
+        """A waiter takes over the load when the caller running it is cancelled."""
+        started = asyncio.Event()
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            started.set()
+            if calls == 1:
+                await asyncio.sleep(10)
+            return self.result
+
+        owner = asyncio.create_task(self.cache.fill("a", loader))
+        await started.wait()
+        waiter = asyncio.create_task(self.cache.fill("a", loader))
+        await asyncio.sleep(0)
+
+        owner.cancel()
+        result = await asyncio.wait_for(waiter, timeout=1)
+
+        assert owner.cancelled()
+        assert result.video_id == "aaaaaaaaaaa"
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_lock_released_only_by_its_holder(self):
+        """Finishing a load does not delete a lock another worker took over."""
+        redis = FakeRedis()
+        self.cache._redis = redis
+
+        async def loader():
+            # The lock expired mid-load and another worker acquired it
+            redis.store["a:lock"] = ("other-token", None)
+            return self.result
+
+        result = await self.cache.fill("a", loader)
+
+        assert result.video_id == "aaaaaaaaaaa"
+        assert redis.store["a:lock"][0] == "other-token"
+        assert await redis.get("a") is not None
+
+    @pytest.mark.asyncio
+    async def test_redis_waiter_outlasts_lock_timeout(self):
+        """A worker waits for a holder whose load runs past the lock timeout instead of recomputing."""
+        redis = FakeRedis()
+        holder = ResultCache(ttl_seconds=60, lock_timeout=0.3)
+        waiter = ResultCache(ttl_seconds=60, lock_timeout=0.3)
+        holder._redis = waiter._redis = redis
+        started = asyncio.Event()
+        waiter_calls = 0
+
+        async def slow_loader():
+            started.set()
+            await asyncio.sleep(1.0)
+            return self.result
+
+        async def waiter_loader():
+            nonlocal waiter_calls
+            waiter_calls += 1
+            return self.result
+
+        holder_task = asyncio.create_task(holder.fill("a", slow_loader))
+        await started.wait()
+        result = await asyncio.wait_for(waiter.fill("a", waiter_loader), timeout=5)
+        await holder_task
+
+        assert result.video_id == "aaaaaaaaaaa"
+        assert waiter_calls == 0
+        assert not await redis.exists("a:lock")
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_results_are_not_stored(self):
+        """Results rejected by the cacheable predicate are returned but not stored."""
+        async def loader():
+            return self.result
+
+        await self.cache.fill("a", loader, cacheable=lambda r: False)
+
+        assert self.cache.size() == 0
+
+    def test_ttl_jitter_stays_within_ten_percent(self):
+        """Jittered TTLs stay within +/-10% of the requested TTL."""
+        ttls = {self.cache._jittered_ttl(1000) for _ in range(200)}
+
+        assert min(ttls) >= 900
+        assert max(ttls) <= 1100
+        assert len(ttls) > 1
+
+    def test_early_refresh_only_near_expiry(self):
+        """Entries are only refreshed early inside the refresh window."""
+        assert not self.cache._should_refresh_early(59)
+        assert not self.cache._should_refresh_early(30)
+        with patch('services.cache.random.random', return_value=0.99):
+            assert self.cache._should_refresh_early(1)
+
+
+class TestTranscriptCache:
+    """Test cases for the in-memory transcript cache."""
+    
+    def test_evicts_least_recently_used(self):
+        """Test that the cache stays bounded and reads protect entries from eviction."""
+        transcripts = TranscriptCache(max_size=2)
+        lines = [TranscriptLine(start=0.0, duration=1.0, text="hi")]
+        transcripts.set_transcript("a", lines)
+        transcripts.set_transcript("b", lines)
+        transcripts.get_transcript("a")
+        transcripts.set_transcript("c", lines)
+        
+        assert transcripts.get_transcript("b") is None
+        assert transcripts.get_transcript("a") == lines
+        assert transcripts.size() == 2
+    
+    def test_sweep_drops_expired_entries(self):
+        """Test that periodic sweeps remove expired entries that are never read again."""
+        transcripts = TranscriptCache(ttl_seconds=60)
+        transcripts.SWEEP_INTERVAL = 2
+        lines = [TranscriptLine(start=0.0, duration=1.0, text="hi")]
+        
+        with patch("services.cache.time.time", return_value=1000.0):
+            transcripts.set_transcript("old", lines)
+        with patch("services.cache.time.time", return_value=2000.0):
+            transcripts.set_transcript("new", lines)
+        
+        assert transcripts.size() == 1
+
+
+@pytest.mark.skipif(cache_module.zstandard is None, reason="zstandard not installed")
+class TestDiskTranscriptCache:
+    """Test cases for the on-disk transcript cache."""
+    
+    def test_round_trip(self, tmp_path):
+        """Test that transcripts written to disk are read back."""
+        disk = DiskTranscriptCache(cache_dir=str(tmp_path))
+        lines = [TranscriptLine(start=0.0, duration=1.5, text="hola"), TranscriptLine(start=1.5, duration=2.0, text="mundo")]
+        
+        disk.set_transcript("dQw4w9WgXcQ", "es", lines)
+        
+        assert (tmp_path / "dQw4w9WgXcQ-es.json.zst").exists()
+        assert disk.get_transcript("dQw4w9WgXcQ", "es") == lines
+        assert disk.get_transcript("dQw4w9WgXcQ", "en") is None
+        assert not list(tmp_path.glob("*.tmp"))
+    
+    def test_expired_entries_ignored(self, tmp_path):
+        """Test that entries older than the TTL are treated as misses."""
+        disk = DiskTranscriptCache(cache_dir=str(tmp_path), ttl_seconds=60)
+        disk.set_transcript("dQw4w9WgXcQ", "en", [TranscriptLine(start=0.0, duration=1.0, text="hi")])
+        path = tmp_path / "dQw4w9WgXcQ-en.json.zst"
+        old = time.time() - 120
+        os.utime(path, (old, old))
+        
+        assert disk.get_transcript("dQw4w9WgXcQ", "en") is None
+    
+    def test_corrupt_file_is_a_miss(self, tmp_path):
+        """Test that unreadable files do not raise."""
+        disk = DiskTranscriptCache(cache_dir=str(tmp_path))
+        (tmp_path / "dQw4w9WgXcQ-en.json.zst").write_bytes(b"not zstd")
+        
+        assert disk.get_transcript("dQw4w9WgXcQ", "en") is None
+    
+    def test_disabled_without_directory(self):
+        """Test that the cache is a no-op when no directory is configured."""
+        disk = DiskTranscriptCache()
+        disk.set_transcript("dQw4w9WgXcQ", "en", [TranscriptLine(start=0.0, duration=1.0, text="hi")])
+        
+        assert not disk.enabled
+        assert disk.get_transcript("dQw4w9WgXcQ", "en") is None
+    
+    def test_transcripts_round_trip(self, tmp_path):
+        """Test that complete transcripts results are cached per language preference."""
+        disk = DiskTranscriptCache(cache_dir=str(tmp_path))
+        original = TranscriptData(language="es", source="manual", segments=[TranscriptSegment(text="hola", start=0.0, duration=1.0)])
+        transcripts = Transcripts(original=original, transcript=original, language="es", language_name="Spanish", available_languages=["es"])
+        
+        assert disk.get_transcripts("dQw4w9WgXcQ", ["es", "en"]) is None
+        disk.set_transcripts("dQw4w9WgXcQ", ["es", "en"], transcripts)
+        
+        assert disk.get_transcripts("dQw4w9WgXcQ", ["es", "en"]) == transcripts
+        assert disk.get_transcripts("dQw4w9WgXcQ", ["en"]) is None
+        assert (disk.hits, disk.misses) == (1, 2)
+    
+    def test_transcripts_bundle_names_do_not_collide(self, tmp_path):
+        """Test that distinct language lists get distinct, path-safe bundle files."""
+        disk = DiskTranscriptCache(cache_dir=str(tmp_path))
+        original = TranscriptData(language="zh", source="manual", segments=[TranscriptSegment(text="ni hao", start=0.0, duration=1.0)])
+        transcripts = Transcripts(original=original, transcript=original, language="zh", language_name="Chinese", available_languages=["zh"])
+        
+        disk.set_transcripts("dQw4w9WgXcQ", ["zh-Hans"], transcripts)
+        disk.set_transcripts("dQw4w9WgXcQ", ["../../etc", "x" * 300], transcripts)
+        
+        assert disk.get_transcripts("dQw4w9WgXcQ", ["zh", "Hans"]) is None
+        assert disk.get_transcripts("dQw4w9WgXcQ", ["zh-Hans"]) == transcripts
+        assert all(path.parent == tmp_path and len(path.name) < 64 for path in tmp_path.iterdir())
+
+
+class TestSummaryCache:
+    """Test cases for SummaryCache."""
+    
+    def make_summary(self, text: str) -> SummaryData:
+        """Build a minimal summary."""
+        return SummaryData(summary=text, key_insights=[], key_moments=[])
+    
+    def test_make_key_depends_on_inputs(self):
+        """Test that the key changes with the text, language, chunk context and model settings."""
+        base = SummaryCache.make_key("hello", "en", {"chunk_index": 1}, "openai/gpt-4o-mini", 0.2)
+        
+        assert base == SummaryCache.make_key("hello", "en", {"chunk_index": 1}, "openai/gpt-4o-mini", 0.2)
+        assert base != SummaryCache.make_key("hello!", "en", {"chunk_index": 1}, "openai/gpt-4o-mini", 0.2)
+        assert base != SummaryCache.make_key("hello", "es", {"chunk_index": 1}, "openai/gpt-4o-mini", 0.2)
+        assert base != SummaryCache.make_key("hello", "en", {"chunk_index": 2}, "openai/gpt-4o-mini", 0.2)
+        assert base != SummaryCache.make_key("hello", "en", {"chunk_index": 1}, "openai/gpt-4o", 0.2)
+    
+    def test_evicts_least_recently_used(self):
+        """Test that reading an entry protects it from eviction."""
+        summaries = SummaryCache(max_size=2)
+        summaries.set("a", self.make_summary("a"))
+        summaries.set("b", self.make_summary("b"))
+        summaries.get("a")
+        summaries.set("c", self.make_summary("c"))
+        
+        assert summaries.get("b") is None
+        assert summaries.get("a").summary == "a"
+        assert summaries.get("c").summary == "c"
+        assert summaries.size() == 2
+        assert (summaries.hits, summaries.misses) == (3, 1)
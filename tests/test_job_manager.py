@@ -0,0 +1,154 @@
+"""
+Tests for the job manager.
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from services.job_manager import JobManager
+from models import AnalysisRequest, AnalysisResponse, AggregationInfo, ConfigInfo, JobStatus
+
+
+def make_response(request_id: str) -> AnalysisResponse:
+    """Create an empty analysis response."""
+    return AnalysisResponse(
+        request_id=request_id,
+        results=[],
+        aggregation=AggregationInfo(total=0, succeeded=0, failed=0),
+        config=ConfigInfo(provider="openai/gpt-4o-mini", temperature=0.2, max_tokens=1200)
+    )
+
+
+class TestJobManager:
+    """Test cases for JobManager."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.manager = JobManager()
+        self.request = AnalysisRequest(urls=["https://www.youtube.com/watch?v=aaaaaaaaaaa"])
+
+    @pytest.mark.asyncio
+    async def test_job_counts_follow_transitions(self):
+        """Per-state counts track jobs as they move through their lifecycle."""
+        release = asyncio.Event()
+
+        async def fake_process_batch(urls, options, request_id, video_ids=None):
+            await release.wait()
+            return make_response(request_id)
+
+        with patch('services.job_manager.default_batch_processor.process_batch', side_effect=fake_process_batch):
+            job_id = await self.manager.create_job(self.request)
+            assert self.manager.get_job_count()["pending"] == 1
+
+            await asyncio.sleep(0)
+            assert self.manager.get_job_count()["running"] == 1
+
+            release.set()
+            await self.manager.running_tasks[job_id]
+
+        assert self.manager.get_job_count() == {
+            "total": 1, "pending": 0, "running": 0, "completed": 1, "failed": 0
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_job_status_returns_api_model(self):
+        """Job status is exposed as a JobStatus model."""
+        async def fake_process_batch(urls, options, request_id, video_ids=None):
+            return make_response(request_id)
+
+        with patch('services.job_manager.default_batch_processor.process_batch', side_effect=fake_process_batch):
+            job_id = await self.manager.create_job(self.request)
+            await self.manager.running_tasks[job_id]
+
+        status = await self.manager.get_job_status(job_id)
+
+        assert isinstance(status, JobStatus)
+        assert status.status == "completed"
+        assert status.result.request_id == job_id
+        assert status.completed_at is not None
+        assert await self.manager.get_job_status("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_cancelled_job_counted_once(self):
+        """Cancelling a job moves it to failed exactly once."""
+        async def fake_process_batch(urls, options, request_id, video_ids=None):
+            await asyncio.sleep(10)
+
+        with patch('services.job_manager.default_batch_processor.process_batch', side_effect=fake_process_batch):
+            job_id = await self.manager.create_job(self.request)
+            task = self.manager.running_tasks[job_id]
+            await asyncio.sleep(0)
+
+            assert await self.manager.cancel_job(job_id)
+            await asyncio.gather(task, return_exceptions=True)
+
+        assert self.manager.get_job_count() == {
+            "total": 1, "pending": 0, "running": 0, "completed": 0, "failed": 1
+        }
+
+    @pytest.mark.asyncio
+    async def test_cleanup_updates_counts(self):
+        """Removing old jobs also removes them from the counts."""
+        async def fake_process_batch(urls, options, request_id, video_ids=None):
+            return make_response(request_id)
+
+        with patch('services.job_manager.default_batch_processor.process_batch', side_effect=fake_process_batch):
+            job_id = await self.manager.create_job(self.request)
+            await self.manager.running_tasks[job_id]
+
+        assert self.manager.jobs[job_id].status == "completed"
+        self.manager.cleanup_old_jobs(max_age_hours=-1)
+
+        assert self.manager.get_job_count() == {
+            "total": 0, "pending": 0, "running": 0, "completed": 0, "failed": 0
+        }
+
+    @pytest.mark.asyncio
+    async def test_cleanup_keeps_recent_jobs(self):
+        """Only jobs that finished before the cutoff are removed."""
+        async def fake_process_batch(urls, options, request_id, video_ids=None):
+            return make_response(request_id)
+
+        with patch('services.job_manager.default_batch_processor.process_batch', side_effect=fake_process_batch):
+            old_id = await self.manager.create_job(self.request)
+            await self.manager.running_tasks[old_id]
+            new_id = await self.manager.create_job(self.request)
+            await self.manager.running_tasks[new_id]
+
+        assert self.manager.get_job_count()["completed"] == 2
+
+        # Pretend the first job finished two days ago
+        self.manager._completion_heap = [
+            (ts - 48 * 3600 if job_id == old_id else ts, job_id)
+            for ts, job_id in self.manager._completion_heap
+        ]
+        self.manager.cleanup_old_jobs(max_age_hours=24)
+
+        assert old_id not in self.manager.jobs
+        assert new_id in self.manager.jobs
+
+    @pytest.mark.asyncio
+    async def test_oldest_finished_jobs_evicted_over_limit(self):
+        """Creating jobs past max_jobs evicts finished jobs, never active ones."""
+        release = asyncio.Event()
+
+        async def fake_process_batch(urls, options, request_id, video_ids=None):
+            if request_id == active_id:
+                await release.wait()
+            return make_response(request_id)
+
+        self.manager = JobManager(max_jobs=2)
+        active_id = None
+        with patch('services.job_manager.default_batch_processor.process_batch', side_effect=fake_process_batch):
+            active_id = await self.manager.create_job(self.request)
+            await asyncio.sleep(0)
+            finished_id = await self.manager.create_job(self.request)
+            await self.manager.running_tasks[finished_id]
+            newest_id = await self.manager.create_job(self.request)
+
+            assert set(self.manager.jobs) == {active_id, newest_id}
+            assert self.manager.get_job_count()["completed"] == 0
+
+            tasks = list(self.manager.running_tasks.values())
+            release.set()
+            await asyncio.gather(*tasks)
@@ -2,8 +2,11 @@
 Basic tests for the FastAPI application.
 """
 import pytest
+from unittest.mock import AsyncMock, patch
 from fastapi.testclient import TestClient
 from main import app
+from pydantic import ValidationError
+from models import AnalysisRequest, AnalysisResponse, AggregationInfo, ConfigInfo, config_info
 
 client = TestClient(app)
 
@@ -30,7 +33,7 @@ def test_analyze_endpoint_placeholder():
     response = client.post(
         "/api/analyze",
         json={
-            "urls": ["https://www.youtube.com/watch?v=test123"],
+            "urls": ["https://www.youtube.com/watch?v=dQw4w9WgXcQ"],
             "options": {
                 "include_markdown": False,
                 "languages": ["es", "en"],
@@ -45,3 +48,58 @@ def test_analyze_endpoint_placeholder():
     # This will fail until we implement proper provider validation
     # For now, we expect a 500 due to missing API keys
     assert response.status_code in [200, 500]
+
+
+def test_analyze_endpoint_returns_batch_response():
+    """Test analyze endpoint serializes the batch response and sets X-Cache."""
+    batch_response = AnalysisResponse(
+        request_id="req-1",
+        results=[],
+        aggregation=AggregationInfo(total=0, succeeded=0, failed=0),
+        config=ConfigInfo(provider="openai/gpt-4o-mini", temperature=0.2, max_tokens=1200)
+    )
+    
+    with patch('api.analyze.validate_provider_config', return_value=True), \
+         patch('api.analyze.get_cache_status', return_value="HIT"), \
+         patch('api.analyze.default_batch_processor.process_batch', AsyncMock(return_value=batch_response)):
+        response = client.post(
+            "/api/analyze",
+            json={"urls": ["https://www.youtube.com/watch?v=dQw4w9WgXcQ"]}
+        )
+    
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "HIT"
+    assert response.json() == batch_response.model_dump(mode="json")
+
+
+def test_analyze_endpoint_rejects_non_youtube_urls():
+    """Test analyze endpoint rejects URLs without a YouTube video ID."""
+    response = client.post(
+        "/api/analyze",
+        json={"urls": ["https://www.example.com/watch?v=short"]}
+    )
+    
+    assert response.status_code == 422
+
+
+def test_analyze_request_accepts_youtube_urls_only():
+    """Test URL validation accepts YouTube hosts only and extracts IDs in the same pass."""
+    request = AnalysisRequest(urls=[
+        "https://youtu.be/dQw4w9WgXcQ",
+        "https://m.youtube.com/watch?feature=share&v=9bZkp7q19f0",
+    ])
+    assert request.video_ids == ["dQw4w9WgXcQ", "9bZkp7q19f0"]
+    
+    for url in ["https://www.example.com/watch?v=dQw4w9WgXcQ", "youtube.com/watch?v=dQw4w9WgXcQ"]:
+        with pytest.raises(ValidationError):
+            AnalysisRequest(urls=[url])
+
+
+def test_shared_config_info_is_immutable():
+    """Test that the memoized ConfigInfo shared between responses cannot be mutated."""
+    info = config_info("openai/gpt-4o-mini", 0.2, 1200)
+    assert config_info("openai/gpt-4o-mini", 0.2, 1200) is info
+    
+    with pytest.raises(ValidationError):
+        info.max_tokens = 10
+    assert info.max_tokens == 1200
@@ -2,6 +2,7 @@
 Tests for the metadata fetcher.
 """
 import pytest
+from datetime import datetime
 from unittest.mock import patch, MagicMock
 from services.metadata_fetcher import MetadataFetcher, metadata_fetcher
 from models import VideoMetadata, ErrorInfo
@@ -27,6 +28,18 @@ class TestMetadataFetcher:
             result = self.fetcher.extract_video_id(url)
             assert result == expected_id, f"Failed for URL: {url}"
     
+    def test_extract_video_id_other_formats(self):
+        """Test extracting video ID from shorts and /v/ URLs, late v= params and bare IDs."""
+        test_cases = [
+            ("https://www.youtube.com/shorts/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+            ("https://www.youtube.com/v/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+            ("https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+            ("dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+        ]
+        
+        for url, expected_id in test_cases:
+            assert self.fetcher.extract_video_id(url) == expected_id, f"Failed for URL: {url}"
+    
     def test_extract_video_id_with_parameters(self):
         """Test extracting video ID from URLs with additional parameters."""
         url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=10s&list=PLrAXtmRdnEQy6nuLMOV8u4"
@@ -51,19 +64,19 @@ class TestMetadataFetcher:
         """Test successful metadata fetching."""
         # Mock yt-dlp response
         mock_ydl_instance = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
+        mock_ydl_class.return_value = mock_ydl_instance
         
         mock_info = {
             'title': 'Test Video Title',
             'uploader': 'Test Channel',
             'upload_date': '20240101',
             'duration': 300,
-            'webpage_url': 'https://www.youtube.com/watch?v=test123',
-            'id': 'test123'
+            'webpage_url': 'https://www.youtube.com/watch?v=dQw4w9WgXcQ',
+            'id': 'dQw4w9WgXcQ'
         }
         mock_ydl_instance.extract_info.return_value = mock_info
         
-        url = "https://www.youtube.com/watch?v=test123"
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
         metadata, error = self.fetcher.fetch_metadata(url)
         
         assert metadata is not None
@@ -71,13 +84,13 @@ class TestMetadataFetcher:
         assert metadata.title == 'Test Video Title'
         assert metadata.channel == 'Test Channel'
         assert metadata.duration_sec == 300
-        assert metadata.url == 'https://www.youtube.com/watch?v=test123'
+        assert metadata.url == 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
     
     @patch('yt_dlp.YoutubeDL')
     def test_fetch_metadata_video_unavailable(self, mock_ydl_class):
         """Test handling of unavailable videos."""
         mock_ydl_instance = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
+        mock_ydl_class.return_value = mock_ydl_instance
         mock_ydl_instance.extract_info.side_effect = Exception("Video unavailable")
         
         url = "https://www.youtube.com/watch?v=unavailable"
@@ -91,10 +104,10 @@ class TestMetadataFetcher:
     def test_fetch_metadata_private_video(self, mock_ydl_class):
         """Test handling of private videos."""
         mock_ydl_instance = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
+        mock_ydl_class.return_value = mock_ydl_instance
         mock_ydl_instance.extract_info.side_effect = Exception("Private video")
         
-        url = "https://www.youtube.com/watch?v=private"
+        url = "https://www.youtube.com/watch?v=privateVid1"
         metadata, error = self.fetcher.fetch_metadata(url)
         
         assert metadata is None
@@ -117,15 +130,15 @@ class TestMetadataFetcher:
             'uploader': 'Test Channel',
             'upload_date': '20240101',
             'duration': 300,
-            'webpage_url': 'https://www.youtube.com/watch?v=test123'
+            'webpage_url': 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
         }
         
-        metadata = self.fetcher._normalize_metadata(info, "https://www.youtube.com/watch?v=test123", "test123")
+        metadata = self.fetcher._normalize_metadata(info, "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ")
         
         assert metadata.title == 'Test Video'
         assert metadata.channel == 'Test Channel'
         assert metadata.duration_sec == 300
-        assert metadata.url == 'https://www.youtube.com/watch?v=test123'
+        assert metadata.url == 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
         assert metadata.published_at == '2024-01-01T00:00:00Z'
     
     def test_normalize_metadata_minimal(self):
@@ -134,15 +147,15 @@ class TestMetadataFetcher:
             'title': '',
             'uploader': '',
             'duration': None,
-            'webpage_url': 'https://www.youtube.com/watch?v=test123'
+            'webpage_url': 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
         }
         
-        metadata = self.fetcher._normalize_metadata(info, "https://www.youtube.com/watch?v=test123", "test123")
+        metadata = self.fetcher._normalize_metadata(info, "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ")
         
-        assert metadata.title == 'Video test123'
+        assert metadata.title == 'Video dQw4w9WgXcQ'
         assert metadata.channel == 'Unknown Channel'
         assert metadata.duration_sec == 0
-        assert metadata.url == 'https://www.youtube.com/watch?v=test123'
+        assert metadata.url == 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
     
     def test_extract_publish_date_timestamp(self):
         """Test extracting publish date from timestamp."""
@@ -156,6 +169,14 @@ class TestMetadataFetcher:
         result = self.fetcher._extract_publish_date(info)
         assert result == '2024-01-01T00:00:00Z'
     
+    def test_extract_publish_date_skips_invalid_string(self):
+        """Test malformed YYYYMMDD values fall through to the next date field."""
+        info = {'upload_date': '20241340', 'release_date': '2024010a', 'timestamp': None}
+        with patch('services.metadata_fetcher.datetime', wraps=datetime) as mock_datetime:
+            mock_datetime.now.return_value = datetime(2030, 5, 6, 7, 8, 9)
+            result = self.fetcher._extract_publish_date(info)
+        assert result == '2030-05-06T07:08:09Z'
+    
     def test_extract_publish_date_fallback(self):
         """Test fallback when no date is available."""
         info = {}
@@ -164,6 +185,149 @@ class TestMetadataFetcher:
         assert result.endswith('Z')
         assert len(result) == 20  # YYYY-MM-DDTHH:MM:SSZ
 
+    
+    def test_parse_iso_duration(self):
+        """Test parsing Data API ISO 8601 durations."""
+        assert self.fetcher._parse_iso_duration("PT1H2M3S") == 3723
+        assert self.fetcher._parse_iso_duration("PT45S") == 45
+        assert self.fetcher._parse_iso_duration("P1DT1M") == 86460
+        assert self.fetcher._parse_iso_duration("invalid") == 0
+    
+    def test_normalize_api_item(self):
+        """Test normalizing a videos.list item."""
+        item = {
+            "id": "dQw4w9WgXcQ",
+            "snippet": {
+                "title": "Test Video",
+                "channelTitle": "Test Channel",
+                "publishedAt": "2023-01-15T10:30:00Z"
+            },
+            "contentDetails": {"duration": "PT3M33S"}
+        }
+        
+        result = self.fetcher._normalize_api_item(item)
+        
+        assert result.title == "Test Video"
+        assert result.channel == "Test Channel"
+        assert result.published_at == "2023-01-15T10:30:00Z"
+        assert result.duration_sec == 213
+        assert result.url == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    
+    @pytest.mark.asyncio
+    async def test_fetch_many_without_api_key(self):
+        """Test bulk fetch is skipped when no API key is configured."""
+        with patch('services.metadata_fetcher.config.youtube_api_key', None):
+            result = await self.fetcher.fetch_many(["dQw4w9WgXcQ"])
+        
+        assert result == {}
+    
+    @pytest.mark.asyncio
+    async def test_fetch_many_groups_ids(self):
+        """Test bulk fetch sends at most 50 ids per API call."""
+        video_ids = [f"video{i:06d}" for i in range(120)]
+        
+        async def fake_page(client, ids):
+            return [{"id": video_id, "snippet": {"title": video_id}} for video_id in ids]
+        
+        with patch('services.metadata_fetcher.config.youtube_api_key', "key"), \
+             patch.object(self.fetcher, '_fetch_videos_page', side_effect=fake_page) as mock_page:
+            result = await self.fetcher.fetch_many(video_ids)
+        
+        assert [len(call.args[1]) for call in mock_page.call_args_list] == [50, 50, 20]
+        assert set(result) == set(video_ids)
+    
+    def test_normalize_player_response(self):
+        """Test normalizing an InnerTube player response."""
+        data = {
+            "playabilityStatus": {"status": "OK"},
+            "videoDetails": {"title": "Test Video", "author": "Test Channel", "lengthSeconds": "212"},
+            "microformat": {"playerMicroformatRenderer": {"publishDate": "2009-10-24T23:57:33-07:00"}}
+        }
+        
+        metadata = self.fetcher._normalize_player_response(data, "dQw4w9WgXcQ")
+        
+        assert metadata.title == "Test Video"
+        assert metadata.channel == "Test Channel"
+        assert metadata.duration_sec == 212
+        assert metadata.published_at.startswith("2009-10-2")
+        assert metadata.url == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    
+    def test_normalize_player_response_unplayable(self):
+        """Test unplayable videos are left to the yt-dlp fallback."""
+        data = {"playabilityStatus": {"status": "ERROR", "reason": "Video unavailable"}}
+        
+        assert self.fetcher._normalize_player_response(data, "dQw4w9WgXcQ") is None
+    
+    @pytest.mark.asyncio
+    async def test_fetch_metadata_async_falls_back_to_yt_dlp(self):
+        """Test the yt-dlp path is used when InnerTube fails."""
+        fallback = (None, ErrorInfo(code="VIDEO_UNAVAILABLE", message="Video is unavailable or private"))
+        
+        with patch.object(self.fetcher, '_fetch_innertube', return_value=None), \
+             patch.object(self.fetcher, 'fetch_metadata', return_value=fallback) as mock_fetch:
+            metadata, error = await self.fetcher.fetch_metadata_async("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+        
+        mock_fetch.assert_called_once()
+        assert metadata is None
+        assert error.code == "VIDEO_UNAVAILABLE"
+    
+    @patch('services.metadata_fetcher.yt_dlp.YoutubeDL')
+    def test_fetch_metadata_with_known_video_id(self, mock_ydl_class):
+        """Test a video ID passed by the caller is used without re-extracting it."""
+        mock_ydl = MagicMock()
+        mock_ydl.extract_info.return_value = {'title': 'Test Video', 'uploader': 'Test Channel', 'duration': 212}
+        mock_ydl_class.return_value = mock_ydl
+        
+        with patch.object(self.fetcher, 'extract_video_id') as mock_extract:
+            metadata, error = self.fetcher.fetch_metadata("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ")
+        
+        mock_extract.assert_not_called()
+        assert error is None
+        assert metadata.url == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    
+    @patch('services.metadata_fetcher.yt_dlp.YoutubeDL')
+    def test_fetch_metadata_uses_cache(self, mock_ydl_class):
+        """Test repeat lookups for a video are served from the cache."""
+        mock_ydl = MagicMock()
+        mock_ydl.extract_info.return_value = {'title': 'Test Video', 'uploader': 'Test Channel', 'duration': 212}
+        mock_ydl_class.return_value = mock_ydl
+        
+        first, _ = self.fetcher.fetch_metadata("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+        second, _ = self.fetcher.fetch_metadata("https://youtu.be/dQw4w9WgXcQ")
+        
+        assert first is second
+        assert mock_ydl.extract_info.call_count == 1
+        
+        assert self.fetcher.cache_clear() == 1
+        self.fetcher.fetch_metadata("https://youtu.be/dQw4w9WgXcQ")
+        assert mock_ydl.extract_info.call_count == 2
+    
+    @patch('services.metadata_fetcher.yt_dlp.YoutubeDL')
+    def test_youtube_dl_instances_reused(self, mock_ydl_class):
+        """Test one YoutubeDL instance serves consecutive lookups."""
+        mock_ydl = MagicMock()
+        mock_ydl.extract_info.return_value = {'title': 'Test Video', 'uploader': 'Test Channel'}
+        mock_ydl_class.return_value = mock_ydl
+        
+        self.fetcher.fetch_metadata("https://www.youtube.com/watch?v=aaaaaaaaaaa")
+        self.fetcher.fetch_metadata("https://www.youtube.com/watch?v=bbbbbbbbbbb")
+        
+        assert mock_ydl_class.call_count == 1
+        assert mock_ydl.extract_info.call_count == 2
+    
+    def test_cache_evicts_least_recently_used(self):
+        """Test the metadata cache stays within its size bound."""
+        fetcher = MetadataFetcher(cache_max_size=2)
+        metadata = VideoMetadata(title="t", channel="c", published_at="2020-01-01T00:00:00Z", duration_sec=1, url="u")
+        
+        fetcher._cache_set("a" * 11, metadata)
+        fetcher._cache_set("b" * 11, metadata)
+        fetcher._cache_get("a" * 11)
+        fetcher._cache_set("c" * 11, metadata)
+        
+        assert fetcher._cache_get("b" * 11) is None
+        assert fetcher._cache_get("a" * 11) is metadata
+        assert fetcher._cache_get("c" * 11) is metadata
 
 class TestMetadataFetcherIntegration:
     """Integration tests for metadata fetcher."""
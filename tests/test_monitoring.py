@@ -0,0 +1,130 @@
+"""
+Tests for the monitoring endpoints.
+"""
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.monitoring import get_metrics, get_prometheus_metrics, reset_metrics, _health_snapshot, _metrics_snapshot
+from services.observability import ObservabilityService, observability_service
+from main import app
+
+
+class TestMonitoringEndpoints:
+    """Test cases for monitoring endpoints."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        observability_service.reset_metrics()
+        _health_snapshot.cache_clear()
+        _metrics_snapshot.cache_clear()
+
+    @pytest.mark.asyncio
+    async def test_metrics_are_cached_briefly(self):
+        """Metrics computed within the TTL are served from the snapshot."""
+        first = await get_metrics()
+        observability_service.record_request("analysis", True, 1.0)
+        second = await get_metrics()
+
+        assert first["metrics"]["total_requests"] == 0
+        assert second["metrics"]["total_requests"] == 0
+
+    @pytest.mark.asyncio
+    async def test_reset_invalidates_cached_metrics(self):
+        """Resetting metrics drops the cached snapshot."""
+        observability_service.record_request("analysis", True, 1.0)
+        before = await get_metrics()
+        await reset_metrics()
+        after = await get_metrics()
+
+        assert before["metrics"]["total_requests"] == 1
+        assert after["metrics"]["total_requests"] == 0
+
+    @pytest.mark.asyncio
+    async def test_prometheus_metrics_exposed(self):
+        """Recorded requests show up in the Prometheus exposition."""
+        pytest.importorskip("prometheus_client")
+        observability_service.record_request("analysis", True, 1.0, duplicate_urls_collapsed=2)
+
+        response = await get_prometheus_metrics()
+        body = response.body.decode()
+
+        assert 'youtube_analyzer_requests_total{status="success",type="analysis"}' in body
+        assert "youtube_analyzer_duplicate_urls_collapsed_total" in body
+
+    def test_health_and_metrics_served_by_app_from_snapshot(self):
+        """The app serves /api/health and /api/metrics from the short-lived snapshots."""
+        client = TestClient(app)
+        first = client.get("/api/metrics")
+        health = client.get("/api/health")
+        observability_service.record_request("analysis", True, 1.0)
+        second = client.get("/api/metrics")
+
+        assert first.status_code == 200
+        assert health.status_code == 200
+        assert health.json()["metrics"]["requests"]["total"] == 0
+        assert first.json()["metrics"]["total_requests"] == 0
+        assert second.json()["metrics"]["total_requests"] == 0
+
+    def test_prometheus_metrics_served_by_app(self):
+        """The Prometheus exposition is reachable through the application."""
+        pytest.importorskip("prometheus_client")
+        observability_service.record_request("analysis", True, 1.0)
+
+        response = TestClient(app).get("/api/metrics/prometheus")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'youtube_analyzer_requests_total{status="success",type="analysis"}' in response.text
+
+
+class TestObservabilityService:
+    """Test cases for the observability service."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.service = ObservabilityService()
+
+    def test_requests_per_minute_drops_old_requests(self):
+        """Only requests from the last minute are counted."""
+        self.service._minute_ts.extend([time.time() - 120, time.time() - 90])
+        self.service.record_request("analysis", True, 1.0)
+        self.service.record_request("analysis", True, 1.0)
+        self.service.flush()
+
+        assert self.service.metrics.requests_per_minute == 2
+        assert len(self.service._minute_ts) == 2
+
+    def test_record_request_is_deferred_until_read(self):
+        """Recording only queues the request; reads see it immediately."""
+        self.service.record_request("analysis", False, 2.0, error_code="BATCH_FAILURE")
+
+        assert self.service.metrics.total_requests == 0
+        metrics = self.service.get_metrics()
+        assert metrics["total_requests"] == 1
+        assert metrics["error_counts"] == {"BATCH_FAILURE": 1}
+
+    @pytest.mark.asyncio
+    async def test_drain_task_aggregates_in_background(self):
+        """The drain task folds queued requests without a read."""
+        self.service.start()
+        try:
+            self.service.record_request("analysis", True, 1.0)
+            await asyncio.sleep(0.2)
+            assert self.service.metrics.total_requests == 1
+        finally:
+            await self.service.stop()
+
+    def test_recent_requests_expanded_to_dicts(self):
+        """History tuples are returned as dicts with a datetime timestamp."""
+        self.service.record_request("analysis", True, 1.5, provider="openai/gpt-4o-mini", languages=["es"])
+
+        (entry,) = self.service.get_recent_requests(5)
+
+        assert entry["type"] == "analysis"
+        assert entry["processing_time"] == 1.5
+        assert entry["languages"] == ["es"]
+        assert isinstance(entry["timestamp"], datetime)
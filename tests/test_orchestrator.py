@@ -0,0 +1,37 @@
+"""
+Tests for the video orchestrator.
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+
+from services.orchestrator import VideoOrchestrator
+from models import AnalysisOptions, ErrorInfo
+
+
+class TestVideoOrchestrator:
+    """Test cases for VideoOrchestrator."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.orchestrator = VideoOrchestrator()
+
+    @pytest.mark.asyncio
+    async def test_process_video_records_stage_timings(self):
+        """Every pipeline stage stores its duration on the processing stats."""
+        metadata = MagicMock(title="Test video")
+        transcript_error = ErrorInfo(code="NO_TRANSCRIPTS", message="No transcripts available")
+
+        with patch.object(self.orchestrator.metadata_fetcher, 'fetch_metadata_async',
+                          return_value=(metadata, None)), \
+             patch.object(self.orchestrator.transcript_fetcher, 'fetch_transcripts_async',
+                          return_value=(None, transcript_error)):
+            result, stats = await self.orchestrator.process_video(
+                "https://www.youtube.com/watch?v=dQw4w9WgXcQ", AnalysisOptions()
+            )
+
+        assert result.status == "ok"
+        timings = stats.to_dict()
+        for name in ("metadata_fetch_time", "transcript_fetch_time", "chunking_time",
+                     "summarization_time", "total_time"):
+            assert isinstance(timings[name], float), name
+            assert timings[name] >= 0
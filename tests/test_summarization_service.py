@@ -4,6 +4,8 @@ Tests for the summarization service.
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 import json
+import asyncio
+from typing import List
 
 from services.summarization_service import (
     SummarizationService, SummarizationConfig, PromptTemplates
@@ -310,6 +312,83 @@ class TestSummarizationService:
         assert error.code == "NO_SUMMARIES"
 
 
+class TestBatchedSummarization:
+    """Test cases for multi-chunk (batched) summarization requests."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.service = SummarizationService(SummarizationConfig(
+            max_tokens=100, max_retries=1, batch_size=4, cache_enabled=False
+        ))
+        self.texts = ["chunk one", "chunk two", "chunk three"]
+    
+    def summary_json(self, text: str) -> dict:
+        """Build a valid summary object."""
+        return {"summary": text, "key_insights": [text], "key_moments": []}
+    
+    @pytest.mark.asyncio
+    async def test_malformed_item_falls_back_alone(self):
+        """Test that one invalid item in the array is retried alone and the rest are kept."""
+        batch_response = json.dumps([
+            self.summary_json("one"),
+            {"summary": "two", "key_insights": "not a list", "key_moments": []},
+            self.summary_json("three")
+        ])
+        single_response = json.dumps(self.summary_json("two again"))
+        complete = AsyncMock(side_effect=[batch_response, single_response])
+        
+        with patch.object(self.service, '_complete', complete):
+            results = await self.service.summarize_batch(self.texts, "en")
+        
+        assert [r.summary for r in results] == ["one", "two again", "three"]
+        assert complete.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_short_array_falls_back_per_document(self):
+        """Test that an array with too few items falls back to one request per document."""
+        batch_response = json.dumps([self.summary_json("one")])
+        singles = [json.dumps(self.summary_json(f"single {i}")) for i in range(3)]
+        complete = AsyncMock(side_effect=[batch_response] + singles)
+        
+        with patch.object(self.service, '_complete', complete):
+            results = await self.service.summarize_batch(self.texts, "en")
+        
+        assert [r.summary for r in results] == ["single 0", "single 1", "single 2"]
+        assert complete.await_count == 4
+    
+    @pytest.mark.asyncio
+    async def test_llm_exception_reports_summarization_error(self):
+        """Test that an LLM failure surfaces as SUMMARIZATION_ERROR rather than an empty summary."""
+        chunks = [TranscriptChunk(text="only chunk", segments=[], start_time=0.0, end_time=10.0,
+                                  token_count=2, char_count=10, chunk_index=0, language="en")]
+        
+        with patch('litellm.acompletion', new_callable=AsyncMock) as mock_completion:
+            mock_completion.side_effect = Exception("LLM Error")
+            summary, error = await self.service.summarize_transcript(chunks, "en")
+        
+        assert summary is None
+        assert error.code == "SUMMARIZATION_ERROR"
+    
+    @pytest.mark.asyncio
+    async def test_batches_fit_output_token_limit(self):
+        """Test that batches are shrunk so their combined max_tokens fits one request."""
+        service = SummarizationService(SummarizationConfig(
+            max_tokens=6000, max_output_tokens=16384, batch_size=4, max_retries=1, cache_enabled=False
+        ))
+        texts = [f"chunk {i}" for i in range(4)]
+        
+        async def complete(messages, max_tokens):
+            count = messages[-1]["content"].count("### DOCUMENT")
+            assert max_tokens <= 16384
+            return json.dumps([self.summary_json("s")] * count)
+        
+        with patch.object(service, '_complete', AsyncMock(side_effect=complete)) as mock_complete:
+            results = await service.summarize_batch(texts, "en")
+        
+        assert all(r is not None for r in results)
+        assert mock_complete.await_count == 2
+
+
 class TestGlobalInstances:
     """Test global summarization service instances."""
     
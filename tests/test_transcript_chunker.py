@@ -1,9 +1,11 @@
 """
 Tests for the transcript chunker.
 """
+import multiprocessing
 import pytest
+from concurrent.futures import ProcessPoolExecutor
 from services.transcript_chunker import (
-    TranscriptChunker, ChunkingConfig, TranscriptChunk, TokenEstimator
+    TranscriptChunker, ChunkingConfig, TranscriptChunk, TokenEstimator, chunk_starts
 )
 from models import TranscriptData, TranscriptSegment
 
@@ -50,6 +52,11 @@ class TestTokenEstimator:
         assert tokens > 0
         # Should use default multiplier
         assert tokens >= len(text.split())
+    
+    def test_tokens_for_words_matches_estimate(self):
+        """Test estimating from a word count agrees with estimating from the text."""
+        text = "Hola mundo, esto es una prueba"
+        assert self.estimator.tokens_for_words(len(text.split()), "es") == self.estimator.estimate_tokens(text, "es")
 
 
 class TestTranscriptChunker:
@@ -82,6 +89,22 @@ class TestTranscriptChunker:
         assert chunks[0].text is not None
         assert len(chunks[0].segments) == 2
     
+    def test_chunk_in_process_pool(self):
+        """Test chunking in a spawned worker process matches chunking in-process."""
+        transcript = self.create_test_transcript(30)
+        
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            chunks = pool.submit(self.chunker.chunk_transcript, transcript, "en").result(timeout=60)
+            segments = transcript.segments
+            spans = pool.submit(
+                self.chunker.chunk_spans,
+                [s.text for s in segments], [s.start for s in segments], [s.duration for s in segments], "en"
+            ).result(timeout=60)
+        
+        expected = self.chunker.chunk_transcript(transcript, "en")
+        assert [chunk.text for chunk in chunks] == [chunk.text for chunk in expected]
+        assert self.chunker.build_chunks(segments, spans, "en") == expected
+    
     def test_chunk_large_transcript(self):
         """Test chunking a large transcript that needs multiple chunks."""
         # Create a large transcript
@@ -193,6 +216,15 @@ class TestTranscriptChunker:
         assert all(chunk.token_count <= custom_config.max_tokens for chunk in chunks)
         assert all(chunk.char_count <= custom_config.max_chars for chunk in chunks)
 
+    
+    def test_chunk_starts(self):
+        """Test chunk boundaries are placed where either limit would be exceeded."""
+        # Token limit splits before segment 2, char limit before segment 3
+        assert chunk_starts([10, 10, 10, 1], [5, 5, 5, 60], 25, 60) == [0, 2, 3]
+        # An oversized first segment still forms its own chunk
+        assert chunk_starts([100, 1], [5, 5], 10, 60) == [0, 1]
+        assert chunk_starts([1, 1, 1], [1, 1, 1], 10, 10) == [0]
+
 
 class TestTranscriptChunk:
     """Test cases for TranscriptChunk dataclass."""
@@ -223,6 +255,20 @@ class TestTranscriptChunk:
         assert chunk.char_count == 11
         assert chunk.chunk_index == 0
         assert chunk.language == "en"
+    
+    def test_single_definition(self):
+        """Test the chunker produces the same TranscriptChunk class the models module defines."""
+        import models
+        
+        chunker = TranscriptChunker()
+        transcript = TranscriptData(
+            source="manual",
+            segments=[TranscriptSegment(text="Hello world", start=0.0, duration=2.0)],
+            language="en"
+        )
+        
+        assert TranscriptChunk is models.TranscriptChunk
+        assert isinstance(chunker.chunk_transcript(transcript, "en")[0], models.TranscriptChunk)
 
 
 class TestChunkingConfig:
@@ -1,12 +1,14 @@
 """
 Tests for the transcript fetcher.
 """
+import threading
 import pytest
 from unittest.mock import patch, MagicMock
 from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound, VideoUnavailable, TooManyRequests
 
-from services.transcript_fetcher import TranscriptFetcher, transcript_fetcher
-from models import TranscriptData, TranscriptSegment, Transcripts, ErrorInfo
+from services import transcript_fetcher as transcript_fetcher_module
+from services.transcript_fetcher import TranscriptFetcher, transcript_fetcher, list_transcripts, CaptionTrack, _parse_timedtext
+from models import TranscriptData, TranscriptSegment, Transcripts, ErrorInfo, TranscriptLine
 
 
 class TestTranscriptFetcher:
@@ -42,7 +44,7 @@ class TestTranscriptFetcher:
             result = self.fetcher.extract_video_id(url)
             assert result is None, f"Should return None for invalid URL: {url}"
     
-    @patch('youtube_transcript_api.YouTubeTranscriptApi.list_transcripts')
+    @patch('services.transcript_fetcher.list_transcripts')
     def test_fetch_transcripts_success(self, mock_list_transcripts):
         """Test successful transcript fetching."""
         # Mock transcript list
@@ -75,7 +77,7 @@ class TestTranscriptFetcher:
         
         mock_transcript_list.find_transcript.side_effect = mock_find_transcript
         
-        url = "https://www.youtube.com/watch?v=test123"
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
         transcripts, error = self.fetcher.fetch_transcripts(url, ['es', 'en'])
         
         assert transcripts is not None
@@ -87,7 +89,7 @@ class TestTranscriptFetcher:
         assert len(transcripts.es.segments) == 2
         assert len(transcripts.en.segments) == 2
     
-    @patch('youtube_transcript_api.YouTubeTranscriptApi.list_transcripts')
+    @patch('services.transcript_fetcher.list_transcripts')
     def test_fetch_transcripts_partial_success(self, mock_list_transcripts):
         """Test transcript fetching with partial success."""
         mock_transcript_list = MagicMock()
@@ -108,7 +110,7 @@ class TestTranscriptFetcher:
         
         mock_transcript_list.find_transcript.side_effect = mock_find_transcript
         
-        url = "https://www.youtube.com/watch?v=test123"
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
         transcripts, error = self.fetcher.fetch_transcripts(url, ['es', 'en'])
         
         assert transcripts is not None
@@ -118,38 +120,38 @@ class TestTranscriptFetcher:
         assert 'es' in transcripts.unavailable
         assert transcripts.unavailable['es'] == "not_available"
     
-    @patch('youtube_transcript_api.YouTubeTranscriptApi.list_transcripts')
+    @patch('services.transcript_fetcher.list_transcripts')
     def test_fetch_transcripts_no_transcripts(self, mock_list_transcripts):
         """Test handling when no transcripts are available."""
         mock_transcript_list = MagicMock()
         mock_list_transcripts.return_value = mock_transcript_list
         mock_transcript_list.find_transcript.side_effect = NoTranscriptFound()
         
-        url = "https://www.youtube.com/watch?v=test123"
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
         transcripts, error = self.fetcher.fetch_transcripts(url, ['es', 'en'])
         
         assert transcripts is None
         assert error is not None
         assert error.code == "NO_TRANSCRIPTS"
     
-    @patch('youtube_transcript_api.YouTubeTranscriptApi.list_transcripts')
+    @patch('services.transcript_fetcher.list_transcripts')
     def test_fetch_transcripts_video_unavailable(self, mock_list_transcripts):
         """Test handling of unavailable videos."""
-        mock_list_transcripts.side_effect = VideoUnavailable("test123")
+        mock_list_transcripts.side_effect = VideoUnavailable("dQw4w9WgXcQ")
         
-        url = "https://www.youtube.com/watch?v=test123"
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
         transcripts, error = self.fetcher.fetch_transcripts(url, ['es', 'en'])
         
         assert transcripts is None
         assert error is not None
         assert error.code == "VIDEO_UNAVAILABLE"
     
-    @patch('youtube_transcript_api.YouTubeTranscriptApi.list_transcripts')
+    @patch('services.transcript_fetcher.list_transcripts')
     def test_fetch_transcripts_rate_limit(self, mock_list_transcripts):
         """Test handling of rate limiting."""
         mock_list_transcripts.side_effect = TooManyRequests()
         
-        url = "https://www.youtube.com/watch?v=test123"
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
         transcripts, error = self.fetcher.fetch_transcripts(url, ['es', 'en'])
         
         assert transcripts is None
@@ -196,6 +198,32 @@ class TestTranscriptFetcher:
         result = self.fetcher._find_transcript(mock_transcript_list, 'es')
         assert result == mock_transcript
     
+    @patch('services.transcript_fetcher.list_transcripts')
+    def test_fetch_transcripts_disabled(self, mock_list_transcripts):
+        """Test disabled transcripts are reported as unavailable after a single listing call."""
+        mock_list_transcripts.side_effect = TranscriptsDisabled("dQw4w9WgXcQ")
+        self.fetcher.use_whisper_fallback = False
+        
+        transcripts, error = self.fetcher.fetch_transcripts("https://www.youtube.com/watch?v=dQw4w9WgXcQ", ['es', 'en'])
+        
+        assert error is None
+        assert transcripts.original is None
+        assert transcripts.unavailable_reason is not None
+        mock_list_transcripts.assert_called_once_with("dQw4w9WgXcQ")
+    
+    def test_select_best_transcript_ranking(self):
+        """Test manual beats auto-generated, and preferred languages beat the rest."""
+        def make(code, generated):
+            return MagicMock(language_code=code, is_generated=generated)
+        
+        auto_es, manual_de, manual_es, auto_fr = make('es', True), make('de', False), make('es', False), make('fr', True)
+        
+        assert self.fetcher._select_best_transcript([auto_es, manual_de, manual_es], ['es']) is manual_es
+        assert self.fetcher._select_best_transcript([manual_de, auto_es], ['es']) is auto_es
+        assert self.fetcher._select_best_transcript([auto_fr, manual_de], ['es']) is manual_de
+        assert self.fetcher._select_best_transcript([auto_fr, make('it', True)], ['es']) is auto_fr
+        assert self.fetcher._select_best_transcript([], ['es']) is None
+    
     def test_format_transcript_as_text(self):
         """Test formatting transcript as text."""
         transcript_data = TranscriptData(
@@ -216,7 +244,7 @@ class TestTranscriptFetcher:
         result = self.fetcher.format_transcript_as_text(transcript_data)
         assert result == ""
     
-    @patch('youtube_transcript_api.YouTubeTranscriptApi.list_transcripts')
+    @patch('services.transcript_fetcher.list_transcripts')
     def test_get_available_languages_success(self, mock_list_transcripts):
         """Test getting available languages."""
         mock_transcript1 = MagicMock()
@@ -228,7 +256,7 @@ class TestTranscriptFetcher:
         mock_transcript_list.__iter__ = MagicMock(return_value=iter([mock_transcript1, mock_transcript2]))
         mock_list_transcripts.return_value = mock_transcript_list
         
-        url = "https://www.youtube.com/watch?v=test123"
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
         languages, error = self.fetcher.get_available_languages(url)
         
         assert languages is not None
@@ -245,6 +273,163 @@ class TestTranscriptFetcher:
         assert error is not None
         assert error.code == "INVALID_URL"
 
+    
+    @patch('services.transcript_fetcher.list_transcripts')
+    def test_fetch_transcripts_fetches_languages_concurrently(self, mock_list_transcripts):
+        """Test the original and English transcripts are downloaded at the same time."""
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def make_transcript(code, text):
+            transcript = MagicMock(language_code=code, is_generated=False)
+            
+            def fetch():
+                barrier.wait()  # Raises BrokenBarrierError if the other fetch never starts
+                return [MagicMock(text=text, start=0.0, duration=1.0)]
+            
+            transcript.fetch.side_effect = fetch
+            return transcript
+        
+        mock_list_transcripts.return_value = [make_transcript('es', 'hola'), make_transcript('en', 'hello')]
+        
+        transcripts, error = self.fetcher.fetch_transcripts("https://www.youtube.com/watch?v=dQw4w9WgXcQ", ['es', 'en'])
+        
+        assert error is None
+        assert transcripts.original.segments[0].text == "hola"
+        assert transcripts.english.segments[0].text == "hello"
+
+    
+    @patch('services.transcript_fetcher.TranscriptListFetcher')
+    def test_list_transcripts_reuses_session(self, mock_list_fetcher):
+        """Test every transcript listing goes through the same HTTP session."""
+        list_transcripts("dQw4w9WgXcQ")
+        list_transcripts("9bZkp7q19f0")
+        
+        sessions = {call.args[0] for call in mock_list_fetcher.call_args_list}
+        assert sessions == {transcript_fetcher_module._http_session}
+
+    
+    def test_parse_timedtext(self):
+        """Test timedtext XML is parsed into unescaped, tag-free lines."""
+        xml_text = (
+            '<?xml version="1.0" encoding="utf-8" ?><transcript>'
+            '<text start="0.5" dur="1.5">Hello &amp;amp; &lt;i&gt;welcome&lt;/i&gt;</text>'
+            '<text start="2.0">bye</text>'
+            '<text start="3.0" dur="1.0"></text>'
+            '</transcript>'
+        )
+        
+        lines = _parse_timedtext(xml_text)
+        
+        assert [(line.text, line.start, line.duration) for line in lines] == [
+            ("Hello & welcome", 0.5, 1.5),
+            ("bye", 2.0, 0.0),
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_fetch_transcripts_async_native(self):
+        """Test caption tracks are listed and fetched without the sync client."""
+        tracks = [
+            CaptionTrack(language_code='es', is_generated=False, base_url="https://example.com/es"),
+            CaptionTrack(language_code='en', is_generated=True, base_url="https://example.com/en"),
+        ]
+        
+        async def fake_content(video_id, track):
+            return [TranscriptLine(text=track.language_code, start=0.0, duration=1.0)]
+        
+        with patch.object(self.fetcher, '_list_caption_tracks', return_value=tracks), \
+             patch.object(self.fetcher, '_fetch_track_content', side_effect=fake_content), \
+             patch.object(self.fetcher, 'fetch_transcripts') as mock_sync:
+            transcripts, error = await self.fetcher.fetch_transcripts_async(
+                "https://www.youtube.com/watch?v=dQw4w9WgXcQ", ['es', 'en']
+            )
+        
+        mock_sync.assert_not_called()
+        assert error is None
+        assert transcripts.language == 'es'
+        assert transcripts.original.source == "manual"
+        assert transcripts.original.segments[0].text == "es"
+        assert transcripts.english.source == "auto"
+        assert transcripts.english.segments[0].text == "en"
+        assert transcripts.available_languages == ['es', 'en']
+    
+    @pytest.mark.asyncio
+    async def test_fetch_transcripts_async_falls_back_to_sync(self):
+        """Test the youtube-transcript-api path is used when no caption tracks are found."""
+        fallback = (None, ErrorInfo(code="VIDEO_UNAVAILABLE", message="Video is unavailable"))
+        
+        with patch.object(self.fetcher, '_list_caption_tracks', return_value=[]), \
+             patch.object(self.fetcher, 'fetch_transcripts', return_value=fallback) as mock_sync:
+            transcripts, error = await self.fetcher.fetch_transcripts_async(
+                "https://www.youtube.com/watch?v=dQw4w9WgXcQ", ['es', 'en']
+            )
+        
+        mock_sync.assert_called_once()
+        assert transcripts is None
+        assert error.code == "VIDEO_UNAVAILABLE"
+
+    @pytest.mark.asyncio
+    async def test_fetch_transcripts_async_fallback_reuses_listed_tracks(self):
+        """Test the fallback gets the already-listed tracks instead of re-listing the watch page."""
+        tracks = [CaptionTrack(language_code='es', is_generated=False, base_url="https://example.com/es", name="Spanish")]
+        fallback = (None, ErrorInfo(code="TRANSCRIPT_ERROR", message="failed"))
+
+        async def no_content(video_id, track):
+            return None
+
+        with patch.object(self.fetcher, '_list_caption_tracks', return_value=tracks), \
+             patch.object(self.fetcher, '_fetch_track_content', side_effect=no_content), \
+             patch.object(self.fetcher, 'fetch_transcripts', return_value=fallback) as mock_sync:
+            await self.fetcher.fetch_transcripts_async(
+                "https://www.youtube.com/watch?v=dQw4w9WgXcQ", ['es', 'en']
+            )
+
+        mock_sync.assert_called_once_with("https://www.youtube.com/watch?v=dQw4w9WgXcQ", ['es', 'en'], tracks)
+
+    @patch('services.transcript_fetcher.list_transcripts')
+    def test_fetch_transcripts_uses_given_caption_tracks(self, mock_list_transcripts):
+        """Test fetch_transcripts builds transcripts from given tracks without listing them again."""
+        tracks = [CaptionTrack(language_code='es', is_generated=False, base_url="https://example.com/es", name="Spanish")]
+        lines = [TranscriptLine(text="Hola", start=0.0, duration=1.0)]
+
+        with patch.object(transcript_fetcher_module.disk_cache, 'get_transcripts', return_value=None), \
+             patch.object(self.fetcher, '_fetch_transcript_content', return_value=lines) as mock_content:
+            transcripts, error = self.fetcher.fetch_transcripts(
+                "https://www.youtube.com/watch?v=dQw4w9WgXcQ", ['es'], tracks
+            )
+
+        mock_list_transcripts.assert_not_called()
+        assert error is None
+        assert transcripts.original.segments[0].text == "Hola"
+        fetched = mock_content.call_args.args[0]
+        assert (fetched.language_code, fetched.is_generated, fetched.language) == ('es', False, "Spanish")
+
+    @pytest.mark.asyncio
+    async def test_manual_and_auto_tracks_do_not_share_disk_cache(self):
+        """Test a cached manual track is not served for the auto-generated track in the same language."""
+        store = {}
+        manual = CaptionTrack(language_code='en', is_generated=False, base_url="https://example.com/manual", name="English")
+        auto = CaptionTrack(language_code='en', is_generated=True, base_url="https://example.com/auto",
+                            name="English (auto-generated)")
+
+        async def fake_get(url, headers=None):
+            text = "manual" if url.endswith("manual") else "auto"
+            return MagicMock(text=f'<transcript><text start="0" dur="1">{text}</text></transcript>')
+
+        client = MagicMock()
+        client.get.side_effect = fake_get
+        disk = MagicMock()
+        disk.get_transcript.side_effect = lambda video_id, key: store.get((video_id, key))
+        disk.set_transcript.side_effect = lambda video_id, key, lines: store.__setitem__((video_id, key), lines)
+
+        with patch.object(transcript_fetcher_module, 'get_http_client', return_value=client), \
+             patch.object(transcript_fetcher_module, 'disk_cache', disk):
+            manual_lines = await self.fetcher._fetch_track_content("dQw4w9WgXcQ", manual)
+            auto_lines = await self.fetcher._fetch_track_content("dQw4w9WgXcQ", auto)
+
+        assert manual_lines[0].text == "manual"
+        assert auto_lines[0].text == "auto"
+        assert len(store) == 2
+
 
 class TestTranscriptFetcherIntegration:
     """Integration tests for transcript fetcher."""
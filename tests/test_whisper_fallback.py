@@ -9,6 +9,8 @@ import os
 from services.transcript_fetcher import TranscriptFetcher
 from services.audio_downloader import AudioDownloader
 from services.whisper_transcriber import WhisperTranscriber
+from youtube_transcript_api._errors import TranscriptsDisabled
+
 from models import TranscriptData, TranscriptSegment, ErrorInfo
 
 
@@ -56,7 +58,7 @@ class TestAudioDownloader:
             
             # Mock finding the downloaded file
             with patch.object(downloader, '_find_downloaded_file', return_value='/tmp/test.wav'):
-                file_path, error = downloader.download_audio("https://youtube.com/watch?v=test")
+                file_path, error = downloader.download_audio("https://youtube.com/watch?v=dQw4w9WgXcQ")
                 
                 assert file_path == '/tmp/test.wav'
                 assert error is None
@@ -77,10 +79,56 @@ class TestAudioDownloader:
         }
         mock_ydl_instance.extract_info.return_value = mock_info
         
-        file_path, error = downloader.download_audio("https://youtube.com/watch?v=test", max_duration=3600)
+        file_path, error = downloader.download_audio("https://youtube.com/watch?v=dQw4w9WgXcQ", max_duration=3600)
         
         assert file_path is None
         assert error.code == "VIDEO_TOO_LONG"
+    
+    @patch('yt_dlp.YoutubeDL')
+    def test_download_audio_reuses_cached_info(self, mock_ytdl):
+        """Test that a repeated download skips extraction."""
+        downloader = AudioDownloader()
+        
+        mock_ydl_instance = Mock()
+        mock_ytdl.return_value.__enter__.return_value = mock_ydl_instance
+        mock_info = {'duration': 180, 'id': 'dQw4w9WgXcQ'}
+        mock_ydl_instance.extract_info.return_value = mock_info
+        mock_ydl_instance.sanitize_info.return_value = mock_info
+        mock_ydl_instance.process_ie_result.return_value = mock_info
+        
+        with patch.object(downloader, '_find_downloaded_file', return_value='/tmp/test.wav'):
+            for _ in range(2):
+                file_path, error = downloader.download_audio("https://youtube.com/watch?v=dQw4w9WgXcQ")
+                assert file_path == '/tmp/test.wav'
+                assert error is None
+        
+        mock_ydl_instance.extract_info.assert_called_once()
+        mock_ydl_instance.process_ie_result.assert_called_once()
+    
+    def test_find_downloaded_file(self, tmp_path):
+        """Test that only the file named after the video ID is picked up."""
+        downloader = AudioDownloader()
+        downloader.temp_dir = str(tmp_path)
+        
+        (tmp_path / "xdQw4w9WgXcQ.webm").write_bytes(b"other")
+        (tmp_path / "dQw4w9WgXcQ.webm").write_bytes(b"audio")
+        
+        assert downloader._find_downloaded_file("dQw4w9WgXcQ") == str(tmp_path / "dQw4w9WgXcQ.webm")
+        assert downloader._find_downloaded_file("aaaaaaaaaaa") is None
+    
+    def test_cleanup_audio_file_removes_download_dir(self, tmp_path):
+        """Test that cleanup removes the per-download directory."""
+        downloader = AudioDownloader()
+        downloader.temp_dir = str(tmp_path)
+        
+        job_dir = tmp_path / "dQw4w9WgXcQ_abc"
+        job_dir.mkdir()
+        audio_file = job_dir / "dQw4w9WgXcQ.webm"
+        audio_file.write_bytes(b"audio")
+        
+        assert downloader.cleanup_audio_file(str(audio_file)) is True
+        assert not job_dir.exists()
+        assert tmp_path.exists()
 
 
 class TestWhisperTranscriber:
@@ -180,13 +228,13 @@ class TestTranscriptFetcherWithWhisper:
     
     @patch('services.transcript_fetcher.audio_downloader')
     @patch('services.transcript_fetcher.whisper_transcriber')
-    @patch('services.transcript_fetcher.YouTubeTranscriptApi')
-    def test_whisper_fallback_success(self, mock_api, mock_whisper, mock_downloader):
+    @patch('services.transcript_fetcher.list_transcripts')
+    def test_whisper_fallback_success(self, mock_list_transcripts, mock_whisper, mock_downloader):
         """Test successful Whisper fallback when YouTube transcripts fail."""
         fetcher = TranscriptFetcher()
         
-        # Mock YouTube API to fail
-        mock_api.list_transcripts.side_effect = Exception("No transcripts available")
+        # Mock YouTube API to report transcripts as disabled
+        mock_list_transcripts.side_effect = TranscriptsDisabled("dQw4w9WgXcQ")
         
         # Mock audio downloader
         mock_downloader.download_audio.return_value = ("/tmp/test.wav", None)
@@ -202,12 +250,13 @@ class TestTranscriptFetcherWithWhisper:
         )
         mock_whisper.transcribe_audio.return_value = (mock_transcript, None)
         
-        transcripts, error = fetcher.fetch_transcripts("https://youtube.com/watch?v=test", ["en"])
+        transcripts, error = fetcher.fetch_transcripts("https://youtube.com/watch?v=dQw4w9WgXcQ", ["en"])
         
         assert transcripts is not None
-        assert transcripts.en is not None
-        assert transcripts.en.source == "whisper"
-        assert len(transcripts.en.segments) == 1
+        assert transcripts.original is not None
+        assert transcripts.original.source == "whisper"
+        assert len(transcripts.original.segments) == 1
+        assert transcripts.language == "en"
         assert error is None
         
         # Verify cleanup was called
@@ -215,33 +264,38 @@ class TestTranscriptFetcherWithWhisper:
     
     @patch('services.transcript_fetcher.audio_downloader')
     @patch('services.transcript_fetcher.whisper_transcriber')
-    @patch('services.transcript_fetcher.YouTubeTranscriptApi')
-    def test_whisper_fallback_download_fails(self, mock_api, mock_whisper, mock_downloader):
+    @patch('services.transcript_fetcher.list_transcripts')
+    def test_whisper_fallback_download_fails(self, mock_list_transcripts, mock_whisper, mock_downloader):
         """Test Whisper fallback when audio download fails."""
         fetcher = TranscriptFetcher()
         
-        # Mock YouTube API to fail
-        mock_api.list_transcripts.side_effect = Exception("No transcripts available")
+        # Mock YouTube API to report transcripts as disabled
+        mock_list_transcripts.side_effect = TranscriptsDisabled("dQw4w9WgXcQ")
         
         # Mock audio downloader to fail
         error_info = ErrorInfo(code="DOWNLOAD_FAILED", message="Download failed")
         mock_downloader.download_audio.return_value = (None, error_info)
         
-        transcripts, error = fetcher.fetch_transcripts("https://youtube.com/watch?v=test", ["en"])
+        transcripts, error = fetcher.fetch_transcripts("https://youtube.com/watch?v=dQw4w9WgXcQ", ["en"])
         
-        assert transcripts is None
-        assert error.code == "DOWNLOAD_FAILED"
+        assert error is None
+        assert transcripts.original is None
+        assert transcripts.unavailable_reason is not None
+        mock_whisper.transcribe_audio.assert_not_called()
     
     def test_whisper_fallback_disabled(self):
         """Test that Whisper fallback can be disabled."""
         fetcher = TranscriptFetcher()
         fetcher.use_whisper_fallback = False
         
-        with patch('services.transcript_fetcher.YouTubeTranscriptApi') as mock_api:
-            # Mock YouTube API to fail
-            mock_api.list_transcripts.side_effect = Exception("No transcripts available")
+        with patch('services.transcript_fetcher.list_transcripts') as mock_list_transcripts, \
+             patch('services.transcript_fetcher.audio_downloader') as mock_downloader:
+            # Mock YouTube API to report transcripts as disabled
+            mock_list_transcripts.side_effect = TranscriptsDisabled("dQw4w9WgXcQ")
             
-            transcripts, error = fetcher.fetch_transcripts("https://youtube.com/watch?v=test", ["en"])
+            transcripts, error = fetcher.fetch_transcripts("https://youtube.com/watch?v=dQw4w9WgXcQ", ["en"])
             
-            assert transcripts is None
-            assert error.code == "TRANSCRIPT_ERROR"
+            assert error is None
+            assert transcripts.original is None
+            assert transcripts.unavailable_reason is not None
+            mock_downloader.download_audio.assert_not_called()